@@ -1,14 +1,19 @@
 import streamlit as st
 import os
 from dotenv import load_dotenv
-from bot.client import BinanceClient
-from bot.orders import OrderManager
+from bot.client import get_client
+from bot.orders import OrderManager, OrderSpec
+from bot.metrics import start_metrics_server
 
 # Load environment variables
 load_dotenv()
 
 st.set_page_config(page_title="Binance Futures Testnet Bot", layout="wide")
 
+# Expose order/request timings for `cli.py stats` when METRICS_PORT is configured.
+if os.getenv("METRICS_PORT"):
+    start_metrics_server(int(os.getenv("METRICS_PORT")))
+
 # Initialize session state for Binance Client & Balance
 if "api_connected" not in st.session_state:
     st.session_state.api_connected = False
@@ -18,7 +23,7 @@ if "usdt_balance" not in st.session_state:
 def check_connection():
     """Validates the connection by fetching the account balance."""
     try:
-        client = BinanceClient()
+        client = get_client()
         balance = client.get_account_balance()
         if balance is not None:
             st.session_state.usdt_balance = balance
@@ -50,12 +55,15 @@ st.markdown("Place orders on the Binance Futures Testnet directly from this inte
 
 st.subheader("Order Entry")
 
-symbol = st.selectbox("Symbol", options=["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"])
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT"]
+symbol = st.selectbox("Symbol", options=SYMBOLS)
 
 current_price = None
 if st.session_state.api_connected:
     try:
-        client = BinanceClient()
+        client = get_client()
+        # Streams mark prices into memory once per process; reruns read the cache instead of REST.
+        client.start_price_cache(SYMBOLS)
         current_price = client.fetch_symbol_price(symbol)
         if current_price:
             st.metric(f"Real-time {symbol} Mark Price", f"${current_price:.2f}")
@@ -64,7 +72,8 @@ if st.session_state.api_connected:
 
 col1, col2 = st.columns(2)
 with col1:
-    order_type = st.selectbox("Order Type", options=["MARKET", "LIMIT", "STOP_LIMIT"])
+    order_type = st.selectbox("Order Type", options=["MARKET", "LIMIT", "STOP_LIMIT", "STOP_MARKET", "TAKE_PROFIT",
+                                                     "TAKE_PROFIT_MARKET", "TRAILING_STOP_MARKET"])
     quantity = st.number_input("Quantity", min_value=0.001, step=0.001, format="%.3f")
 
 with col2:
@@ -72,18 +81,67 @@ with col2:
     
     price = 0.0
     stop_price = 0.0
+    callback_rate = None
+    activation_price = None
     
-    if order_type in ["LIMIT", "STOP_LIMIT"]:
+    if order_type in ["LIMIT", "STOP_LIMIT", "TAKE_PROFIT"]:
         price = st.number_input("Limit Price", min_value=0.0, step=1.0, format="%.2f")
         
-    if order_type == "STOP_LIMIT":
+    if order_type in ["STOP_LIMIT", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET"]:
         stop_price = st.number_input("Stop Price", min_value=0.0, step=1.0, format="%.2f")
         
         from bot.validators import would_trigger_immediately
         if current_price and stop_price > 0:
-            if would_trigger_immediately(stop_price, current_price, side):
-                st.warning(f"⚠️ Warning: A {side} stop order at {stop_price} would trigger immediately since the current price is {current_price}.")
+            # Take-profits trigger on a move in the position's favour, the mirror image of a stop.
+            trigger_side = ("SELL" if side == "BUY" else "BUY") if order_type.startswith("TAKE_PROFIT") else side
+            if would_trigger_immediately(stop_price, current_price, trigger_side):
+                st.warning(f"⚠️ Warning: A {side} {order_type} order at {stop_price} would trigger immediately since the current price is {current_price}.")
+
+    if order_type == "TRAILING_STOP_MARKET":
+        callback_rate = st.number_input("Callback Rate (%)", min_value=0.1, max_value=10.0, value=1.0, step=0.1)
+        activation_price = st.number_input("Activation Price (0 = now)", min_value=0.0, step=1.0, format="%.2f") or None
     
+def render_depth(symbol: str, side: str, quantity: float):
+    """Top of the local order book plus what a MARKET order of the entered size would cost."""
+    try:
+        client = get_client()
+        book = client.start_order_book(symbol)
+        if not book.streaming:
+            book.resync()
+        depth = book.depth(15)
+        col_bids, col_asks = st.columns(2)
+        with col_bids:
+            st.caption("Bids")
+            st.dataframe([{"price": p, "quantity": q} for p, q in depth["bids"]], use_container_width=True, hide_index=True)
+        with col_asks:
+            st.caption("Asks")
+            st.dataframe([{"price": p, "quantity": q} for p, q in depth["asks"]], use_container_width=True, hide_index=True)
+
+        if "depth_manager" not in st.session_state:
+            st.session_state.depth_manager = OrderManager(client)
+        estimate = st.session_state.depth_manager.estimate_slippage(symbol, side, quantity)
+        col_mid, col_spread, col_fill = st.columns(3)
+        col_mid.metric("Mid", f"{estimate['mid_price']:.2f}" if estimate["mid_price"] else "-")
+        col_spread.metric("Spread", f"{book.spread():.2f}" if book.spread() is not None else "-")
+        if estimate["avg_price"] is not None:
+            slippage = f"{estimate['slippage_bps']:.2f} bps" if estimate["slippage_bps"] is not None else None
+            col_fill.metric(f"MARKET {side} {quantity} avg", f"{estimate['avg_price']:.2f}", slippage, delta_color="inverse")
+        if not estimate["complete"]:
+            st.warning(f"Visible depth only fills {estimate['filled']} of {quantity}.")
+        if not depth["synced"]:
+            st.caption("Depth stream resyncing; showing the last consistent book.")
+    except Exception as e:
+        st.warning(f"Order book unavailable: {e}")
+
+
+# Streamlit fragments redraw the depth view every second on their own; older versions refresh on each rerun.
+if hasattr(st, "fragment"):
+    render_depth = st.fragment(run_every=1)(render_depth)
+
+if st.session_state.api_connected:
+    st.subheader(f"{symbol} Market Depth")
+    render_depth(symbol, side, quantity)
+
 st.markdown("---")
     
 if st.button("Submit Order", use_container_width=True):
@@ -91,19 +149,125 @@ if st.button("Submit Order", use_container_width=True):
         st.error("Please connect to the API first using the sidebar.")
     else:
         try:
-            client = BinanceClient()
+            client = get_client()
             manager = OrderManager(client)
             
             with st.spinner(f"Placing {order_type} order..."):
-                if order_type == "MARKET":
-                    response = manager.place_market_order(symbol, side, quantity)
-                elif order_type == "LIMIT":
-                    response = manager.place_limit_order(symbol, side, quantity, price)
-                elif order_type == "STOP_LIMIT":
-                    response = manager.place_stop_limit_order(symbol, side, quantity, stop_price, price)
+                response = manager.place_order(OrderSpec(
+                    order_type, symbol, side, quantity, price or None, stop_price or None, callback_rate, activation_price,
+                ))
             
             st.success(f"Order Placed Successfully! Order ID: {response.get('orderId')}")
-            st.json(response)
+            st.json(response.to_dict())
             
         except Exception as e:
             st.error(f"Failed to place order: {e}")
+
+# --- EXECUTION ALGORITHMS ---
+def get_scheduler():
+    """The trading daemon's scheduler when it runs, otherwise one kept for this browser session."""
+    from bot.daemon_client import DaemonUnavailable, RemoteScheduler, connect_daemon
+    from bot.execution import ExecutionScheduler
+
+    try:
+        return RemoteScheduler(connect_daemon().client)
+    except DaemonUnavailable:
+        pass
+    if "scheduler" not in st.session_state:
+        st.session_state.scheduler = ExecutionScheduler(OrderManager(get_client()))
+    return st.session_state.scheduler
+
+
+def render_algos():
+    """Progress of every execution algo, newest first."""
+    try:
+        algos = sorted(get_scheduler().status(), key=lambda a: a["id"], reverse=True)
+    except Exception as e:
+        st.warning(f"Execution algos unavailable: {e}")
+        return
+    if not algos:
+        st.caption("No execution algos yet.")
+    for algo in algos:
+        avg = f" @ {algo['avg_price']:.2f}" if algo["avg_price"] else ""
+        st.progress(min(algo["progress"], 1.0), text=(
+            f"#{algo['id']} {algo['kind']} {algo['side']} {algo['symbol']}: {algo['filled']:g} / {algo['quantity']:g}"
+            f"{avg} ({len(algo['children'])} children, {algo['status']})"
+        ))
+        if algo["errors"] and algo["status"] != "COMPLETED":
+            st.caption(f"Last error: {algo['errors'][-1]}")
+
+
+if hasattr(st, "fragment"):
+    render_algos = st.fragment(run_every=1)(render_algos)
+
+if st.session_state.api_connected:
+    st.markdown("---")
+    st.subheader("Execution Algorithms")
+    with st.expander(f"Work {side} {quantity} {symbol} as an algo"):
+        algo_kind = st.selectbox("Algorithm", options=["TWAP", "ICEBERG", "POV"])
+        if algo_kind == "TWAP":
+            duration = st.number_input("Duration (seconds)", min_value=1.0, value=600.0, step=60.0)
+            slices = st.number_input("Child orders", min_value=1, value=10, step=1)
+        elif algo_kind == "ICEBERG":
+            display = st.number_input("Display quantity", min_value=0.001, value=max(quantity / 10, 0.001), step=0.001, format="%.3f")
+            iceberg_price = st.number_input("Iceberg limit price", min_value=0.0, value=float(current_price or 0.0), step=1.0, format="%.2f")
+        else:
+            participation = st.slider("Participation of market volume", min_value=0.01, max_value=0.5, value=0.1)
+            max_duration = st.number_input("Give up after (seconds)", min_value=60.0, value=3600.0, step=60.0)
+        col_start, col_cancel = st.columns(2)
+        with col_start:
+            if st.button("Start Algo", use_container_width=True):
+                try:
+                    scheduler = get_scheduler()
+                    if algo_kind == "TWAP":
+                        algo_id = scheduler.start_twap(symbol, side, quantity, duration, slices=int(slices))
+                    elif algo_kind == "ICEBERG":
+                        algo_id = scheduler.start_iceberg(symbol, side, quantity, display, iceberg_price)
+                    else:
+                        algo_id = scheduler.start_pov(symbol, side, quantity, participation, max_duration=max_duration)
+                    st.success(f"{algo_kind} algo {algo_id} started.")
+                except Exception as e:
+                    st.error(f"Failed to start algo: {e}")
+        with col_cancel:
+            cancel_id = st.number_input("Algo ID", min_value=1, step=1)
+            if st.button("Cancel Algo", use_container_width=True):
+                if get_scheduler().cancel(int(cancel_id)):
+                    st.success(f"Algo {int(cancel_id)} cancelled.")
+                else:
+                    st.warning(f"Algo {int(cancel_id)} is not running.")
+    render_algos()
+
+# --- ACCOUNT STATE ---
+if st.session_state.api_connected:
+    st.markdown("---")
+    st.subheader("Open Orders & Positions")
+    try:
+        # Kept current by the user-data stream; reruns read memory instead of polling REST.
+        book = get_client().start_state_book()
+        col_orders, col_positions = st.columns(2)
+        with col_orders:
+            open_orders = book.open_orders()
+            if open_orders:
+                st.dataframe(
+                    [{k: o.get(k) for k in ("orderId", "symbol", "side", "type", "price", "origQty", "executedQty", "status")} for o in open_orders],
+                    use_container_width=True,
+                )
+            else:
+                st.caption("No open orders.")
+            lookup = st.text_input("Order status", placeholder="Order ID or client order ID").strip()
+            if lookup:
+                order = book.find_order(lookup if lookup.isdigit() else None, lookup)
+                if order is not None:
+                    st.json(order)
+                else:
+                    st.caption(f"Order {lookup} is not in the state book.")
+        with col_positions:
+            positions = book.open_positions()
+            if positions:
+                st.dataframe(positions, use_container_width=True)
+            else:
+                st.caption("No open positions.")
+        if not book.connected:
+            st.caption("User-data stream disconnected; showing the last REST snapshot.")
+    except Exception as e:
+        st.warning(f"Account state unavailable: {e}")
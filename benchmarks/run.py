@@ -0,0 +1,247 @@
+"""
+Offline benchmark suite for the order path.
+
+Runs against the in-process MockExchange, writes results as JSON and compares them with a
+stored baseline. Exits with status 1 when a metric regresses by more than --tolerance, or
+when CLI start-up exceeds --cold-start-budget.
+
+    python benchmarks/run.py                    # run, write results, compare with baseline
+    python benchmarks/run.py --save-baseline    # run and store the results as the new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+# A percentile is only compared with the baseline when the run has enough samples to resolve
+# it; below that it is the slowest sample, which is noise.
+MIN_SAMPLES = {"p99_us": 100, "p999_us": 1000}
+
+sys.path.insert(0, ROOT)
+# Keep order logs off stdout and out of the measurements unless the caller asks otherwise.
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ["BINANCE_EXCHANGE"] = "mock"
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples_ns, total_s):
+    samples = sorted(samples_ns)
+    return {
+        "p50_us": percentile(samples, 0.50) / 1000,
+        "p99_us": percentile(samples, 0.99) / 1000,
+        "p999_us": percentile(samples, 0.999) / 1000,
+        "ops_per_s": len(samples) / total_s if total_s else 0.0,
+        "samples": len(samples),
+    }
+
+
+def timed(fn, iterations, rounds):
+    # Keeps each metric's best round: other load on the machine only ever makes a round slower.
+    best = None
+    clock = time.perf_counter_ns
+    for _ in range(rounds):
+        samples = []
+        start = time.perf_counter()
+        for i in range(iterations):
+            t0 = clock()
+            fn(i)
+            samples.append(clock() - t0)
+        result = summarize(samples, time.perf_counter() - start)
+        if best is None:
+            best = result
+            continue
+        for metric, value in result.items():
+            best[metric] = max(best[metric], value) if metric == "ops_per_s" else min(best[metric], value)
+    return best
+
+
+def bench_orders(iterations, rounds):
+    from bot.client import BinanceClient
+    from bot.orders import OrderManager
+
+    manager = OrderManager(BinanceClient(exchange="mock"))
+    sides = ("BUY", "SELL")
+    return {
+        "place_market_order": timed(lambda i: manager.place_market_order("BTCUSDT", sides[i & 1], 0.01), iterations, rounds),
+        "place_limit_order": timed(lambda i: manager.place_limit_order("ETHUSDT", sides[i & 1], 0.1, 3400 + (i % 50)), iterations, rounds),
+        "place_stop_limit_order": timed(lambda i: manager.place_stop_limit_order("SOLUSDT", "SELL", 1, 140 - (i % 10), 139 - (i % 10)), iterations, rounds),
+    }
+
+
+def bench_validators(iterations, rounds):
+    from bot.validators import validate_symbol, validate_side, validate_quantity, validate_price
+
+    def validate(i):
+        validate_symbol("btcusdt")
+        validate_side("buy")
+        validate_quantity("0.01", "BTCUSDT")
+        validate_price("65000.5", "LIMIT", "BTCUSDT")
+
+    return {"validate_order_fields": timed(validate, iterations, rounds)}
+
+
+def bench_logging(iterations, rounds):
+    import logging
+    from bot import logging_config
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("sync", "queue"):
+            # Fresh handlers per mode, writing to a scratch file with console output discarded.
+            logging_config.LOG_FILE_PATH = os.path.join(tmp, f"{mode}.log")
+            logging_config._shared_handlers = [logging.NullHandler(), logging_config._file_handler()]
+            logging_config._queue_handler = None
+            os.environ["LOG_MODE"] = mode
+            logger = logging_config.setup_logger(f"benchmarks.logging.{mode}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            results[f"logger_info_{mode}"] = timed(
+                lambda i: logger.info("Preparing LIMIT order: Symbol=%s, Side=%s, Quantity=%s, Price=%s", "BTCUSDT", "BUY", 0.01, 65000.0),
+                iterations, rounds,
+            )
+            logging_config.stop_logging()
+        results["logger_debug_disabled"] = timed(lambda i: logger.debug("Response details: %s", i), iterations, rounds)
+    return results
+
+
+def launch(commands, runs):
+    # Round-robin over the commands, so load changes during the run hit all of them alike and
+    # the differences the cold-start check takes between them stay meaningful.
+    samples = {name: [] for name in commands}
+    for _ in range(runs):
+        for name, command in commands.items():
+            t0 = time.perf_counter_ns()
+            subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT, env=os.environ.copy())
+            samples[name].append(time.perf_counter_ns() - t0)
+    return {name: summarize(values, sum(values) / 1e9) for name, values in samples.items()}
+
+
+def bench_cold_start(runs):
+    # python_startup is the bare interpreter; the rest are read as overhead on top of it.
+    return launch({
+        "python_startup": [sys.executable, "-c", "pass"],
+        "import_typer": [sys.executable, "-c", "import typer"],
+        "import_bot": [sys.executable, "-c", "import bot"],
+        "import_bot_validators": [sys.executable, "-c", "import bot.validators"],
+        "import_bot_orders": [sys.executable, "-c", "import bot.orders"],
+        "cli_help": [sys.executable, os.path.join(ROOT, "cli.py"), "--help"],
+        "cli_validation_error": [sys.executable, os.path.join(ROOT, "cli.py"), "market-order", "BTCUSDT", "HOLD", "1"],
+    }, runs)
+
+
+def check_cold_start(benchmarks, budget_ms):
+    """
+    Returns budget violations: CLI p50 above interpreter startup plus typer, or modules that load python-binance.
+
+    Every CLI run parses its arguments with typer, whose own import (about 50ms over a bare
+    interpreter, more on slower machines) is the floor of any command. The budget covers what
+    the CLI adds on top of that floor; the overhead over the bare interpreter is printed too.
+    """
+    problems = []
+    startup = benchmarks.get("python_startup")
+    floor = benchmarks.get("import_typer")
+    if startup and floor:
+        for name in ("cli_help", "cli_validation_error"):
+            if name in benchmarks:
+                total_ms = (benchmarks[name]["p50_us"] - startup["p50_us"]) / 1000
+                overhead_ms = (benchmarks[name]["p50_us"] - floor["p50_us"]) / 1000
+                print(f"Cold start: {name} {total_ms:.0f}ms over interpreter startup, {overhead_ms:.0f}ms over importing typer")
+                if overhead_ms > budget_ms:
+                    problems.append(f"{name}: {overhead_ms:.0f}ms over importing typer (budget {budget_ms:.0f}ms)")
+    for module in ("bot", "bot.validators", "bot.orders", "bot.daemon_client"):
+        probe = f"import sys, {module}; sys.exit('binance' in sys.modules)"
+        if subprocess.run([sys.executable, "-c", probe], cwd=ROOT, env=os.environ.copy()).returncode:
+            problems.append(f"import {module} loads python-binance")
+    return problems
+
+
+def compare(results, baseline, tolerance):
+    """Returns a list of human-readable regressions beyond the tolerance."""
+    regressions = []
+    for name, metrics in results["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base:
+            continue
+        for metric, value in metrics.items():
+            old = base.get(metric)
+            if not old or metric == "samples" or metrics["samples"] < MIN_SAMPLES.get(metric, 0):
+                continue
+            # Throughput regresses when it drops, latency when it rises.
+            change = (old - value) / old if metric == "ops_per_s" else (value - old) / old
+            if change > tolerance:
+                regressions.append(f"{name}.{metric}: {old:.2f} -> {value:.2f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000, help="iterations per in-process benchmark")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per in-process benchmark; the best is kept")
+    parser.add_argument("--cli-runs", type=int, default=10, help="process launches per CLI benchmark")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to write the JSON results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--skip-cli", action="store_true", help="skip the CLI cold-start benchmarks")
+    parser.add_argument("--cold-start-budget", type=float, default=50.0,
+                        help="allowed CLI start-up time in ms on top of an interpreter that imports typer")
+    args = parser.parse_args()
+
+    benchmarks = {}
+    benchmarks.update(bench_orders(args.iterations, args.rounds))
+    benchmarks.update(bench_validators(args.iterations, args.rounds))
+    benchmarks.update(bench_logging(args.iterations, args.rounds))
+    if not args.skip_cli:
+        benchmarks.update(bench_cold_start(args.cli_runs))
+
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()},
+        "benchmarks": benchmarks,
+    }
+
+    for name, metrics in benchmarks.items():
+        print(f"{name:28} p50 {metrics['p50_us']:10.1f}us  p99 {metrics['p99_us']:10.1f}us  "
+              f"p999 {metrics['p999_us']:10.1f}us  {metrics['ops_per_s']:12.0f} ops/s")
+
+    output = BASELINE_PATH if args.save_baseline else args.output
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    status = 0
+    if not args.skip_cli:
+        problems = check_cold_start(benchmarks, args.cold_start_budget)
+        for line in problems:
+            print(f"Cold start: {line}")
+        status = 1 if problems else 0
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return status
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions against baseline.")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
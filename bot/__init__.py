@@ -1,17 +1,35 @@
-from .client import BinanceClient
-from .orders import OrderManager
-from .validators import validate_price, validate_symbol, validate_side, validate_order_type, validate_quantity, ValidationError, would_trigger_immediately
-from .logging_config import setup_logger
+import importlib
 
-__all__ = [
-    "BinanceClient", 
-    "OrderManager", 
-    "validate_price", 
-    "validate_symbol", 
-    "validate_side", 
-    "validate_order_type", 
-    "validate_quantity", 
-    "ValidationError", 
-    "would_trigger_immediately", 
-    "setup_logger"
-]
\ No newline at end of file
+# Public name -> submodule. Resolved on first attribute access (PEP 562) so that importing
+# bot.validators or bot.orders does not pull in python-binance through the package.
+_EXPORTS = {
+    "BinanceClient": "client",
+    "get_client": "client",
+    "close_clients": "client",
+    "OrderManager": "orders",
+    "AsyncOrderManager": "async_orders",
+    "validate_price": "validators",
+    "validate_symbol": "validators",
+    "validate_side": "validators",
+    "validate_order_type": "validators",
+    "validate_quantity": "validators",
+    "validate_notional": "validators",
+    "ValidationError": "validators",
+    "would_trigger_immediately": "validators",
+    "setup_logger": "logging_config",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,212 @@
+import asyncio
+import contextvars
+import itertools
+import os
+import uuid
+import aiohttp
+from binance import AsyncClient
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from bot.env import load_env
+from bot.journal import OrderJournal
+from bot.logging_config import setup_logger
+from bot.orders import ORDER_MAX_RETRIES, ORDER_RETRY_DEADLINE, OrderResult, OrderSpec, _is_ambiguous, _Submission, order_template
+from bot.rate_limiter import RateLimiter, get_rate_limiter
+from bot.validators import ValidationError
+
+load_env()
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 10
+
+# The current task's last HTTP response. AsyncClient.response is shared by every task on the
+# client and _handle_response awaits after setting it, so it may already be another task's.
+_response = contextvars.ContextVar("binance_async_response", default=None)
+
+
+def _is_ambiguous_async(error: Exception) -> bool:
+    # aiohttp raises its own timeout and connection errors where requests raises Timeout / ConnectionError.
+    return isinstance(error, (asyncio.TimeoutError, aiohttp.ClientConnectionError)) or _is_ambiguous(error)
+
+
+class RateLimitedAsyncClient(AsyncClient):
+    """AsyncClient that records each response in the calling task's context, for its rate-limit headers."""
+
+    async def _handle_response(self, response):
+        _response.set(response)
+        return await super()._handle_response(response)
+
+
+class AsyncOrderManager:
+    """
+    Coroutine counterpart of OrderManager built on python-binance's AsyncClient.
+
+    Orders are stamped, journaled and retried by the same rules as OrderManager._submit, and
+    every call goes through the rate limiter, which also reads the responses' usage headers.
+    """
+
+    def __init__(self, client: AsyncClient, rate_limiter: RateLimiter = None, journal: OrderJournal = None,
+                 max_retries: int = None, retry_deadline: float = None):
+        self.client = client
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        if journal is None and os.getenv("ORDER_JOURNAL_PATH"):
+            journal = OrderJournal(os.getenv("ORDER_JOURNAL_PATH"))
+        self.journal = journal
+        self.max_retries = ORDER_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_deadline = retry_deadline or ORDER_RETRY_DEADLINE
+        self._session = uuid.uuid4().hex[:12]
+        self._seq = itertools.count(1)
+        self._latency = None
+
+    @classmethod
+    async def create(cls, api_key=None, api_secret=None, testnet=True) -> "AsyncOrderManager":
+        api_key = api_key or os.getenv("API_KEY")
+        api_secret = api_secret or os.getenv("SECRET_KEY")
+        if not api_key or not api_secret:
+            logger.error("API_KEY or SECRET_KEY not found in environment variables.")
+            raise ValueError("API_KEY and SECRET_KEY must be set in .env file.")
+
+        client = await RateLimitedAsyncClient.create(api_key, api_secret, testnet=testnet)
+        logger.info("Binance Futures Testnet AsyncClient initialized successfully.")
+        return cls(client)
+
+    async def close(self):
+        await self.client.close_connection()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _call(self, method, weight: int = 1, orders: int = 0, **params):
+        """Awaits one client call under the rate limiter, then feeds it the response's usage headers."""
+        limiter = self.rate_limiter
+        await limiter.acquire_async(weight, orders)
+        _response.set(None)
+        try:
+            result = await method(**params)
+        except BinanceAPIException as e:
+            headers = getattr(e.response, "headers", None) or {}
+            if e.status_code in (418, 429):
+                await limiter.block_async(float(headers.get("Retry-After", 60)))
+            await limiter.update_from_headers_async(headers)
+            raise
+        response = _response.get()
+        if response is not None:
+            await limiter.update_from_headers_async(response.headers)
+        return result
+
+    async def _lookup(self, symbol: str, client_order_id: str):
+        """Returns the exchange's copy of the order, or None if it never arrived (-2013)."""
+        try:
+            return await self._call(self.client.futures_get_order, symbol=symbol, origClientOrderId=client_order_id)
+        except BinanceAPIException as e:
+            if e.code == -2013:
+                return None
+            raise
+
+    async def _submit(self, label: str, order_params: dict) -> dict:
+        """Sends an order, retrying only when its outcome is unknown (see bot.orders._Submission)."""
+        submission = _Submission(self, label, order_params, is_ambiguous=_is_ambiguous_async)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = submission.retry_delay()
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+                try:
+                    existing = await self._lookup(submission.symbol, submission.client_order_id)
+                except Exception as e:
+                    submission.lookup_failed(e)
+                    continue
+                if existing is not None:
+                    return submission.found(existing)
+                submission.resending(attempt)
+
+            submission.sending()
+            try:
+                response = await self._call(self.client.futures_create_order, orders=1, **order_params)
+            except Exception as e:
+                submission.failed(e)
+                continue
+            return submission.sent(response)
+        raise submission.error
+
+    async def _send(self, label: str, order_params: dict) -> OrderResult:
+        logger.debug("Request details: futures_create_order(**%s)", order_params)
+        try:
+            response = await self._submit(label, order_params)
+        except BinanceAPIException as e:
+            logger.error(f"Binance API Error during {label} order: {e}")
+            raise
+        except BinanceRequestException as e:
+            logger.error(f"Binance API Error during {label} order: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error during {label} order: {e}")
+            raise
+
+        logger.debug("Response details: %s", response)
+        result = OrderResult.from_response(response, order_params)
+        logger.info("%s order placed: orderId=%s, status=%s", label, result.order_id, result.status)
+        return result
+
+    async def place_order(self, order) -> OrderResult:
+        """Places one order (an OrderSpec or an order spec dict) through the same templates as OrderManager.place_order."""
+        spec = order if isinstance(order, OrderSpec) else OrderSpec.from_dict(order)
+        template = None
+        try:
+            template = order_template(spec.type or "MARKET")
+            order_params = template.build(spec)
+        except ValidationError as e:
+            logger.error(f"Validation Error before placing {template.name if template is not None else 'UNKNOWN'} order: {e}")
+            raise
+
+        return await self._send(template.name, order_params)
+
+    async def place_market_order(self, symbol: str, side: str, quantity: float) -> OrderResult:
+        """Places a MARKET order on Binance Futures."""
+        return await self.place_order(OrderSpec("MARKET", symbol, side, quantity))
+
+    async def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> OrderResult:
+        """Places a LIMIT order on Binance Futures."""
+        return await self.place_order(OrderSpec("LIMIT", symbol, side, quantity, price))
+
+    async def place_stop_limit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float) -> OrderResult:
+        """Places a STOP_LIMIT order on Binance Futures."""
+        return await self.place_order(OrderSpec("STOP_LIMIT", symbol, side, quantity, price, stop_price))
+
+    async def place_stop_market_order(self, symbol: str, side: str, quantity: float, stop_price: float, reduce_only: bool = False) -> OrderResult:
+        return await self.place_order(OrderSpec("STOP_MARKET", symbol, side, quantity, stop_price=stop_price, reduce_only=reduce_only))
+
+    async def place_take_profit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float,
+                                      reduce_only: bool = False) -> OrderResult:
+        return await self.place_order(OrderSpec("TAKE_PROFIT", symbol, side, quantity, price, stop_price, reduce_only=reduce_only))
+
+    async def place_take_profit_market_order(self, symbol: str, side: str, quantity: float, stop_price: float,
+                                             reduce_only: bool = False) -> OrderResult:
+        return await self.place_order(OrderSpec("TAKE_PROFIT_MARKET", symbol, side, quantity, stop_price=stop_price, reduce_only=reduce_only))
+
+    async def place_trailing_stop_order(self, symbol: str, side: str, quantity: float, callback_rate: float,
+                                        activation_price: float = None, reduce_only: bool = False) -> OrderResult:
+        return await self.place_order(OrderSpec("TRAILING_STOP_MARKET", symbol, side, quantity, callback_rate=callback_rate,
+                                                activation_price=activation_price, reduce_only=reduce_only))
+
+    async def submit_many(self, orders, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> list:
+        """
+        Places orders concurrently with at most max_in_flight requests outstanding.
+
+        Returns one {"order", "result", "error"} dict per input, in input order. A failing
+        order only sets its own "error"; the rest keep running.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+
+        async def run(order):
+            async with semaphore:
+                try:
+                    return {"order": order, "result": await self.place_order(order), "error": None}
+                except Exception as e:
+                    return {"order": order, "result": None, "error": e}
+
+        return await asyncio.gather(*(run(order) for order in orders))
@@ -0,0 +1,449 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from bot.bulk_validators import validate_orders_bulk
+from bot.klines import DATA_DIR, KlineStore
+from bot.logging_config import setup_logger
+from bot.orders import OrderResult, OrderSpec, build_order_params
+from bot.validators import ValidationError
+
+logger = setup_logger(__name__)
+
+DEFAULT_FEE_RATE = float(os.getenv("BACKTEST_FEE_RATE", "0.0004"))  # Binance futures taker fee
+# Exchange order types find_fills can replay; other valid types are counted as rejected.
+SIMULATED_TYPES = ("MARKET", "LIMIT", "STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET")
+_CONDITIONAL_TYPES = ("STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET")
+
+
+class CandleIndex:
+    """
+    Min/max pyramids over a candle series' lows and highs, for first-crossing queries.
+
+    Level k holds the lowest low (highest high) of each aligned block of 2**k bars, so the
+    first bar at or after s that trades through a price is found for every order at once in
+    O(log bars) array steps, however long the orders rest. Build it once and pass it to
+    simulate() or find_fills() when running many order sets over the same candles.
+    """
+
+    def __init__(self, candles: dict):
+        self.open = np.asarray(candles["open"], dtype=float)
+        self.bars = len(self.open)
+        self.lows = self._pyramid(np.asarray(candles["low"], dtype=float), np.minimum, np.inf)
+        self.highs = self._pyramid(np.asarray(candles["high"], dtype=float), np.maximum, -np.inf)
+
+    @staticmethod
+    def _pyramid(values, combine, pad) -> tuple:
+        # All levels in one flat array; level k starts at offsets[k] and has sizes[k] nodes.
+        level = np.full(1 << max(0, values.size - 1).bit_length(), pad)
+        level[:values.size] = values
+        levels = [level]
+        while level.size > 1:
+            level = combine(level[0::2], level[1::2])
+            levels.append(level)
+        sizes = np.array([level.size for level in levels], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        return np.concatenate(levels), offsets, sizes
+
+    def first_crossing(self, start, level, end, rising) -> np.ndarray:
+        """
+        First bar in [start, end) whose high reaches level (rising) or whose low reaches it
+        (not rising), per order, or -1. rising is an array of booleans.
+        """
+        found = np.full(len(start), -1, dtype=np.int64)
+        for pyramid, hits, rows in ((self.highs, np.greater_equal, rising), (self.lows, np.less_equal, ~rising)):
+            rows = np.flatnonzero(rows)
+            if rows.size:
+                found[rows] = self._first(pyramid, hits, start[rows], level[rows], end[rows])
+        return found
+
+    @staticmethod
+    def _first(pyramid, hits, start, level, end) -> np.ndarray:
+        flat, offsets, sizes = pyramid
+        top = len(sizes) - 1
+        found = np.full(len(start), -1, dtype=np.int64)
+        rows = np.flatnonzero(start < end)
+        node = start[rows].astype(np.int64)
+        depth = np.zeros(rows.size, dtype=np.int64)
+        target = level[rows]
+
+        # Climb: step right past blocks with no hit, going up a level whenever the next block is a left child.
+        hit = hits(flat[offsets[depth] + node], target)
+        while not hit.all():
+            miss = ~hit
+            node[miss] += 1
+            up = miss & (node % 2 == 0) & (depth < top)
+            node[up] //= 2
+            depth[up] += 1
+            # Stepping off the end of a level means nothing later ever trades through.
+            alive = node < sizes[depth]
+            rows, node, depth, target = rows[alive], node[alive], depth[alive], target[alive]
+            hit = hits(flat[offsets[depth] + node], target)
+
+        # Descend to the leftmost bar of the block that holds the hit.
+        while rows.size and depth.max() > 0:
+            down = np.flatnonzero(depth > 0)
+            depth[down] -= 1
+            node[down] *= 2
+            node[down] += ~hits(flat[offsets[depth[down]] + node[down]], target[down])
+
+        found[rows] = np.where(node < end[rows], node, -1)
+        return found
+
+
+def find_fills(candles: dict, submit, is_buy, order_type, price, stop_price, end=None, index: CandleIndex = None):
+    """
+    Fill bar and price for each order placed at the close of bar submit.
+
+    Semantics follow OrderManager's order types on OHLC data:
+    MARKET fills at the next bar's open. LIMIT fills on the first later bar that trades
+    through the price, at the price or at a better opening gap. STOP_LIMIT triggers the way
+    would_trigger_immediately does (BUY once price >= stop, SELL once price <= stop) and
+    then rests as a LIMIT; a trigger that is already marketable fills at the stop or the
+    gapped open. TAKE_PROFIT triggers on the mirror-image move (BUY once price <= stop).
+    The _MARKET variants fill at the stop or the gapped open as soon as they trigger.
+    Orders with no fill before end (default: the last bar) get bar -1.
+    """
+    index = index or CandleIndex(candles)
+    open_ = index.open
+    n = len(submit)
+    is_buy = np.asarray(is_buy, dtype=bool)
+    first = np.asarray(submit, dtype=np.int64) + 1
+    end = np.full(n, index.bars, dtype=np.int64) if end is None else np.minimum(np.asarray(end, dtype=np.int64), index.bars)
+    fill_at = np.full(n, -1, dtype=np.int64)
+    fill_price = np.full(n, np.nan)
+
+    market = (order_type == "MARKET") & (first < end)
+    fill_at[market] = first[market]
+    fill_price[market] = open_[first[market]]
+
+    limit = np.flatnonzero(order_type == "LIMIT")
+    if limit.size:
+        _fill_resting(index, limit, first[limit], is_buy, price, end, fill_at, fill_price)
+
+    stops = np.flatnonzero(np.isin(order_type, _CONDITIONAL_TYPES))
+    if stops.size:
+        # Stops fire on a move against the order (BUY on a rise), take-profits on a move in its favour.
+        rising = is_buy[stops] ^ np.isin(order_type[stops], ("TAKE_PROFIT", "TAKE_PROFIT_MARKET"))
+        triggered_at = index.first_crossing(first[stops], stop_price[stops], end[stops], rising=rising)
+        live = triggered_at >= 0
+        rows, t, rising = stops[live], triggered_at[live], rising[live]
+        buy = is_buy[rows]
+        gapped = np.where(rising, open_[t] >= stop_price[rows], open_[t] <= stop_price[rows])
+        reference = np.where(gapped, open_[t], stop_price[rows])
+        at_market = np.isin(order_type[rows], ("STOP_MARKET", "TAKE_PROFIT_MARKET"))
+        marketable = at_market | np.where(buy, reference <= price[rows], reference >= price[rows])
+        fill_at[rows[marketable]] = t[marketable]
+        fill_price[rows[marketable]] = reference[marketable]
+        resting = ~marketable
+        if resting.any():
+            _fill_resting(index, rows[resting], t[resting] + 1, is_buy, price, end, fill_at, fill_price)
+
+    return fill_at, fill_price
+
+
+def _fill_resting(index, rows, start, is_buy, price, end, fill_at, fill_price):
+    buy = is_buy[rows]
+    at = index.first_crossing(start, price[rows], end[rows], rising=~buy)
+    hit = at >= 0
+    rows, at, buy = rows[hit], at[hit], buy[hit]
+    fill_at[rows] = at
+    # A bar that opens through the limit fills at the open, which is the better price.
+    opened = index.open[at]
+    fill_price[rows] = np.where(buy, np.minimum(price[rows], opened), np.maximum(price[rows], opened))
+
+
+def _normalize(orders: dict, symbol: str = None) -> tuple:
+    """Validates an order-array dict like OrderManager would and returns (columns, rejected mask)."""
+    n = len(orders["submit"])
+    columns = {
+        "submit": np.asarray(orders["submit"], dtype=np.int64),
+        "side": np.asarray(orders["side"]),
+        "type": np.asarray(orders.get("type", np.full(n, "MARKET"))),
+        "quantity": np.asarray(orders["quantity"], dtype=float) * np.ones(n),
+        "price": np.asarray(orders.get("price", np.full(n, np.nan)), dtype=float) * np.ones(n),
+        "stop_price": np.asarray(orders.get("stop_price", np.full(n, np.nan)), dtype=float) * np.ones(n),
+    }
+    rejected = np.zeros(n, dtype=bool)
+    if symbol is not None and n:
+        # Same checks, rounding and messages as the live path.
+        bulk = {name: columns[name] for name in ("side", "type", "quantity", "price", "stop_price")}
+        bulk["symbol"] = np.full(n, symbol)
+        result = validate_orders_bulk(bulk)
+        rejected = result.errors | ~np.isin(result.type.astype(str), SIMULATED_TYPES)
+        columns.update(side=result.side, type=result.type, quantity=result.quantity, price=result.price, stop_price=result.stop_price)
+    else:
+        columns["side"] = np.char.upper(columns["side"].astype(str))
+        columns["type"] = np.where(np.char.upper(columns["type"].astype(str)) == "STOP_LIMIT", "STOP", np.char.upper(columns["type"].astype(str)))
+    return columns, rejected
+
+
+def simulate(candles: dict, orders: dict, symbol: str = None, fee_rate: float = DEFAULT_FEE_RATE,
+             keep_equity: bool = False, index: CandleIndex = None) -> dict:
+    """
+    Fills an array of orders against candles and returns PnL statistics.
+
+    orders holds equal-length arrays: submit (bar index the order is placed at), side,
+    type (MARKET, LIMIT, STOP_LIMIT, STOP_MARKET, TAKE_PROFIT or TAKE_PROFIT_MARKET), quantity, and price / stop_price where needed;
+    optional expire gives bars until cancel. Passing symbol runs the live validators (and
+    exchange filters, if loaded) and counts rejected orders instead of filling them.
+    index is a CandleIndex for these candles, reused across calls when given.
+    """
+    columns, rejected = _normalize(orders, symbol)
+    n = len(columns["submit"])
+    end = None
+    if "expire" in orders:
+        end = columns["submit"] + 1 + np.asarray(orders["expire"], dtype=np.int64)
+
+    is_buy = columns["side"] == "BUY"
+    order_type = np.where(rejected, "REJECTED", columns["type"])
+    fill_at, fill_price = find_fills(candles, columns["submit"], is_buy, order_type, columns["price"], columns["stop_price"], end, index)
+    return _statistics(candles, fill_at, fill_price, is_buy, columns["quantity"], fee_rate, int(rejected.sum()), n, keep_equity)
+
+
+def _statistics(candles, fill_at, fill_price, is_buy, quantity, fee_rate, rejected, n, keep_equity) -> dict:
+    close = candles["close"]
+    filled = fill_at >= 0
+    at = fill_at[filled]
+    signed = np.where(is_buy[filled], quantity[filled], -quantity[filled])
+    notional = signed * fill_price[filled]
+    fees = np.abs(notional) * fee_rate
+
+    position = np.zeros(len(close))
+    cash = np.zeros(len(close))
+    np.add.at(position, at, signed)
+    np.add.at(cash, at, -notional - fees)
+    position = np.cumsum(position)
+    equity = np.cumsum(cash) + position * close
+
+    peak = np.maximum.accumulate(equity) if len(equity) else equity
+    stats = {
+        "pnl": float(equity[-1]) if len(equity) else 0.0,
+        "max_drawdown": float((peak - equity).max()) if len(equity) else 0.0,
+        "fees": float(fees.sum()),
+        "volume": float(np.abs(notional).sum()),
+        "orders": n,
+        "filled": int(filled.sum()),
+        "rejected": rejected,
+        "final_position": float(position[-1]) if len(position) else 0.0,
+    }
+    if keep_equity:
+        stats["equity"] = equity
+    return stats
+
+
+def sma_crossover(candles: dict, fast: int = 10, slow: int = 50, quantity: float = 0.01) -> dict:
+    """Example vectorized strategy: long while the fast close SMA is above the slow one, short otherwise."""
+    close = np.asarray(candles["close"], dtype=float)
+    if len(close) <= slow or fast >= slow:
+        return {"submit": np.empty(0, dtype=np.int64), "side": np.empty(0, dtype="<U4"), "quantity": np.empty(0)}
+    sums = np.concatenate(([0.0], np.cumsum(close)))
+    fast_ma = (sums[slow:] - sums[slow - fast:-fast]) / fast
+    slow_ma = (sums[slow:] - sums[:-slow]) / slow
+    target = np.where(fast_ma > slow_ma, quantity, -quantity)
+    change = np.flatnonzero(np.diff(target, prepend=0.0))
+    delta = np.diff(target, prepend=0.0)[change]
+    return {
+        "submit": change + slow - 1,
+        "side": np.where(delta > 0, "BUY", "SELL"),
+        "type": np.full(change.size, "MARKET"),
+        "quantity": np.abs(delta),
+    }
+
+
+# --- parameter sweeps ---
+
+_worker_candles = None
+_worker_index = None
+_worker_options = None
+
+
+def _init_worker(source, options):
+    global _worker_candles, _worker_index, _worker_options
+    if isinstance(source, dict):
+        _worker_candles = source
+    else:
+        root, symbol, interval, start, end = source
+        # Each worker memory-maps the same files, so the OS page cache holds one copy of the history.
+        _worker_candles = KlineStore(root).read(symbol, interval, start=start, end=end)
+    _worker_index = CandleIndex(_worker_candles)
+    _worker_options = options
+
+
+def _run_one(job):
+    strategy, params = job
+    try:
+        orders = strategy(_worker_candles, **params)
+        stats = simulate(_worker_candles, orders, index=_worker_index, **_worker_options)
+    except Exception as e:
+        return {"params": params, "error": str(e)}
+    stats["params"] = params
+    return stats
+
+
+def expand_grid(grid) -> list:
+    """{"fast": [5, 10], "slow": [50]} -> [{"fast": 5, "slow": 50}, {"fast": 10, "slow": 50}]. Lists pass through."""
+    if isinstance(grid, dict):
+        names = list(grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    return list(grid)
+
+
+def run_grid(strategy, grid, candles: dict = None, symbol: str = None, interval: str = None, start=None, end=None,
+             store_root: str = DATA_DIR, processes: int = None, fee_rate: float = DEFAULT_FEE_RATE, validate: bool = True) -> list:
+    """
+    Runs strategy(candles, **params) for every parameter set on a process pool.
+
+    strategy must be a module-level function returning an orders dict (see simulate). Pass
+    candles directly, or symbol/interval/start/end to have every worker memory-map the
+    KlineStore history instead of receiving a pickled copy. Results come back in grid order.
+    """
+    combos = expand_grid(grid)
+    if candles is None:
+        if symbol is None or interval is None:
+            raise ValidationError("Pass candles, or symbol and interval to read from the kline store.")
+        source = (store_root, symbol.upper(), interval, start, end)
+    else:
+        source = {name: np.asarray(values) for name, values in candles.items()}
+    options = {"symbol": symbol.upper() if (symbol and validate) else None, "fee_rate": fee_rate}
+
+    workers = processes or os.cpu_count() or 1
+    chunksize = max(1, len(combos) // (workers * 8))
+    logger.info(f"Backtesting {len(combos)} parameter sets on {workers} processes.")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source, options)) as executor:
+        return list(executor.map(_run_one, [(strategy, params) for params in combos], chunksize=chunksize))
+
+
+# --- OrderManager-compatible simulation ---
+
+class SimulatedOrderManager:
+    """
+    Drop-in stand-in for OrderManager over historical candles.
+
+    A strategy that calls place_order or the place_* methods on an OrderManager runs
+    unchanged against this class via run_strategy(), and gets the same OrderResult back.
+    Orders are validated with the live rules, and each one's fill is worked out with the same
+    vectorized engine as simulate(). A fill is only reported once the replay clock (now)
+    reaches its fill bar, so even a MARKET order placed at bar t shows FILLED from bar t + 1,
+    the bar whose open it fills at. TRAILING_STOP_MARKET orders are not simulated.
+    """
+
+    def __init__(self, candles: dict, fee_rate: float = DEFAULT_FEE_RATE):
+        self.candles = candles
+        self.fee_rate = fee_rate
+        self.index = CandleIndex(candles)
+        self.now = 0
+        self.orders = []  # dicts: orderId, symbol, side, type, quantity, price, stop_price, submit, fill_at, fill_price, canceled_at
+
+    @property
+    def candle(self) -> dict:
+        return {name: values[self.now] for name, values in self.candles.items()}
+
+    def place_order(self, order) -> OrderResult:
+        """Places one order (an OrderSpec or an order spec dict), like OrderManager.place_order."""
+        params = build_order_params(order)
+        if params["type"] not in SIMULATED_TYPES:
+            raise ValidationError(f"{params['type']} orders cannot be simulated on candles.")
+        price = params.get("price", np.nan)
+        stop = params.get("stopPrice", np.nan)
+        fill_at, fill_price = find_fills(
+            self.candles, np.array([self.now]), np.array([params["side"] == "BUY"]), np.array([params["type"]]),
+            np.array([price], dtype=float), np.array([stop], dtype=float), index=self.index,
+        )
+        order = {
+            "orderId": len(self.orders) + 1, "symbol": params["symbol"], "side": params["side"], "type": params["type"],
+            "quantity": params["quantity"], "price": price, "stop_price": stop, "submit": self.now,
+            "fill_at": int(fill_at[0]), "fill_price": float(fill_price[0]), "canceled_at": None,
+        }
+        self.orders.append(order)
+        return self._response(order)
+
+    def place_market_order(self, symbol: str, side: str, quantity: float) -> OrderResult:
+        return self.place_order(OrderSpec("MARKET", symbol, side, quantity))
+
+    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> OrderResult:
+        return self.place_order(OrderSpec("LIMIT", symbol, side, quantity, price))
+
+    def place_stop_limit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float) -> OrderResult:
+        return self.place_order(OrderSpec("STOP_LIMIT", symbol, side, quantity, price, stop_price))
+
+    def place_stop_market_order(self, symbol: str, side: str, quantity: float, stop_price: float, reduce_only: bool = False) -> OrderResult:
+        return self.place_order(OrderSpec("STOP_MARKET", symbol, side, quantity, stop_price=stop_price, reduce_only=reduce_only))
+
+    def place_take_profit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float,
+                                reduce_only: bool = False) -> OrderResult:
+        return self.place_order(OrderSpec("TAKE_PROFIT", symbol, side, quantity, price, stop_price, reduce_only=reduce_only))
+
+    def place_take_profit_market_order(self, symbol: str, side: str, quantity: float, stop_price: float,
+                                       reduce_only: bool = False) -> OrderResult:
+        return self.place_order(OrderSpec("TAKE_PROFIT_MARKET", symbol, side, quantity, stop_price=stop_price, reduce_only=reduce_only))
+
+    def place_trailing_stop_order(self, symbol: str, side: str, quantity: float, callback_rate: float,
+                                  activation_price: float = None, reduce_only: bool = False) -> OrderResult:
+        return self.place_order(OrderSpec("TRAILING_STOP_MARKET", symbol, side, quantity, callback_rate=callback_rate,
+                                          activation_price=activation_price, reduce_only=reduce_only))
+
+    def get_order(self, order_id: int) -> OrderResult:
+        return self._response(self.orders[order_id - 1])
+
+    def cancel_order(self, order_id: int) -> OrderResult:
+        order = self.orders[order_id - 1]
+        if self._status(order) == "NEW":
+            order["canceled_at"] = self.now
+        return self._response(order)
+
+    def open_orders(self, symbol: str = None) -> list:
+        return [self._response(order).to_dict() for order in self.orders
+                if self._status(order) == "NEW" and (symbol is None or order["symbol"] == symbol.upper())]
+
+    def order_status(self, symbol: str = None, order_id=None, client_order_id=None) -> dict:
+        if order_id is None:
+            raise ValidationError("Simulated orders are looked up by order ID.")
+        return self.get_order(int(order_id)).to_dict()
+
+    def position(self) -> float:
+        return sum((o["quantity"] if o["side"] == "BUY" else -o["quantity"]) for o in self.orders if self._status(o) == "FILLED")
+
+    def results(self, keep_equity: bool = False) -> dict:
+        if not self.orders:
+            return _statistics(self.candles, np.empty(0, dtype=np.int64), np.empty(0), np.empty(0, dtype=bool), np.empty(0), self.fee_rate, 0, 0, keep_equity)
+        fill_at = np.array([o["fill_at"] if self._filled_by(o, len(self.candles["close"])) else -1 for o in self.orders], dtype=np.int64)
+        fill_price = np.array([o["fill_price"] for o in self.orders])
+        is_buy = np.array([o["side"] == "BUY" for o in self.orders])
+        quantity = np.array([o["quantity"] for o in self.orders])
+        return _statistics(self.candles, fill_at, fill_price, is_buy, quantity, self.fee_rate, 0, len(self.orders), keep_equity)
+
+    def _filled_by(self, order: dict, bar: int) -> bool:
+        if order["fill_at"] < 0 or order["fill_at"] > bar:
+            return False
+        return order["canceled_at"] is None or order["fill_at"] <= order["canceled_at"]
+
+    def _status(self, order: dict) -> str:
+        if self._filled_by(order, self.now):
+            return "FILLED"
+        return "CANCELED" if order["canceled_at"] is not None else "NEW"
+
+    def _response(self, order: dict) -> OrderResult:
+        status = self._status(order)
+        filled = status == "FILLED"
+        bar = order["fill_at"] if filled else order["canceled_at"] if status == "CANCELED" else order["submit"]
+        open_time = self.candles.get("open_time")
+        return OrderResult.from_response({
+            "orderId": order["orderId"], "symbol": order["symbol"], "side": order["side"], "type": order["type"],
+            "status": status, "origQty": order["quantity"],
+            "executedQty": order["quantity"] if filled else 0.0,
+            "cumQuote": order["quantity"] * order["fill_price"] if filled else 0.0,
+            "avgPrice": repr(order["fill_price"] if filled else 0.0),  # a string, as Binance sends it, so 0 is not read as missing
+            "price": 0.0 if np.isnan(order["price"]) else order["price"],
+            "stopPrice": 0.0 if np.isnan(order["stop_price"]) else order["stop_price"],
+            "updateTime": int(open_time[bar]) if open_time is not None else None,
+        })
+
+
+def run_strategy(on_candle, candles: dict, fee_rate: float = DEFAULT_FEE_RATE, keep_equity: bool = False) -> dict:
+    """Replays candles through on_candle(manager, candle) with a SimulatedOrderManager and returns its statistics."""
+    manager = SimulatedOrderManager(candles, fee_rate=fee_rate)
+    for bar in range(len(candles["close"])):
+        manager.now = bar
+        on_candle(manager, manager.candle)
+    return manager.results(keep_equity=keep_equity)
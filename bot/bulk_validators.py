@@ -0,0 +1,378 @@
+import numpy as np
+from bot.orders import ORDER_TEMPLATES
+from bot.validators import (
+    validate_symbol, validate_side, validate_quantity, validate_price, validate_order_type,
+    validate_notional, validate_callback_rate, get_exchange_filters, ValidationError,
+)
+
+# Rows whose value sits this close to a rounding boundary (in steps) are re-checked by the scalar validators.
+_BOUNDARY_EPSILON = 1e-6
+# Binance-style column names accepted in place of the order-file ones.
+_CAMEL_CASE = {"stop_price": "stopPrice", "callback_rate": "callbackRate", "activation_price": "activationPrice"}
+_MAX_EXACT = 2.0 ** 53
+_MAX_ON_STEP = 1e15
+
+
+class BulkValidation:
+    """Per-row outcome of validate_orders_bulk: an error mask, messages and the normalized columns."""
+
+    __slots__ = ("errors", "messages", "symbol", "side", "type", "quantity", "price", "stop_price",
+                 "callback_rate", "activation_price")
+
+    def __init__(self, n: int):
+        self.errors = np.zeros(n, dtype=bool)
+        self.messages = np.full(n, None, dtype=object)
+        self.symbol = np.full(n, None, dtype=object)
+        self.side = np.full(n, None, dtype=object)
+        self.type = np.full(n, None, dtype=object)
+        self.quantity = np.full(n, np.nan)
+        self.price = np.full(n, np.nan)
+        self.stop_price = np.full(n, np.nan)
+        self.callback_rate = np.full(n, np.nan)
+        self.activation_price = np.full(n, np.nan)
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def error_rows(self) -> list:
+        """(row index, message) for every rejected row."""
+        return [(int(i), self.messages[i]) for i in np.flatnonzero(self.errors)]
+
+
+def validate_orders_bulk(orders) -> BulkValidation:
+    """
+    Validates many orders at once with the same rules and messages as build_order_params.
+
+    orders is columnar (a dict of sequences or NumPy arrays, a pandas DataFrame or a pyarrow
+    Table with symbol, side, type, quantity, price, stop_price, callback_rate and
+    activation_price columns) or an iterable of order dicts. Distinct symbols, sides and
+    types go through the scalar validators once each and the results are broadcast. Numbers are checked in array passes. Rows that fail, and
+    the rare rows the array pass cannot decide exactly (values on a rounding boundary,
+    non-numeric or non-finite input), are re-run through the scalar validator, which is
+    the authority for both the verdict and the message.
+    """
+    columns = _columns(orders)
+    n = len(columns["symbol"])
+    result = BulkValidation(n)
+    errors, messages = result.errors, result.messages
+
+    def scalar(rows, check):
+        # Re-runs one check on still-valid rows; returns {row: value} for the rows it accepts.
+        accepted = {}
+        for i in rows:
+            i = int(i)
+            if errors[i]:
+                continue
+            try:
+                accepted[i] = check(i)
+            except Exception as e:
+                errors[i] = True
+                messages[i] = str(e)
+        return accepted
+
+    # Order type, symbol and side: one scalar call per distinct value.
+    raw_types = columns["type"]
+    if raw_types.dtype.kind == "U":
+        raw_types = np.where(raw_types == "", "MARKET", raw_types)
+    else:
+        raw_types = np.array([value or "MARKET" for value in raw_types], dtype=object)
+    result.type[:] = _broadcast(raw_types, validate_order_type, errors, messages)
+    result.symbol[:] = _broadcast(columns["symbol"], validate_symbol, errors, messages)
+    result.side[:] = _broadcast(columns["side"], validate_side, errors, messages)
+    filters = _filter_arrays(result.symbol, errors)
+
+    # Quantity.
+    raw_qty = columns["quantity"]
+    qty, unsure = _to_float(raw_qty)
+    qty_rounded, near = _round(qty, filters, "step", down=True)
+    fail = ~unsure & (qty <= 0)
+    fail |= filters["has"] & ~unsure & ((qty_rounded < filters["min_qty"]) | (qty_rounded <= 0))
+    fail |= filters["has"] & ~unsure & (filters["max_qty"] > 0) & (qty_rounded > filters["max_qty"])
+    result.quantity[:] = qty_rounded
+    recheck = np.flatnonzero(~errors & (fail | unsure | near))
+    for i, value in scalar(recheck, lambda i: validate_quantity(_item(raw_qty[i]), result.symbol[i])).items():
+        result.quantity[i] = value
+
+    # What each row's type requires, from the same templates build_order_params uses.
+    kinds = _template_columns(result.type, errors)
+    names = kinds["name"]
+    result.type[~errors] = kinds["exchange_type"][~errors]
+
+    # Stop price, checked before the limit price as build_order_params does.
+    raw_stop = columns["stop_price"]
+    missing_stop = kinds["stop_price"] & _is_missing(raw_stop)
+    scalar(np.flatnonzero(missing_stop), lambda i: _raise(ValidationError(f"Stop price must be provided for order type '{names[i]}'.")))
+    converted = _to_float(raw_stop)
+    for name in _names_with(names, kinds["stop_price"] & ~errors):
+        _validate_prices(result, raw_stop, converted, (names == name) & ~errors, name, filters, result.stop_price, scalar)
+
+    # Limit price.
+    raw_price = columns["price"]
+    converted = _to_float(raw_price)
+    for name in _names_with(names, kinds["price"] & ~errors):
+        _validate_prices(result, raw_price, converted, (names == name) & ~errors, name, filters, result.price, scalar)
+
+    # Trailing stops: callback rate, then the optional activation price. Rare enough for the scalar path.
+    raw_callback = columns["callback_rate"]
+    raw_activation = columns["activation_price"]
+    trailing = np.flatnonzero(kinds["callback_rate"] & ~errors)
+    scalar(trailing[_is_missing(raw_callback)[trailing]], lambda i: _raise(ValidationError(f"Callback rate must be provided for order type '{names[i]}'.")))
+    for i, value in scalar(trailing, lambda i: validate_callback_rate(_item(raw_callback[i]))).items():
+        result.callback_rate[i] = value
+    activated = trailing[~_is_missing(raw_activation)[trailing]]
+    for i, value in scalar(activated, lambda i: validate_price(_item(raw_activation[i]), names[i], result.symbol[i])).items():
+        result.activation_price[i] = value
+
+    # Minimum notional, against the field each type's template names.
+    notional_from = kinds["notional"]
+    check_price = np.where(notional_from == "price", result.price,
+                           np.where(notional_from == "stopPrice", result.stop_price, result.activation_price))
+    priced = (notional_from != "") & ~np.isnan(check_price) & ~errors & filters["has"] & (filters["min_notional"] > 0)
+    with np.errstate(invalid="ignore"):
+        notional = result.quantity * check_price
+        # Float products within a hair of the minimum are left to the scalar (Decimal) comparison.
+        notional_fail = priced & ((notional < filters["min_notional"]) | (np.abs(notional - filters["min_notional"]) <= 1e-9 * filters["min_notional"]))
+    scalar(np.flatnonzero(notional_fail), lambda i: validate_notional(result.symbol[i], result.quantity[i], check_price[i]))
+
+    return result
+
+
+def _raise(error: Exception):
+    raise error
+
+
+def _template_columns(types, errors) -> dict:
+    """Per-row OrderTemplate fields (name, exchange_type, notional and the price/stop_price/callback_rate flags), one lookup per distinct type."""
+    n = len(types)
+    columns = {key: np.full(n, "", dtype=object) for key in ("name", "exchange_type", "notional")}
+    columns.update({flag: np.zeros(n, dtype=bool) for flag in ("price", "stop_price", "callback_rate")})
+    valid = np.flatnonzero(~errors)
+    if not len(valid):
+        return columns
+    uniques, codes = np.unique(types[valid].astype(str), return_inverse=True)
+    codes = codes.reshape(-1)
+    templates = [ORDER_TEMPLATES[name] for name in uniques]
+    for key in ("name", "exchange_type", "notional"):
+        columns[key][valid] = np.array([getattr(t, key) or "" for t in templates], dtype=object)[codes]
+    for flag in ("price", "stop_price", "callback_rate"):
+        columns[flag][valid] = np.array([getattr(t, flag) for t in templates], dtype=bool)[codes]
+    return columns
+
+
+def _names_with(names, rows) -> list:
+    # Distinct type names among rows; prices are validated per type so messages name the right one.
+    return sorted({names[i] for i in np.flatnonzero(rows)})
+
+
+def _item(value):
+    # NumPy scalars back to Python values, so scalar validators see (and name) the same types.
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _columns(orders) -> dict:
+    names = ("symbol", "side", "type", "quantity", "price", "stop_price", "callback_rate", "activation_price")
+    if hasattr(orders, "column_names"):  # pyarrow.Table
+        present = set(orders.column_names)
+        get = lambda name: orders.column(name).to_numpy(zero_copy_only=False)
+    elif hasattr(orders, "columns") and hasattr(orders, "__getitem__"):  # pandas.DataFrame
+        present = set(orders.columns)
+        get = lambda name: orders[name].to_numpy()
+    elif isinstance(orders, dict):
+        present = set(orders)
+        get = lambda name: orders[name]
+    else:  # iterable of order dicts
+        rows = list(orders)
+        present = {key for row in rows for key in row}
+        get = lambda name: [row.get(name) for row in rows]
+
+    columns = {}
+    n = None
+    for name in names:
+        source = name
+        camel = _CAMEL_CASE.get(name)
+        if camel and name not in present and camel in present:
+            source = camel
+        if source in present:
+            values = np.asarray(get(source))
+            if values.dtype.kind not in "fiubU":
+                values = values.astype(object)
+            columns[name] = values
+            n = len(values)
+    if n is None:
+        raise ValidationError("No order columns found (expected symbol, side, type, quantity, price, stop_price).")
+    for name in names:
+        if name not in columns:
+            columns[name] = np.full(n, None, dtype=object)
+    return columns
+
+
+def _broadcast(values, check, errors, messages) -> np.ndarray:
+    """Runs check once per distinct value and spreads the results (or errors) over every row."""
+    if values.dtype.kind == "U":
+        uniques, codes = np.unique(values, return_inverse=True)
+        return _spread([str(value) for value in uniques], codes.reshape(-1), check, errors, messages)
+
+    seen = {}
+    uniques = []
+
+    def code(value):
+        key = _key(value)
+        found = seen.get(key)
+        if found is None:
+            found = seen[key] = len(uniques)
+            uniques.append(value)
+        return found
+
+    codes = np.fromiter((code(v) for v in values), dtype=np.intp, count=len(values))
+    return _spread(uniques, codes, check, errors, messages)
+
+
+def _spread(uniques, codes, check, errors, messages) -> np.ndarray:
+    out = np.empty(len(uniques), dtype=object)
+    failed = np.zeros(len(uniques), dtype=bool)
+    reasons = np.empty(len(uniques), dtype=object)
+    for code, value in enumerate(uniques):
+        try:
+            out[code] = check(value)
+        except Exception as e:
+            failed[code] = True
+            reasons[code] = str(e)
+
+    row_failed = failed[codes] & ~errors
+    messages[row_failed] = reasons[codes][row_failed]
+    errors |= row_failed
+    return out[codes]
+
+
+def _key(value):
+    # Keeps 1 and "1" apart; unhashable values each get their own entry.
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value), id(value))
+    return (type(value), value)
+
+
+def _to_float(values):
+    """Converts a column to float64. Returns (floats, unsure) where unsure rows need the scalar path."""
+    if values.dtype.kind in "fiub":
+        floats = values.astype(float)
+        return floats, ~np.isfinite(floats)
+    try:
+        floats = values.astype(float)
+        unsure = ~np.isfinite(floats)
+    except (TypeError, ValueError):
+        floats = np.full(len(values), np.nan)
+        unsure = np.ones(len(values), dtype=bool)
+        for i, value in enumerate(values):
+            try:
+                floats[i] = float(value)
+                unsure[i] = not np.isfinite(floats[i])
+            except (TypeError, ValueError):
+                pass
+    return floats, unsure
+
+
+def _is_missing(values) -> np.ndarray:
+    if values.dtype != object:
+        return np.zeros(len(values), dtype=bool)
+    return np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+
+
+def _filter_arrays(symbols, errors) -> dict:
+    """Per-row exchange filter values as float arrays; has marks rows whose symbol has filters."""
+    n = len(symbols)
+    names = ("min_qty", "max_qty", "min_price", "max_price", "min_notional")
+    arrays = {name: np.zeros(n) for name in names}
+    for unit in ("step", "tick"):
+        arrays[f"{unit}_int"] = np.zeros(n)
+        arrays[f"{unit}_scale"] = np.ones(n)
+    arrays["has"] = np.zeros(n, dtype=bool)
+
+    exchange_filters = get_exchange_filters()
+    if exchange_filters is None:
+        return arrays
+
+    valid = np.flatnonzero(~errors)
+    uniques, codes = np.unique(symbols[valid].astype(str), return_inverse=True)
+    codes = codes.reshape(-1)
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    for code, symbol in enumerate(uniques):
+        filters = exchange_filters.get(str(symbol))
+        if filters is None:
+            continue
+        rows = valid[order[bounds[code]:bounds[code + 1]]]
+        arrays["has"][rows] = True
+        arrays["min_qty"][rows] = float(filters.min_qty)
+        arrays["max_qty"][rows] = float(filters.max_qty)
+        arrays["min_price"][rows] = float(filters.min_price)
+        arrays["max_price"][rows] = float(filters.max_price)
+        arrays["min_notional"][rows] = float(filters.min_notional)
+        for unit, size in (("step", filters.step_size), ("tick", filters.tick_size)):
+            integer, scale = _decimal_parts(size)
+            arrays[f"{unit}_int"][rows] = integer
+            arrays[f"{unit}_scale"][rows] = scale
+    return arrays
+
+
+def _decimal_parts(size) -> tuple:
+    """Splits a Decimal step into (integer, 10**places) so size == integer / 10**places exactly."""
+    sign, digits, exponent = size.as_tuple()
+    integer = int("".join(map(str, digits)) or "0")
+    if exponent >= 0:
+        return integer * 10 ** exponent, 1
+    return integer, 10 ** -exponent
+
+
+def _round(values, filters, unit, down):
+    """
+    Rounds values to each row's step (down) or tick (half up), matching SymbolFilters exactly.
+
+    Returns (rounded, near), where near marks rows too close to a rounding boundary (or too
+    large) to trust float arithmetic; those go through the scalar validators.
+    """
+    integer = filters[f"{unit}_int"]
+    scale = filters[f"{unit}_scale"]
+    rounds = filters["has"] & (integer > 0)
+    rounded = values.copy()
+    near = np.zeros(len(values), dtype=bool)
+    if not rounds.any():
+        return rounded, near
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        ratio = np.where(rounds, values * scale / np.where(rounds, integer, 1), 0.0)
+        if down:
+            steps = np.floor(ratio)
+            distance = np.abs(ratio - np.rint(ratio))
+        else:
+            steps = np.floor(ratio + 0.5)
+            distance = np.abs(ratio - np.floor(ratio) - 0.5)
+        exact = rounds & np.isfinite(ratio) & (np.abs(steps * integer) < _MAX_EXACT)
+        near = rounds & (~exact | (distance < _BOUNDARY_EPSILON))
+        if down:
+            # Values already on a step are the common case. When the float of the exact multiple is
+            # the value itself, repr() gives that same short decimal (<= 15 digits round-trip), so
+            # Decimal rounding would return it unchanged.
+            multiple = np.rint(ratio)
+            on_step = near & exact & (np.abs(multiple * integer) < _MAX_ON_STEP) & (multiple * integer / scale == values)
+            steps = np.where(on_step, multiple, steps)
+            near &= ~on_step
+        # steps * integer is an exact integer, so one division gives the correctly rounded float of the Decimal.
+        rounded = np.where(exact, steps * integer / scale, rounded)
+    return rounded, near
+
+
+def _validate_prices(result, raw, converted, rows, order_type, filters, target, scalar):
+    if not rows.any():
+        return
+    missing = rows & _is_missing(raw)
+    prices, unsure = converted
+    rounded, near = _round(prices, filters, "tick", down=False)
+    fail = rows & ~unsure & (prices <= 0)
+    fail |= rows & filters["has"] & ~unsure & ((rounded < filters["min_price"]) | (rounded <= 0))
+    fail |= rows & filters["has"] & ~unsure & (filters["max_price"] > 0) & (rounded > filters["max_price"])
+    target[rows] = rounded[rows]
+    recheck = np.flatnonzero(rows & (missing | fail | unsure | near))
+    for i, value in scalar(recheck, lambda i: validate_price(_item(raw[i]), order_type, result.symbol[i])).items():
+        target[i] = value
@@ -0,0 +1,675 @@
+import typer
+
+# Only the validators at the top: python-binance, the order stack and even the daemon client
+# (socket, dotenv) load when a command needs them, so --help and input errors start fast.
+from bot.validators import validate_symbol, validate_side, validate_quantity, ValidationError
+
+# Plain click help: typer's rich help formatter alone imports ~80ms of markdown/pygments.
+app = typer.Typer(help="Trading Bot Command Line Interface", rich_markup_mode=None)
+
+
+class _LazyConsole:
+    """rich Console created on first use, so --help never imports rich."""
+
+    _console = None
+
+    def get(self):
+        """The real Console, for rich APIs that take one (Progress, Live)."""
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return _LazyConsole._console
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+
+console = _LazyConsole()
+
+API_ERRORS = ("BinanceAPIException", "BinanceRequestException")
+
+def get_order_manager():
+    """The running trading daemon's OrderManager when one is listening, otherwise a local one."""
+    from rich.panel import Panel
+    from bot.daemon_client import DaemonUnavailable, connect_daemon
+
+    try:
+        return connect_daemon()
+    except DaemonUnavailable:
+        pass
+    from bot.client import get_client
+    from bot.orders import OrderManager
+
+    try:
+        client = get_client()
+        return OrderManager(client)
+    except Exception as e:
+        console.print(Panel(f"[bold red]Failed to initialize Binance Client:[/bold red]\n{e}", title="Error", border_style="red"))
+        raise typer.Exit(code=1)
+
+def print_success(title: str, response: dict):
+    from rich.panel import Panel
+
+    lines = [
+        f"[bold green]Status:[/bold green] {response.get('status', 'UNKNOWN')}",
+        f"[bold cyan]Order ID:[/bold cyan] {response.get('orderId', 'N/A')}",
+        f"[bold yellow]Average Price:[/bold yellow] {response.get('avgPrice', 'N/A')}"
+    ]
+    panel = Panel("\n".join(lines), title=f"[bold green]{title} Successful[/bold green]", border_style="green")
+    console.print(panel)
+
+def is_api_error(e: Exception) -> bool:
+    # By name, so python-binance is not imported just to classify an error relayed by the daemon.
+    from bot.daemon_client import DaemonError
+
+    return type(e).__name__ in API_ERRORS or (isinstance(e, DaemonError) and e.kind in API_ERRORS)
+
+def print_error(error_msg: str):
+    from rich.panel import Panel
+
+    panel = Panel(f"[bold red]{error_msg}[/bold red]", title="Error Placing Order", border_style="red")
+    console.print(panel)
+
+def print_invalid(e: ValidationError):
+    # Plain click styling instead of a rich Panel: rejecting bad input should not cost a rich import.
+    typer.secho("Validation Error:", fg="red", bold=True)
+    typer.echo(str(e))
+
+def submit_order(title: str, symbol: str, side: str, quantity: float, description: str, place):
+    """Checks the common fields, then runs place(manager) under a spinner and prints the outcome."""
+    try:
+        symbol = validate_symbol(symbol)
+        side = validate_side(side)
+        quantity = validate_quantity(quantity)
+    except ValidationError as e:
+        print_invalid(e)
+        raise typer.Exit(code=1)
+
+    manager = get_order_manager()
+
+    description = f" {description}" if description else ""
+    with console.status(f"Placing {title} order for {quantity} {symbol} ({side}){description}...", spinner="dots"):
+        try:
+            response = place(manager, symbol, side, quantity)
+        except ValidationError as e:
+            print_invalid(e)
+            raise typer.Exit(code=1)
+        except Exception as e:
+            print_error(f"{'API' if is_api_error(e) else 'Unexpected'} Error:\n{e}")
+            raise typer.Exit(code=1)
+    print_success(f"{title} Order", response)
+
+@app.command("market-order")
+def market_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade")
+):
+    """
+    Places a MARKET order on Binance Futures Testnet.
+    """
+    submit_order("MARKET", symbol, side, quantity, "",
+                 lambda manager, *order: manager.place_market_order(*order))
+
+@app.command("limit-order")
+def limit_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade"),
+    price: float = typer.Argument(..., help="Limit price")
+):
+    """
+    Places a LIMIT order on Binance Futures Testnet.
+    """
+    submit_order("LIMIT", symbol, side, quantity, f"at {price}",
+                 lambda manager, *order: manager.place_limit_order(*order, price))
+
+@app.command("stop-limit-order")
+def stop_limit_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade"),
+    stop_price: float = typer.Argument(..., help="Stop price to trigger the limit order"),
+    price: float = typer.Argument(..., help="Limit price")
+):
+    """
+    Places a STOP-LIMIT order on Binance Futures Testnet.
+    """
+    submit_order("STOP-LIMIT", symbol, side, quantity, f"Trigger: {stop_price} Limit: {price}",
+                 lambda manager, *order: manager.place_stop_limit_order(*order, stop_price, price))
+
+@app.command("stop-market-order")
+def stop_market_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade"),
+    stop_price: float = typer.Argument(..., help="Price that triggers the MARKET order"),
+    reduce_only: bool = typer.Option(False, help="Only reduce an open position")
+):
+    """
+    Places a STOP-MARKET order on Binance Futures Testnet.
+    """
+    submit_order("STOP-MARKET", symbol, side, quantity, f"Trigger: {stop_price}",
+                 lambda manager, *order: manager.place_stop_market_order(*order, stop_price, reduce_only=reduce_only))
+
+@app.command("take-profit-order")
+def take_profit_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade"),
+    stop_price: float = typer.Argument(..., help="Price that triggers the limit order"),
+    price: float = typer.Argument(..., help="Limit price"),
+    reduce_only: bool = typer.Option(False, help="Only reduce an open position")
+):
+    """
+    Places a TAKE-PROFIT (limit) order on Binance Futures Testnet.
+    """
+    submit_order("TAKE-PROFIT", symbol, side, quantity, f"Trigger: {stop_price} Limit: {price}",
+                 lambda manager, *order: manager.place_take_profit_order(*order, stop_price, price, reduce_only=reduce_only))
+
+@app.command("take-profit-market-order")
+def take_profit_market_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade"),
+    stop_price: float = typer.Argument(..., help="Price that triggers the MARKET order"),
+    reduce_only: bool = typer.Option(False, help="Only reduce an open position")
+):
+    """
+    Places a TAKE-PROFIT-MARKET order on Binance Futures Testnet.
+    """
+    submit_order("TAKE-PROFIT-MARKET", symbol, side, quantity, f"Trigger: {stop_price}",
+                 lambda manager, *order: manager.place_take_profit_market_order(*order, stop_price, reduce_only=reduce_only))
+
+@app.command("trailing-stop-order")
+def trailing_stop_order(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Quantity to trade"),
+    callback_rate: float = typer.Argument(..., help="Distance from the best price, in percent (0.1 to 10)"),
+    activation_price: float = typer.Option(None, help="Start trailing once this price trades (default: right away)"),
+    reduce_only: bool = typer.Option(False, help="Only reduce an open position")
+):
+    """
+    Places a TRAILING-STOP-MARKET order on Binance Futures Testnet.
+    """
+    activation = f" from {activation_price}" if activation_price else ""
+    submit_order("TRAILING-STOP", symbol, side, quantity, f"Callback: {callback_rate}%{activation}",
+                 lambda manager, *order: manager.place_trailing_stop_order(*order, callback_rate, activation_price, reduce_only=reduce_only))
+
+def get_scheduler():
+    """The running trading daemon's ExecutionScheduler when one is listening, otherwise a local one."""
+    from bot.daemon_client import DaemonUnavailable, RemoteScheduler, connect_daemon
+
+    try:
+        return RemoteScheduler(connect_daemon().client)
+    except DaemonUnavailable:
+        pass
+    from bot.execution import ExecutionScheduler
+
+    return ExecutionScheduler(get_order_manager())
+
+def follow_algo(scheduler, algo_id: int):
+    """Shows a progress bar until the algo finishes. Ctrl+C cancels it."""
+    import time
+    from rich.panel import Panel
+    from rich.progress import BarColumn, Progress, TextColumn, TimeElapsedColumn
+
+    algo = scheduler.status(algo_id)[0]
+    try:
+        with Progress(TextColumn("{task.description}"), BarColumn(), TextColumn("{task.percentage:>5.1f}%"),
+                      TextColumn("{task.fields[detail]}"), TimeElapsedColumn(), console=console.get()) as progress:
+            task = progress.add_task(f"{algo['kind']} {algo['side']} {algo['quantity']} {algo['symbol']}", total=algo["quantity"], detail="")
+            while algo["status"] == "RUNNING":
+                time.sleep(0.5)
+                algo = scheduler.status(algo_id)[0]
+                avg = f" @ {algo['avg_price']:.2f}" if algo["avg_price"] else ""
+                progress.update(task, completed=algo["filled"], detail=f"{algo['slices_sent']} children{avg}")
+    except KeyboardInterrupt:
+        scheduler.cancel(algo_id)
+        algo = scheduler.status(algo_id)[0]
+
+    border = "green" if algo["status"] == "COMPLETED" else "yellow"
+    lines = [
+        f"[bold]Status:[/bold] {algo['status']}",
+        f"[bold]Filled:[/bold] {algo['filled']} of {algo['quantity']}",
+        f"[bold]Average Price:[/bold] {algo['avg_price'] if algo['avg_price'] is not None else 'N/A'}",
+        f"[bold]Child Orders:[/bold] {len(algo['children'])}",
+    ]
+    if algo["errors"]:
+        lines.append(f"[bold red]Last Error:[/bold red] {algo['errors'][-1]}")
+    console.print(Panel("\n".join(lines), title=f"Algo {algo_id} {algo['kind']}", border_style=border))
+    if algo["status"] != "COMPLETED":
+        raise typer.Exit(code=1)
+
+def run_algo(kind: str, follow: bool, start):
+    """Starts an algo with start(scheduler); follows it unless it runs in the daemon and follow is off."""
+    from bot.daemon_client import RemoteScheduler
+
+    scheduler = get_scheduler()
+    try:
+        algo_id = start(scheduler)
+    except ValidationError as e:
+        print_invalid(e)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        print_error(f"{'API' if is_api_error(e) else 'Unexpected'} Error:\n{e}")
+        raise typer.Exit(code=1)
+
+    if isinstance(scheduler, RemoteScheduler):
+        console.print(f"[bold green]{kind} algo {algo_id} started in the trading daemon.[/bold green] Track it with: python cli.py algos {algo_id}")
+        if not follow:
+            return
+    try:
+        follow_algo(scheduler, algo_id)
+    finally:
+        if not isinstance(scheduler, RemoteScheduler):
+            scheduler.close(wait=False)
+
+@app.command("twap")
+def twap(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Total quantity to trade"),
+    duration: float = typer.Option(..., help="Seconds to spread the order over"),
+    slices: int = typer.Option(None, help="Number of MARKET child orders (default: one per minute)"),
+    follow: bool = typer.Option(False, help="Watch progress even when the daemon runs the algo")
+):
+    """
+    Works a parent order as evenly spaced MARKET child orders (time-weighted average price).
+    """
+    run_algo("TWAP", follow, lambda scheduler: scheduler.start_twap(symbol, side, quantity, duration, slices=slices))
+
+@app.command("iceberg")
+def iceberg(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Total quantity to trade"),
+    price: float = typer.Argument(..., help="Limit price for every child order"),
+    display: float = typer.Option(..., help="Quantity shown on the book at a time"),
+    follow: bool = typer.Option(False, help="Watch progress even when the daemon runs the algo")
+):
+    """
+    Works a parent order as LIMIT child orders, showing only --display at a time.
+    """
+    run_algo("ICEBERG", follow, lambda scheduler: scheduler.start_iceberg(symbol, side, quantity, display, price))
+
+@app.command("pov")
+def pov(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    side: str = typer.Argument(..., help="Order side (BUY or SELL)"),
+    quantity: float = typer.Argument(..., help="Total quantity to trade"),
+    participation: float = typer.Option(0.1, help="Share of market volume to trade, between 0 and 1"),
+    interval: float = typer.Option(60.0, help="Seconds between volume checks"),
+    max_duration: float = typer.Option(None, help="Stop after this many seconds even if unfilled"),
+    follow: bool = typer.Option(False, help="Watch progress even when the daemon runs the algo")
+):
+    """
+    Trades a fixed share of the market volume printed since the start (participation of volume).
+    """
+    run_algo("POV", follow, lambda scheduler: scheduler.start_pov(symbol, side, quantity, participation, interval, max_duration))
+
+@app.command("algos")
+def algos(
+    algo_id: int = typer.Argument(None, help="Show one algo and its child orders"),
+    cancel: bool = typer.Option(False, "--cancel", help="Cancel the algo instead"),
+    active: bool = typer.Option(False, help="Only running algos")
+):
+    """
+    Shows the progress of execution algos running in the trading daemon.
+    """
+    from rich.table import Table
+    from bot.daemon_client import DaemonUnavailable, RemoteScheduler, connect_daemon
+
+    try:
+        scheduler = RemoteScheduler(connect_daemon().client)
+        if cancel:
+            if algo_id is None:
+                print_error("Pass the ID of the algo to cancel.")
+                raise typer.Exit(code=1)
+            done = scheduler.cancel(algo_id)
+            console.print(f"[bold green]Algo {algo_id} cancelled.[/bold green]" if done else f"[yellow]Algo {algo_id} is not running.[/yellow]")
+            return
+        rows = scheduler.status(algo_id, active_only=active)
+    except DaemonUnavailable as e:
+        print_error(f"Execution algos live in the trading daemon; start it with `python cli.py daemon`.\n{e}")
+        raise typer.Exit(code=1)
+
+    table = Table(title="Execution Algos")
+    for column in ("ID", "Kind", "Symbol", "Side", "Filled", "Quantity", "Progress", "Avg Price", "Children", "Status"):
+        table.add_column(column, justify="right" if column in {"ID", "Filled", "Quantity", "Progress", "Avg Price", "Children"} else "left")
+    for algo in rows:
+        table.add_row(str(algo["id"]), algo["kind"], algo["symbol"], algo["side"], f"{algo['filled']:g}", f"{algo['quantity']:g}",
+                      f"{algo['progress'] * 100:.1f}%", f"{algo['avg_price']:.2f}" if algo["avg_price"] else "-",
+                      str(len(algo["children"])), algo["status"])
+    console.print(table)
+
+    if algo_id is not None and rows:
+        children = Table(title=f"Algo {algo_id} Child Orders")
+        for column in ("Order ID", "Quantity", "Price", "Filled", "Avg Price", "Status"):
+            children.add_column(column)
+        for child in rows[0]["children"]:
+            children.add_row(str(child["orderId"]), f"{child['quantity']:g}", f"{child['price']}" if child["price"] else "MARKET",
+                             f"{child['filled']:g}", f"{child['avg_price']:.2f}" if child["avg_price"] else "-", child["status"])
+        console.print(children)
+        for error in rows[0]["errors"][-5:]:
+            console.print(f"[bold red]Error:[/bold red] {error}")
+
+@app.command("orders")
+def orders(
+    symbol: str = typer.Option(None, help="Only this symbol's open orders")
+):
+    """
+    Lists open orders from the state book kept current by the user-data stream.
+    """
+    from rich.table import Table
+
+    try:
+        rows = get_order_manager().open_orders(symbol)
+    except ValidationError as e:
+        print_invalid(e)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        print_error(f"Could not read open orders:\n{e}")
+        raise typer.Exit(code=1)
+
+    if not rows:
+        console.print("No open orders.")
+        return
+    table = Table(title="Open Orders")
+    for column in ("Order ID", "Symbol", "Side", "Type", "Price", "Stop", "Qty", "Filled", "Status"):
+        table.add_column(column, justify="right" if column in ("Price", "Stop", "Qty", "Filled") else "left")
+    for o in sorted(rows, key=lambda o: o["orderId"]):
+        table.add_row(str(o["orderId"]), o["symbol"], str(o.get("side")), str(o.get("type")), str(o.get("price")),
+                      str(o.get("stopPrice")), str(o.get("origQty")), str(o.get("executedQty")), str(o.get("status")))
+    console.print(table)
+
+@app.command("status")
+def status(
+    order_id: int = typer.Option(None, "--order-id", help="Exchange order ID"),
+    client_order_id: str = typer.Option(None, "--client-id", help="Client order ID"),
+    symbol: str = typer.Option(None, help="Symbol, needed for orders the state book does not hold")
+):
+    """
+    Shows one order's status from the state book, falling back to the exchange.
+    """
+    try:
+        order = get_order_manager().order_status(symbol, order_id, client_order_id)
+    except ValidationError as e:
+        print_invalid(e)
+        raise typer.Exit(code=1)
+    except Exception as e:
+        print_error(f"Could not look up the order:\n{e}")
+        raise typer.Exit(code=1)
+
+    for key in ("orderId", "clientOrderId", "symbol", "side", "type", "status", "price", "stopPrice", "origQty", "executedQty", "avgPrice"):
+        console.print(f"[bold cyan]{key}:[/bold cyan] {order.get(key)}")
+
+@app.command("batch")
+def batch(
+    file: str = typer.Argument(..., help="CSV (with header) or JSONL file of orders: type,symbol,side,quantity,price,stop_price"),
+    route: bool = typer.Option(False, help="Spread the orders over the ROUTER_ACCOUNTS accounts, one worker process each"),
+    policy: str = typer.Option(None, help="Routing policy with --route: symbol, least_loaded or sticky")
+):
+    """
+    Places every order in a file using Binance Futures batch requests.
+    """
+    from rich.panel import Panel
+    from bot.daemon_client import DaemonError
+    from bot.order_files import iter_chunks, iter_order_file
+    from bot.orders import MAX_BATCH_SIZE
+
+    router = None
+    if route:
+        from bot.router import OrderRouter
+
+        try:
+            with console.status("Starting account workers...", spinner="dots"):
+                router = OrderRouter(policy=policy).start()
+        except Exception as e:
+            print_error(f"Could not start the order router:\n{e}")
+            raise typer.Exit(code=1)
+        place = router.submit_many
+    else:
+        place = get_order_manager().place_batch
+    placed = 0
+    failed = 0
+
+    try:
+        with console.status(f"Placing orders from {file}...", spinner="dots") as status:
+            for chunk in iter_chunks(iter_order_file(file), MAX_BATCH_SIZE * 20):
+                for item in place(chunk):
+                    if item["error"] is None:
+                        placed += 1
+                    else:
+                        failed += 1
+                        console.print(f"[bold red]Failed:[/bold red] {item['order']} -> {item['error']}")
+                status.update(f"Placing orders from {file}... {placed} placed, {failed} failed")
+    except (OSError, ValueError) as e:
+        print_error(f"Could not read order file:\n{e}")
+        raise typer.Exit(code=1)
+    except DaemonError as e:
+        print_error(f"Trading daemon error after {placed + failed} orders:\n{e}")
+        raise typer.Exit(code=1)
+    finally:
+        if router is not None:
+            for stats in router.stats():
+                console.print(f"[bold cyan]{stats['account']}:[/bold cyan] {stats['sent']} sent, {stats['errors']} failed")
+            router.close()
+
+    border = "green" if failed == 0 else "yellow"
+    console.print(Panel(f"[bold green]Placed:[/bold green] {placed}\n[bold red]Failed:[/bold red] {failed}", title="Batch Complete", border_style=border))
+    if failed:
+        raise typer.Exit(code=1)
+
+@app.command("validate")
+def validate(
+    file: str = typer.Argument(..., help="CSV (with header) or JSONL file of orders: type,symbol,side,quantity,price,stop_price"),
+    show: int = typer.Option(20, help="Maximum number of rejected rows to print")
+):
+    """
+    Pre-flights every order in a file without sending anything.
+    """
+    from rich.panel import Panel
+    from bot.bulk_validators import validate_orders_bulk
+    from bot.order_files import iter_order_file
+
+    # Symbols, tick/step sizes and minimum notional are only checked against loaded exchange filters.
+    # Load them here, in this process: a running daemon's filters do not reach the local validators.
+    from bot.client import get_client
+    from bot.exchange_info import load_exchange_filters
+
+    try:
+        client = get_client()
+        load_exchange_filters(client.client, path=client.exchange_info_cache_path)
+    except Exception as e:
+        console.print(f"[bold yellow]Exchange filters unavailable, checking format only:[/bold yellow] {e}")
+    try:
+        with console.status(f"Validating orders from {file}...", spinner="dots"):
+            result = validate_orders_bulk(list(iter_order_file(file)))
+    except (OSError, ValueError) as e:
+        print_error(f"Could not read order file:\n{e}")
+        raise typer.Exit(code=1)
+
+    rejected = result.error_rows()
+    for row, message in rejected[:show]:
+        console.print(f"[bold red]Row {row + 1}:[/bold red] {message}")
+    if len(rejected) > show:
+        console.print(f"... and {len(rejected) - show} more")
+
+    border = "green" if not rejected else "yellow"
+    console.print(Panel(f"[bold green]Valid:[/bold green] {len(result) - len(rejected)}\n[bold red]Rejected:[/bold red] {len(rejected)}", title="Validation Complete", border_style=border))
+    if rejected:
+        raise typer.Exit(code=1)
+
+@app.command("klines")
+def klines(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    interval: str = typer.Argument("1m", help="Kline interval (1m, 5m, 1h, 1d, ...)"),
+    start: str = typer.Option(None, help="First candle to keep, e.g. 2024-01-01 (required for a new series)"),
+    end: str = typer.Option(None, help="Last candle to fetch (default: latest closed candle)"),
+    workers: int = typer.Option(4, help="Pages downloaded concurrently")
+):
+    """
+    Downloads futures klines into the local memory-mapped history store.
+    """
+    from rich.panel import Panel
+    from binance.exceptions import BinanceAPIException, BinanceRequestException
+    from bot.client import get_client
+    from bot.klines import KlineStore
+
+    try:
+        client = get_client()
+    except Exception as e:
+        print_error(f"Failed to initialize Binance Client:\n{e}")
+        raise typer.Exit(code=1)
+
+    store = KlineStore()
+    try:
+        with console.status(f"Downloading {symbol.upper()} {interval} klines...", spinner="dots"):
+            added = store.update(client, symbol, interval, start=start, end=end, max_workers=workers)
+    except ValidationError as e:
+        print_error(f"Validation Error:\n{e}")
+        raise typer.Exit(code=1)
+    except (BinanceAPIException, BinanceRequestException) as e:
+        print_error(f"Binance API Error:\n{e}")
+        raise typer.Exit(code=1)
+
+    meta = store.meta(symbol.upper(), interval)
+    console.print(Panel(
+        f"[bold green]Added:[/bold green] {added}\n[bold cyan]Stored:[/bold cyan] {meta['count']} candles\n"
+        f"[bold yellow]Path:[/bold yellow] {store.path(symbol.upper(), interval)}",
+        title="Klines Updated", border_style="green"))
+
+@app.command("backtest")
+def backtest(
+    symbol: str = typer.Argument(..., help="Trading pair symbol (e.g., BTCUSDT)"),
+    interval: str = typer.Argument("1m", help="Kline interval stored with the klines command"),
+    fast: str = typer.Option("5,10,20", help="Comma-separated fast SMA lengths"),
+    slow: str = typer.Option("50,100,200", help="Comma-separated slow SMA lengths"),
+    quantity: float = typer.Option(0.01, help="Position size per side"),
+    start: str = typer.Option(None, help="First candle, e.g. 2024-01-01 (default: all stored history)"),
+    end: str = typer.Option(None, help="Last candle (default: latest stored)"),
+    processes: int = typer.Option(None, help="Worker processes (default: CPU count)"),
+    top: int = typer.Option(10, help="Best parameter sets to show")
+):
+    """
+    Sweeps the example SMA-crossover strategy over stored klines and ranks parameter sets by PnL.
+    """
+    from rich.table import Table
+    from bot.backtest import run_grid, sma_crossover
+
+    try:
+        grid = {
+            "fast": [int(value) for value in fast.split(",")],
+            "slow": [int(value) for value in slow.split(",")],
+            "quantity": [quantity],
+        }
+        with console.status(f"Backtesting {len(grid['fast']) * len(grid['slow'])} parameter sets...", spinner="dots"):
+            results = run_grid(sma_crossover, grid, symbol=symbol, interval=interval, start=start, end=end, processes=processes)
+    except (ValidationError, ValueError) as e:
+        print_error(f"Validation Error:\n{e}")
+        raise typer.Exit(code=1)
+
+    failed = [r for r in results if "error" in r]
+    ranked = sorted((r for r in results if "error" not in r), key=lambda r: r["pnl"], reverse=True)
+    table = Table(title=f"{symbol.upper()} {interval} SMA crossover")
+    for column in ("Fast", "Slow", "PnL", "Max Drawdown", "Fees", "Fills"):
+        table.add_column(column, justify="right")
+    for r in ranked[:top]:
+        table.add_row(str(r["params"]["fast"]), str(r["params"]["slow"]), f"{r['pnl']:.2f}",
+                      f"{r['max_drawdown']:.2f}", f"{r['fees']:.2f}", str(r["filled"]))
+    console.print(table)
+    if failed:
+        print_error(f"{len(failed)} parameter sets failed, e.g. {failed[0]['params']}: {failed[0]['error']}")
+
+@app.command("daemon")
+def daemon(
+    symbols: str = typer.Option("", help="Comma-separated symbols to stream prices for from the start"),
+    socket_path: str = typer.Option(None, "--socket", help="Unix socket to listen on (default: TRADING_BOT_SOCKET)"),
+    metrics: bool = typer.Option(True, help="Serve Prometheus metrics on METRICS_PORT"),
+    stop: bool = typer.Option(False, "--stop", help="Ask a running daemon to shut down instead")
+):
+    """
+    Runs the trading daemon in the foreground. Order commands use it automatically while it runs.
+    """
+    from bot.daemon import TradingDaemon
+    from bot.daemon_client import DaemonClient, DaemonUnavailable
+    from bot.metrics import DEFAULT_METRICS_PORT
+
+    if stop:
+        try:
+            pid = DaemonClient(socket_path).call("shutdown")["pid"]
+        except DaemonUnavailable as e:
+            print_error(str(e))
+            raise typer.Exit(code=1)
+        console.print(f"[bold green]Trading daemon (pid {pid}) is shutting down.[/bold green]")
+        return
+
+    trading_daemon = TradingDaemon(socket_path, symbols=[s for s in symbols.split(",") if s],
+                                   metrics_port=DEFAULT_METRICS_PORT if metrics else None)
+    try:
+        trading_daemon.start()
+    except Exception as e:
+        print_error(f"Failed to start the trading daemon:\n{e}")
+        raise typer.Exit(code=1)
+    console.print(f"[bold green]Trading daemon listening on {trading_daemon.socket_path}[/bold green] (Ctrl+C to stop)")
+    trading_daemon.serve_forever()
+
+@app.command("stats")
+def stats(
+    url: str = typer.Option(None, help="Metrics endpoint of a running bot process [default: http://127.0.0.1:$METRICS_PORT/metrics]")
+):
+    """
+    Shows latency histograms and error counts from a running bot's metrics endpoint.
+    """
+    import urllib.request
+    from rich.table import Table
+    from bot.metrics import DEFAULT_METRICS_PORT, bucket_quantile, parse_prometheus
+
+    url = url or f"http://127.0.0.1:{DEFAULT_METRICS_PORT}/metrics"
+
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            samples = parse_prometheus(response.read().decode())
+    except OSError as e:
+        print_error(f"Could not read metrics from {url}:\n{e}")
+        raise typer.Exit(code=1)
+
+    # Group histogram buckets by series (metric name + labels without "le").
+    series = {}
+    counters = []
+    for (name, labels), value in samples.items():
+        if name.endswith("_bucket"):
+            key = (name[:-len("_bucket")], tuple(pair for pair in labels if pair[0] != "le"))
+            bound = dict(labels)["le"]
+            series.setdefault(key, []).append((float("inf") if bound == "+Inf" else float(bound), value))
+        elif name.endswith("_total"):
+            counters.append((name, labels, value))
+
+    table = Table(title="Latency")
+    for column in ("Metric", "Labels", "Count", "Mean (ms)", "p50 (ms)", "p99 (ms)"):
+        table.add_column(column, justify="right" if "(" in column or column == "Count" else "left")
+    for (name, labels), buckets in sorted(series.items()):
+        buckets.sort()
+        bounds = [bound for bound, _ in buckets]
+        counts = [cumulative - (buckets[i - 1][1] if i else 0) for i, (_, cumulative) in enumerate(buckets)]
+        count = samples.get((f"{name}_count", labels), 0)
+        total = samples.get((f"{name}_sum", labels), 0)
+        table.add_row(
+            name.replace("trading_bot_", ""),
+            ", ".join(f"{key}={value}" for key, value in labels),
+            f"{count:.0f}",
+            f"{(total / count * 1000) if count else 0:.3f}",
+            f"{bucket_quantile(0.5, bounds, counts) * 1000:.3f}",
+            f"{bucket_quantile(0.99, bounds, counts) * 1000:.3f}",
+        )
+    console.print(table)
+
+    if counters:
+        errors = Table(title="Errors")
+        for column in ("Metric", "Labels", "Count"):
+            errors.add_column(column)
+        for name, labels, value in sorted(counters):
+            errors.add_row(name.replace("trading_bot_", ""), ", ".join(f"{key}={value}" for key, value in labels), f"{value:.0f}")
+        console.print(errors)
@@ -1,36 +1,232 @@
 import logging
 import os
+import threading
+import time
 from binance.client import Client
 from binance.exceptions import BinanceAPIException, BinanceRequestException
-from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from bot.exchange_info import CACHE_PATH as EXCHANGE_INFO_CACHE_PATH
+from bot.env import load_env
 from bot.logging_config import setup_logger
+from bot.metrics import metrics
+from bot.mock_exchange import MockExchange
+from bot.order_book import LocalOrderBook
+from bot.price_cache import PriceCache
+from bot.state_book import StateBook
+from bot.rate_limiter import RateLimiter, endpoint_cost, get_rate_limiter
 
-load_dotenv()
+load_env()
 
 logger = setup_logger(__name__)
 
+DEFAULT_POOL_SIZE = int(os.getenv("BINANCE_POOL_SIZE", "10"))
+DEFAULT_TIMEOUT = float(os.getenv("BINANCE_TIMEOUT", "10"))
+MOCK_BASE_URL = "mock://futures"
+
+# Shared clients keyed by (api_key, futures base URL). Guarded by _pool_lock.
+_pool_lock = threading.Lock()
+_pooled_clients = {}
+
+
+# Per-thread endpoint and response of the request in flight plus time already attributed to signing/parsing.
+_request_context = threading.local()
+
+REQUEST_STAGE_METRIC = "trading_bot_request_stage_seconds"
+API_ERRORS_METRIC = "trading_bot_api_errors_total"
+
+
+class RateLimitedClient(Client):
+    """
+    python-binance Client that passes every futures request through a RateLimiter and records
+    signing, network and response-parsing time per endpoint in bot.metrics.
+    """
+
+    rate_limiter = None
+
+    def _request_futures_api(self, method, path, signed=False, version=1, **kwargs):
+        limiter = self.rate_limiter
+        _request_context.endpoint = path
+        _request_context.response = None
+        try:
+            if limiter is not None:
+                weight, orders = endpoint_cost(method, path, kwargs.get("data"))
+                limiter.acquire(weight, orders)
+            result = super()._request_futures_api(method, path, signed, version, **kwargs)
+        except BinanceAPIException as e:
+            metrics.inc(API_ERRORS_METRIC, (("code", str(e.code)), ("endpoint", path)))
+            if limiter is not None:
+                headers = getattr(e.response, "headers", None) or {}
+                if e.status_code in (418, 429):
+                    limiter.block(float(headers.get("Retry-After", 60)))
+                limiter.update_from_headers(headers)
+            raise
+        finally:
+            _request_context.endpoint = None
+
+        # self.response is shared by every thread using this pooled client; this thread's is in the context.
+        response = getattr(_request_context, "response", None)
+        if limiter is not None and response is not None:
+            limiter.update_from_headers(response.headers)
+        return result
+
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        _request_context.accounted_ns = 0
+        start = time.perf_counter_ns()
+        try:
+            return super()._request(method, uri, signed, force_params, **kwargs)
+        finally:
+            network_ns = time.perf_counter_ns() - start - _request_context.accounted_ns
+            self._observe("network", network_ns)
+
+    def _get_request_kwargs(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return super()._get_request_kwargs(*args, **kwargs)
+        finally:
+            self._observe("signing", time.perf_counter_ns() - start, accounted=True)
+
+    def _handle_response(self, response):
+        _request_context.response = response
+        start = time.perf_counter_ns()
+        try:
+            return Client._handle_response(response)
+        finally:
+            self._observe("parsing", time.perf_counter_ns() - start, accounted=True)
+
+    @staticmethod
+    def _observe(stage, elapsed_ns, accounted=False):
+        if accounted:
+            _request_context.accounted_ns = getattr(_request_context, "accounted_ns", 0) + elapsed_ns
+        endpoint = getattr(_request_context, "endpoint", None) or "other"
+        metrics.observe(REQUEST_STAGE_METRIC, elapsed_ns / 1e9, (("endpoint", endpoint), ("stage", stage)))
+
 
 class BinanceClient:
-    def __init__(self):
-        self.api_key = os.getenv("API_KEY")
-        self.api_secret = os.getenv("SECRET_KEY")
+    def __init__(self, api_key=None, api_secret=None, testnet=True, pool_size=None, timeout=None,
+                 rate_limiter: RateLimiter = None, exchange=None):
+        self.api_key = api_key or os.getenv("API_KEY")
+        self.api_secret = api_secret or os.getenv("SECRET_KEY")
+        self.testnet = testnet
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self.price_cache = None
+        self.state_book = None
+        self.order_books = {}  # symbol -> LocalOrderBook
+        self.exchange_info_cache_path = EXCHANGE_INFO_CACHE_PATH
+        # BINANCE_EXCHANGE=mock runs against the in-process MockExchange instead of the network.
+        self.exchange = (exchange or os.getenv("BINANCE_EXCHANGE", "binance")).lower()
+
+        if self.exchange == "mock":
+            self.client = MockExchange(
+                latency=float(os.getenv("MOCK_LATENCY", "0")),
+                error_rate=float(os.getenv("MOCK_ERROR_RATE", "0")),
+                rate_limit_rate=float(os.getenv("MOCK_RATE_LIMIT_RATE", "0")),
+            )
+            self.exchange_info_cache_path = None  # never let mock symbols overwrite the real cache
+            logger.info("Offline MockExchange client initialized successfully.")
+            return
 
         if not self.api_key or not self.api_secret:
             logger.error("API_KEY or SECRET_KEY not found in environment variables.")
             raise ValueError("API_KEY and SECRET_KEY must be set in .env file.")
 
         try:
-            self.client = Client(self.api_key, self.api_secret, testnet=True)
+            self.client = RateLimitedClient(
+                self.api_key,
+                self.api_secret,
+                testnet=testnet,
+                requests_params={"timeout": self.timeout},
+            )
+            self.client.rate_limiter = rate_limiter or get_rate_limiter()
+            # Keep-alive pool sized for concurrent use of this client from several threads.
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            self.client.session.mount("https://", adapter)
             logger.info("Binance Futures Testnet Client initialized successfully.")
         except Exception as e:
             logger.error(f"Failed to initialize Binance Client: {e}")
             raise
 
+    @property
+    def base_url(self) -> str:
+        if self.exchange == "mock":
+            return MOCK_BASE_URL
+        return self.client.FUTURES_TESTNET_URL if self.testnet else self.client.FUTURES_URL
+
+    def health_check(self) -> bool:
+        """Pings the futures API over the pooled connection."""
+        try:
+            self.client.futures_ping()
+            return True
+        except Exception as e:
+            logger.error(f"Health check failed: {e}")
+            return False
+
+    def start_price_cache(self, symbols=(), max_age=None, stream="markPrice") -> PriceCache:
+        """Starts a websocket-fed PriceCache that fetch_symbol_price reads before falling back to REST."""
+        if self.exchange == "mock":
+            return None
+        if self.price_cache is None:
+            self.price_cache = PriceCache(self.api_key, self.api_secret, testnet=self.testnet, max_age=max_age, stream=stream)
+            self.price_cache.start(symbols)
+        else:
+            self.price_cache.subscribe(*symbols)
+        return self.price_cache
+
+    def start_state_book(self) -> StateBook:
+        """Starts a StateBook of orders, fills, positions and balances fed by the user-data stream."""
+        if self.state_book is None:
+            self.state_book = StateBook(self.client, self.api_key, self.api_secret, testnet=self.testnet)
+            if self.exchange == "mock":
+                # No user-data stream to follow; the mock exchange hands the book the same events directly.
+                self.client.add_user_listener(self.state_book.apply_event)
+            self.state_book.start(stream=self.exchange != "mock")
+        return self.state_book
+
+    def start_order_book(self, symbol: str, depth_limit: int = None) -> LocalOrderBook:
+        """Starts (once per symbol) a LocalOrderBook kept current by the symbol's diff-depth stream."""
+        symbol = symbol.upper()
+        book = self.order_books.get(symbol)
+        if book is None:
+            book = LocalOrderBook(self.client, symbol, testnet=self.testnet, depth_limit=depth_limit)
+            # The mock exchange has no depth stream; its book is built from REST snapshots only.
+            book.start(stream=self.exchange != "mock")
+            self.order_books[symbol] = book
+        return book
+
+    def close(self):
+        """Closes the underlying HTTP session and drops the client from the shared registry."""
+        if self.price_cache is not None:
+            self.price_cache.stop()
+            self.price_cache = None
+        if self.state_book is not None:
+            self.state_book.stop()
+            self.state_book = None
+        for book in self.order_books.values():
+            book.stop()
+        self.order_books = {}
+        with _pool_lock:
+            for key, pooled in list(_pooled_clients.items()):
+                if pooled is self:
+                    del _pooled_clients[key]
+        try:
+            self.client.close_connection()
+        except Exception as e:
+            logger.error(f"Error closing Binance Client session: {e}")
+
     def fetch_symbol_price(self, symbol):
+        if self.price_cache is not None:
+            price = self.price_cache.get(symbol)
+            if price is not None:
+                return price
+            if not self.price_cache.is_subscribed(symbol):
+                self.price_cache.subscribe(symbol)
+
         try:
             ticker = self.client.futures_symbol_ticker(symbol=symbol)
             price = float(ticker['price'])
             logger.info(f"Current price for {symbol}: {price}")
+            if self.price_cache is not None:
+                self.price_cache.update(symbol, price)
             return price
         except BinanceAPIException as e:
             logger.error(f"Binance API Exception fetching price for {symbol}: {e}")
@@ -65,9 +261,37 @@ class BinanceClient:
             logger.error(f"Unexpected error fetching balance: {e}")
             return None
 
+
+def get_client(api_key=None, api_secret=None, testnet=True, pool_size=None, timeout=None, exchange=None) -> BinanceClient:
+    """Returns the process-wide BinanceClient for these credentials, creating it on first use."""
+    api_key = api_key or os.getenv("API_KEY")
+    exchange = (exchange or os.getenv("BINANCE_EXCHANGE", "binance")).lower()
+    if exchange == "mock":
+        base_url = MOCK_BASE_URL
+    else:
+        base_url = Client.FUTURES_TESTNET_URL if testnet else Client.FUTURES_URL
+    key = (api_key, base_url)
+
+    with _pool_lock:
+        client = _pooled_clients.get(key)
+        if client is None:
+            client = BinanceClient(api_key, api_secret, testnet=testnet, pool_size=pool_size, timeout=timeout, exchange=exchange)
+            _pooled_clients[key] = client
+    return client
+
+
+def close_clients():
+    """Closes every pooled client. Safe to call at shutdown."""
+    with _pool_lock:
+        clients = list(_pooled_clients.values())
+        _pooled_clients.clear()
+    for client in clients:
+        client.close()
+
+
 if __name__ == "__main__":
     try:
-        bc = BinanceClient()
+        bc = get_client()
         price = bc.fetch_symbol_price("BTCUSDT")
         print(f"Test Price fetch: {price}")
         balance = bc.get_account_balance()
@@ -0,0 +1,220 @@
+import json
+import os
+import signal
+import socketserver
+import threading
+import time
+from bot.client import get_client, close_clients
+from bot.daemon_client import SOCKET_PATH, DaemonClient, DaemonUnavailable
+from bot.exchange_info import DEFAULT_TTL, load_exchange_filters
+from bot.execution import ExecutionScheduler
+from bot.logging_config import setup_logger
+from bot.metrics import start_metrics_server
+from bot.orders import OrderManager
+
+logger = setup_logger(__name__)
+
+
+def _to_json(value):
+    # OrderResult (and anything else with to_dict) goes over the socket as its dict; the rest as text.
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        trading_daemon = self.server.trading_daemon
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            self.wfile.write(trading_daemon.dispatch(line))
+            self.wfile.flush()
+            if trading_daemon.shutdown_requested:
+                # Only once the reply is out, or the process may exit before the caller hears back.
+                trading_daemon.request_shutdown()
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class TradingDaemon:
+    """
+    Long-running process that keeps the client, its connection pool, the exchange filters
+    and the price cache warm, and places orders for thin clients over a Unix socket.
+
+    Requests are JSON lines {"id", "method", "params"}; replies are {"id", "result"} or
+    {"id", "error": {"type", "message", "code"}}. Each connection gets its own thread, so
+    slow orders never hold up other callers.
+    """
+
+    METHODS = ("ping", "place_order", "place_market_order", "place_limit_order", "place_stop_limit_order",
+               "place_batch", "fetch_symbol_price", "start_twap", "start_iceberg", "start_pov",
+               "algo_status", "cancel_algo", "open_orders", "order_status", "shutdown")
+
+    def __init__(self, socket_path: str = None, symbols=(), metrics_port: int = None):
+        self.socket_path = socket_path or SOCKET_PATH
+        self.symbols = [s.upper() for s in symbols]
+        self.metrics_port = metrics_port
+        self.client = None
+        self.manager = None
+        self.scheduler = None
+        self.started = None
+        self.shutdown_requested = False
+        self._server = None
+        self._metrics_server = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        if not self.socket_path:
+            raise ValueError("No socket path configured; set TRADING_BOT_SOCKET.")
+        self._claim_socket()
+
+        self.client = get_client()
+        if not self.client.health_check():
+            logger.warning("Futures API did not answer the startup ping; continuing, requests will retry.")
+        self.manager = OrderManager(self.client)
+        self.scheduler = ExecutionScheduler(self.manager)
+        self.client.start_price_cache(self.symbols)
+        try:
+            self.client.start_state_book()
+        except Exception as e:
+            logger.error(f"State book unavailable, order lookups will start it on demand: {e}")
+        if self.metrics_port:
+            try:
+                self._metrics_server = start_metrics_server(self.metrics_port)
+            except OSError as e:
+                logger.error(f"Metrics server could not bind port {self.metrics_port}: {e}")
+        threading.Thread(target=self._refresh_filters, name="daemon-filters", daemon=True).start()
+
+        # Only the owner may talk to the socket: anyone who can connect can place orders.
+        umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, _Handler)
+        finally:
+            os.umask(umask)
+        self._server.trading_daemon = self
+        self.started = time.time()
+        logger.info(f"Trading daemon listening on {self.socket_path} (pid {os.getpid()}).")
+
+    def serve_forever(self):
+        """Serves until shutdown is requested or SIGTERM / SIGINT arrives."""
+        if self._server is None:
+            self.start()
+        previous = signal.signal(signal.SIGTERM, lambda *_: self.request_shutdown())
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self.stop()
+
+    def request_shutdown(self):
+        # shutdown() blocks until serve_forever returns, so it cannot run on the serving thread.
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def stop(self):
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        if self._server is not None:
+            self._server.server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+        if self._metrics_server is not None:
+            self._metrics_server.shutdown()
+        if self.scheduler is not None:
+            self.scheduler.close(wait=False)
+        close_clients()
+        logger.info("Trading daemon stopped.")
+
+    # --- requests ---
+
+    def dispatch(self, line: bytes) -> bytes:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            method = request.get("method")
+            if method not in self.METHODS:
+                raise ValueError(f"Unknown daemon method: '{method}'.")
+            result = getattr(self, f"_do_{method}")(**(request.get("params") or {}))
+            reply = {"id": request_id, "result": result}
+        except Exception as e:
+            reply = {"id": request_id, "error": {"type": type(e).__name__, "message": str(e), "code": getattr(e, "code", None)}}
+        return (json.dumps(reply, default=_to_json) + "\n").encode()
+
+    def _do_ping(self) -> dict:
+        return {"pid": os.getpid(), "uptime": time.time() - self.started, "exchange": self.client.exchange}
+
+    def _do_place_order(self, order) -> dict:
+        return self.manager.place_order(order)
+
+    def _do_place_market_order(self, symbol, side, quantity) -> dict:
+        return self.manager.place_market_order(symbol, side, quantity)
+
+    def _do_place_limit_order(self, symbol, side, quantity, price) -> dict:
+        return self.manager.place_limit_order(symbol, side, quantity, price)
+
+    def _do_place_stop_limit_order(self, symbol, side, quantity, stop_price, price) -> dict:
+        return self.manager.place_stop_limit_order(symbol, side, quantity, stop_price, price)
+
+    def _do_place_batch(self, orders) -> list:
+        results = self.manager.place_batch(orders)
+        for item in results:
+            if item["error"] is not None:
+                item["error"] = str(item["error"])
+        return results
+
+    def _do_fetch_symbol_price(self, symbol):
+        return self.client.fetch_symbol_price(symbol.upper())
+
+    def _do_start_twap(self, **params) -> int:
+        return self.scheduler.start_twap(**params)
+
+    def _do_start_iceberg(self, **params) -> int:
+        return self.scheduler.start_iceberg(**params)
+
+    def _do_start_pov(self, **params) -> int:
+        return self.scheduler.start_pov(**params)
+
+    def _do_algo_status(self, algo_id=None, active_only=False) -> list:
+        return self.scheduler.status(algo_id, active_only)
+
+    def _do_cancel_algo(self, algo_id) -> bool:
+        return self.scheduler.cancel(algo_id)
+
+    def _do_open_orders(self, symbol=None) -> list:
+        return self.manager.open_orders(symbol)
+
+    def _do_order_status(self, symbol=None, order_id=None, client_order_id=None) -> dict:
+        return self.manager.order_status(symbol, order_id, client_order_id)
+
+    def _do_shutdown(self) -> dict:
+        self.shutdown_requested = True
+        return {"pid": os.getpid()}
+
+    # --- housekeeping ---
+
+    def _claim_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            pid = DaemonClient(self.socket_path, timeout=2).call("ping")["pid"]
+        except DaemonUnavailable:
+            # Left behind by a daemon that did not shut down cleanly.
+            os.unlink(self.socket_path)
+            return
+        raise RuntimeError(f"A trading daemon (pid {pid}) is already listening on {self.socket_path}.")
+
+    def _refresh_filters(self):
+        # Re-fetch exchangeInfo as the on-disk cache expires so a long-lived daemon never validates against stale rules.
+        while not self._stopping.wait(DEFAULT_TTL):
+            try:
+                load_exchange_filters(self.client.client, path=self.client.exchange_info_cache_path, refresh=True)
+            except Exception as e:
+                logger.error(f"Failed to refresh exchange filters: {e}")
@@ -0,0 +1,168 @@
+import json
+import os
+import socket
+from bot.env import load_env
+from bot.validators import ValidationError
+
+load_env()
+
+# TRADING_BOT_SOCKET= (empty) disables the daemon; commands then always run in-process.
+SOCKET_PATH = os.getenv("TRADING_BOT_SOCKET", os.path.join("/tmp", f"trading-bot-{getattr(os, 'getuid', lambda: 0)()}.sock"))
+DEFAULT_TIMEOUT = float(os.getenv("TRADING_BOT_DAEMON_TIMEOUT", "30"))
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket."""
+
+
+class DaemonError(Exception):
+    """An error raised inside the daemon. kind is the original exception's class name."""
+
+    def __init__(self, message: str, kind: str = None, code=None):
+        super().__init__(message)
+        self.kind = kind
+        self.code = code
+
+
+class DaemonClient:
+    """
+    Sends requests to a running TradingDaemon over its Unix socket.
+
+    Deliberately imports nothing heavy: a CLI call that finds the daemon never loads
+    python-binance, builds a client or reads exchange metadata. One JSON object per line
+    each way; the connection is kept open for further calls.
+    """
+
+    def __init__(self, path: str = None, timeout: float = None):
+        self.path = SOCKET_PATH if path is None else path
+        self.timeout = timeout or DEFAULT_TIMEOUT
+        self._sock = None
+        self._reader = None
+        self._ids = 0
+
+    def call(self, method: str, **params):
+        """Returns the method's result, or raises ValidationError / DaemonError as the daemon reports it."""
+        if self._sock is None:
+            self.connect()
+        self._ids += 1
+        request = json.dumps({"id": self._ids, "method": method, "params": params}) + "\n"
+        try:
+            self._sock.sendall(request.encode())
+            line = self._reader.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonError(f"Lost connection to the trading daemon: {e}", kind="ConnectionError")
+        if not line:
+            self.close()
+            raise DaemonError("The trading daemon closed the connection.", kind="ConnectionError")
+
+        response = json.loads(line)
+        error = response.get("error")
+        if error is None:
+            return response.get("result")
+        if error.get("type") == "ValidationError":
+            raise ValidationError(error.get("message"))
+        raise DaemonError(error.get("message"), kind=error.get("type"), code=error.get("code"))
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._reader.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def connect(self):
+        """Opens the socket, raising DaemonUnavailable when no daemon is listening."""
+        if not self.path or not hasattr(socket, "AF_UNIX") or not os.path.exists(self.path):
+            raise DaemonUnavailable(f"No trading daemon socket at '{self.path}'.")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except OSError as e:
+            sock.close()
+            raise DaemonUnavailable(f"Trading daemon at '{self.path}' is not accepting connections: {e}")
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+
+class RemoteOrderManager:
+    """OrderManager look-alike whose place_* calls run in the daemon's warm OrderManager."""
+
+    def __init__(self, client: DaemonClient):
+        self.client = client
+
+    def place_market_order(self, symbol: str, side: str, quantity: float) -> dict:
+        return self.client.call("place_market_order", symbol=symbol, side=side, quantity=quantity)
+
+    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> dict:
+        return self.client.call("place_limit_order", symbol=symbol, side=side, quantity=quantity, price=price)
+
+    def place_stop_limit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float) -> dict:
+        return self.client.call("place_stop_limit_order", symbol=symbol, side=side, quantity=quantity, stop_price=stop_price, price=price)
+
+    def place_order(self, order: dict) -> dict:
+        """Any order type, as an order spec dict; the reply is OrderResult.to_dict()."""
+        return self.client.call("place_order", order=dict(order))
+
+    def place_stop_market_order(self, symbol: str, side: str, quantity: float, stop_price: float, reduce_only: bool = False) -> dict:
+        return self.place_order({"type": "STOP_MARKET", "symbol": symbol, "side": side, "quantity": quantity,
+                                 "stop_price": stop_price, "reduce_only": reduce_only})
+
+    def place_take_profit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float,
+                                reduce_only: bool = False) -> dict:
+        return self.place_order({"type": "TAKE_PROFIT", "symbol": symbol, "side": side, "quantity": quantity,
+                                 "stop_price": stop_price, "price": price, "reduce_only": reduce_only})
+
+    def place_take_profit_market_order(self, symbol: str, side: str, quantity: float, stop_price: float,
+                                       reduce_only: bool = False) -> dict:
+        return self.place_order({"type": "TAKE_PROFIT_MARKET", "symbol": symbol, "side": side, "quantity": quantity,
+                                 "stop_price": stop_price, "reduce_only": reduce_only})
+
+    def place_trailing_stop_order(self, symbol: str, side: str, quantity: float, callback_rate: float,
+                                  activation_price: float = None, reduce_only: bool = False) -> dict:
+        return self.place_order({"type": "TRAILING_STOP_MARKET", "symbol": symbol, "side": side, "quantity": quantity,
+                                 "callback_rate": callback_rate, "activation_price": activation_price, "reduce_only": reduce_only})
+
+    def place_batch(self, orders) -> list:
+        """Same {"order", "result", "error"} entries as OrderManager.place_batch; errors arrive as strings."""
+        return self.client.call("place_batch", orders=list(orders))
+
+    def open_orders(self, symbol: str = None) -> list:
+        return self.client.call("open_orders", symbol=symbol)
+
+    def order_status(self, symbol: str = None, order_id=None, client_order_id=None) -> dict:
+        return self.client.call("order_status", symbol=symbol, order_id=order_id, client_order_id=client_order_id)
+
+
+class RemoteScheduler:
+    """ExecutionScheduler look-alike whose algos run in the daemon, so they outlive the caller."""
+
+    def __init__(self, client: DaemonClient):
+        self.client = client
+
+    def start_twap(self, symbol: str, side: str, quantity: float, duration: float, slices: int = None, interval: float = None) -> int:
+        return self.client.call("start_twap", symbol=symbol, side=side, quantity=quantity, duration=duration, slices=slices, interval=interval)
+
+    def start_iceberg(self, symbol: str, side: str, quantity: float, display_quantity: float, price: float) -> int:
+        return self.client.call("start_iceberg", symbol=symbol, side=side, quantity=quantity, display_quantity=display_quantity, price=price)
+
+    def start_pov(self, symbol: str, side: str, quantity: float, participation: float, interval: float = 60.0, max_duration: float = None) -> int:
+        return self.client.call("start_pov", symbol=symbol, side=side, quantity=quantity, participation=participation,
+                                interval=interval, max_duration=max_duration)
+
+    def status(self, algo_id: int = None, active_only: bool = False) -> list:
+        return self.client.call("algo_status", algo_id=algo_id, active_only=active_only)
+
+    def cancel(self, algo_id: int) -> bool:
+        return self.client.call("cancel_algo", algo_id=algo_id)
+
+
+def connect_daemon(path: str = None) -> RemoteOrderManager:
+    """Returns a RemoteOrderManager for the running daemon, or raises DaemonUnavailable."""
+    client = DaemonClient(path)
+    client.connect()
+    return RemoteOrderManager(client)
@@ -0,0 +1,10 @@
+_loaded = False
+
+
+def load_env():
+    """Loads .env into os.environ, once. Importing python-dotenv is deferred to the first call."""
+    global _loaded
+    if not _loaded:
+        _loaded = True
+        from dotenv import load_dotenv
+        load_dotenv()
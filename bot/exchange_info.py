@@ -0,0 +1,135 @@
+import json
+import os
+import time
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP
+from bot.logging_config import setup_logger
+from bot.validators import set_exchange_filters
+
+logger = setup_logger(__name__)
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.exchange_info_cache.json')
+DEFAULT_TTL = float(os.getenv("EXCHANGE_INFO_TTL", str(6 * 60 * 60)))
+
+
+class SymbolFilters:
+    """Trading rules for one symbol, taken from its futures exchangeInfo filters."""
+
+    __slots__ = ("symbol", "status", "tick_size", "min_price", "max_price", "step_size", "min_qty", "max_qty", "min_notional")
+
+    def __init__(self, symbol, status="TRADING", tick_size="0", min_price="0", max_price="0",
+                 step_size="0", min_qty="0", max_qty="0", min_notional="0"):
+        self.symbol = symbol
+        self.status = status
+        self.tick_size = Decimal(tick_size)
+        self.min_price = Decimal(min_price)
+        self.max_price = Decimal(max_price)
+        self.step_size = Decimal(step_size)
+        self.min_qty = Decimal(min_qty)
+        self.max_qty = Decimal(max_qty)
+        self.min_notional = Decimal(min_notional)
+
+    @classmethod
+    def from_symbol_info(cls, info: dict) -> "SymbolFilters":
+        filters = {f["filterType"]: f for f in info.get("filters", [])}
+        price_filter = filters.get("PRICE_FILTER", {})
+        lot_size = filters.get("LOT_SIZE", {})
+        min_notional = filters.get("MIN_NOTIONAL", {})
+        return cls(
+            info["symbol"],
+            status=info.get("status", "TRADING"),
+            tick_size=price_filter.get("tickSize", "0"),
+            min_price=price_filter.get("minPrice", "0"),
+            max_price=price_filter.get("maxPrice", "0"),
+            step_size=lot_size.get("stepSize", "0"),
+            min_qty=lot_size.get("minQty", "0"),
+            max_qty=lot_size.get("maxQty", "0"),
+            min_notional=min_notional.get("notional", min_notional.get("minNotional", "0")),
+        )
+
+    def to_dict(self) -> dict:
+        return {name: str(getattr(self, name)) for name in self.__slots__}
+
+    def round_price(self, price: float) -> Decimal:
+        """Rounds a price to the nearest tick."""
+        value = Decimal(repr(price))
+        if self.tick_size > 0:
+            value = (value / self.tick_size).to_integral_value(ROUND_HALF_UP) * self.tick_size
+        return value
+
+    def round_quantity(self, quantity: float) -> Decimal:
+        """Rounds a quantity down to the lot step so the order never exceeds what was asked for."""
+        value = Decimal(repr(quantity))
+        if self.step_size > 0:
+            value = (value / self.step_size).to_integral_value(ROUND_DOWN) * self.step_size
+        return value
+
+
+class ExchangeFilters:
+    """Per-symbol SymbolFilters index with O(1) lookup."""
+
+    def __init__(self, symbols: dict, fetched_at: float = None):
+        self.symbols = symbols
+        self.fetched_at = fetched_at or time.time()
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self.symbols
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def get(self, symbol: str):
+        return self.symbols.get(symbol)
+
+    @classmethod
+    def from_exchange_info(cls, info: dict) -> "ExchangeFilters":
+        symbols = {}
+        for symbol_info in info.get("symbols", []):
+            filters = SymbolFilters.from_symbol_info(symbol_info)
+            symbols[filters.symbol] = filters
+        return cls(symbols)
+
+    def save(self, path: str = CACHE_PATH):
+        data = {
+            "fetched_at": self.fetched_at,
+            "symbols": [filters.to_dict() for filters in self.symbols.values()],
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_cached(cls, path: str = CACHE_PATH, ttl: float = DEFAULT_TTL):
+        """Returns the cached index, or None if the cache file is missing, unreadable or older than ttl."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        fetched_at = data.get("fetched_at", 0)
+        if time.time() - fetched_at > ttl:
+            return None
+        symbols = {item["symbol"]: SymbolFilters(**item) for item in data.get("symbols", [])}
+        return cls(symbols, fetched_at)
+
+
+def load_exchange_filters(raw_client, path: str = CACHE_PATH, ttl: float = DEFAULT_TTL, refresh: bool = False) -> ExchangeFilters:
+    """
+    Loads the filter index from the local cache, or from futures_exchange_info if the cache is stale.
+
+    The result is also installed in bot.validators so every validator call can use it.
+    Pass path=None to skip the disk cache entirely.
+    """
+    filters = None if refresh or path is None else ExchangeFilters.load_cached(path, ttl)
+    if filters is None:
+        filters = ExchangeFilters.from_exchange_info(raw_client.futures_exchange_info())
+        logger.info(f"Fetched exchange filters for {len(filters)} symbols.")
+        if path is not None:
+            try:
+                filters.save(path)
+            except OSError as e:
+                logger.error(f"Could not write exchange info cache: {e}")
+
+    set_exchange_filters(filters)
+    return filters
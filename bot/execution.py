@@ -0,0 +1,412 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bot.logging_config import setup_logger
+from bot.metrics import metrics
+from bot.validators import validate_symbol, validate_side, validate_quantity, validate_price, validate_notional, get_exchange_filters, ValidationError
+
+logger = setup_logger(__name__)
+
+EXECUTION_JITTER_METRIC = "trading_bot_execution_jitter_seconds"
+
+ACTIVE = "RUNNING"
+# EXPIRED: the schedule ran out (TWAP's last slice or POV's max_duration) with quantity still unfilled.
+# FAILED: a child was invalid, or MAX_CHILD_FAILURES children in a row were rejected.
+FINAL_STATUSES = {"COMPLETED", "CANCELED", "EXPIRED", "FAILED"}
+MAX_CHILD_FAILURES = 5
+_CHILD_FINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "REJECTED", "EXPIRED_IN_MATCH"}
+_MAX_ERRORS = 20
+# Seconds a new child may be missing from the state book (its first event still in flight) before it is read over REST.
+_BOOK_GRACE = 10.0
+# Quantities below this are float residue, not something left to trade.
+_EPSILON = 1e-9
+
+
+class ExecutionAlgo:
+    """One parent order being worked by a TWAP, ICEBERG or POV schedule, with its child orders."""
+
+    __slots__ = ("id", "kind", "symbol", "side", "quantity", "params", "status", "children", "errors",
+                 "filled", "notional", "slices_sent", "failures", "created", "started", "finished", "next_at",
+                 "version", "volume_cursor", "market_volume")
+
+    def __init__(self, algo_id, kind, symbol, side, quantity, params):
+        self.id = algo_id
+        self.kind = kind
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.params = params
+        self.status = ACTIVE
+        self.children = []  # {"orderId", "quantity", "price", "status", "filled", "avg_price", "sent_at"}
+        self.errors = []
+        self.filled = 0.0
+        self.notional = 0.0
+        self.slices_sent = 0
+        self.failures = 0  # consecutive child orders that failed
+        self.created = time.time()
+        self.started = None  # scheduler clock when the first step ran
+        self.finished = None
+        self.next_at = None
+        self.version = 0
+        self.volume_cursor = None  # POV: open time (ms) of the first candle not yet counted
+        self.market_volume = 0.0  # POV: market volume observed since the start
+
+    @property
+    def open_quantity(self) -> float:
+        """Quantity sent in child orders that are still working and not yet filled."""
+        return sum(c["quantity"] - c["filled"] for c in self.children if c["status"] not in _CHILD_FINAL_STATUSES)
+
+    @property
+    def remaining(self) -> float:
+        """Quantity not yet sent or filled."""
+        left = self.quantity - self.filled - self.open_quantity
+        return left if left > _EPSILON else 0.0
+
+    @property
+    def progress(self) -> float:
+        return self.filled / self.quantity if self.quantity else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "symbol": self.symbol,
+            "side": self.side,
+            "quantity": self.quantity,
+            "params": dict(self.params),
+            "status": self.status,
+            "filled": self.filled,
+            "avg_price": self.notional / self.filled if self.filled else None,
+            "progress": self.progress,
+            "slices_sent": self.slices_sent,
+            "open_quantity": self.open_quantity,
+            "children": [dict(child) for child in self.children],
+            "errors": list(self.errors),
+            "created": self.created,
+        }
+
+
+def _lot(symbol: str, quantity: float) -> float:
+    """quantity rounded down to the symbol's lot step, or 0.0 when that is below the minimum."""
+    filters = get_exchange_filters()
+    filters = filters.get(symbol) if filters is not None else None
+    if filters is None:
+        return round(quantity, 8) if quantity > _EPSILON else 0.0
+    # The epsilon keeps float residue (0.2 - 0.15 = 0.04999...) from flooring a whole step away.
+    rounded = float(filters.round_quantity(quantity + _EPSILON))
+    return rounded if rounded > 0 and rounded >= filters.min_qty else 0.0
+
+
+class ExecutionScheduler:
+    """
+    Works parent orders as TWAP, iceberg or participation-of-volume (POV) child orders.
+
+    Every running algo has at most one pending wake-up in a single heap of (due, seq, version,
+    algo); one timer thread sleeps until the earliest is due and hands it to a small thread
+    pool, so thousands of schedules cost O(log n) per event and no schedule waits on another's
+    network round trip. A wake-up books the fills of the algo's working children, sends the
+    next child if one is due, and schedules the next wake-up. Fills are read from the
+    user-data-stream StateBook, so polling costs no request weight however many algos run;
+    children go over REST only while the stream is down or the book has not seen them yet.
+    """
+
+    def __init__(self, manager, max_workers: int = 8, poll_interval: float = 1.0, clock=time.monotonic, state_book=None):
+        self.manager = manager
+        self.state_book = state_book
+        if state_book is None and hasattr(manager, "binance_client"):
+            try:
+                self.state_book = manager.binance_client.start_state_book()
+            except Exception as e:
+                logger.warning(f"State book unavailable, execution algos will poll child orders over REST: {e}")
+        self.poll_interval = poll_interval
+        self.algos = {}  # id -> ExecutionAlgo
+        self._clock = clock
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)  # wakes the timer thread
+        self._done = threading.Condition(self._lock)  # wakes wait() callers
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="execution")
+        self._thread = threading.Thread(target=self._run, name="execution-scheduler", daemon=True)
+        self._thread.start()
+
+    def close(self, wait: bool = True):
+        with self._lock:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown(wait=wait)
+
+    # --- starting and cancelling ---
+
+    def start_twap(self, symbol: str, side: str, quantity: float, duration: float, slices: int = None, interval: float = None) -> int:
+        """
+        Sends quantity as MARKET children spread evenly over duration seconds.
+
+        Pass slices or interval (seconds between children); by default one child per minute.
+        Each child tops the parent up to its time-weighted target, so a failed or short child
+        is made up by the next one and the last child sends whatever is left.
+        """
+        duration = float(duration)
+        if duration < 0:
+            raise ValidationError(f"Duration must not be negative, got {duration}.")
+        if slices is None:
+            slices = max(1, round(duration / float(interval))) if interval else max(1, round(duration / 60))
+        slices = int(slices)
+        if slices < 1:
+            raise ValidationError(f"A TWAP needs at least one slice, got {slices}.")
+        interval = duration / slices if slices > 1 else 0.0
+        return self._start("TWAP", symbol, side, quantity, {"duration": duration, "slices": slices, "interval": interval})
+
+    def start_iceberg(self, symbol: str, side: str, quantity: float, display_quantity: float, price: float) -> int:
+        """Works quantity as LIMIT children at price, showing at most display_quantity at a time."""
+        symbol = validate_symbol(symbol)
+        display_quantity = validate_quantity(display_quantity, symbol)
+        price = validate_price(price, "LIMIT", symbol)
+        validate_notional(symbol, display_quantity, price)
+        return self._start("ICEBERG", symbol, side, quantity, {"display_quantity": display_quantity, "price": price})
+
+    def start_pov(self, symbol: str, side: str, quantity: float, participation: float, interval: float = 60.0,
+                  max_duration: float = None) -> int:
+        """
+        Trades participation (0-1) of the market volume printed since the start, checking every interval.
+
+        Volume comes from closed 1m klines. The algo expires after max_duration seconds if set.
+        """
+        participation = float(participation)
+        if not 0 < participation < 1:
+            raise ValidationError(f"Participation must be between 0 and 1, got {participation}.")
+        params = {"participation": participation, "interval": float(interval), "max_duration": max_duration}
+        return self._start("POV", symbol, side, quantity, params)
+
+    def cancel(self, algo_id: int) -> bool:
+        """Stops the algo and cancels its working children. Filled children stay filled."""
+        with self._lock:
+            algo = self.algos.get(algo_id)
+            if algo is None or algo.status != ACTIVE:
+                return False
+            self._finish(algo, "CANCELED")
+            working = [c for c in algo.children if c["status"] not in _CHILD_FINAL_STATUSES]
+        # A child still in flight is not in this list; _send cancels it once it lands.
+        for child in working:
+            self._cancel_child(algo, child)
+        logger.info("Execution algo %s cancelled at %.1f%%.", algo_id, algo.progress * 100)
+        return True
+
+    def get(self, algo_id: int) -> ExecutionAlgo:
+        return self.algos.get(algo_id)
+
+    def status(self, algo_id: int = None, active_only: bool = False) -> list:
+        """to_dict() of one algo, or of every (running) algo."""
+        with self._lock:
+            if algo_id is not None:
+                algo = self.algos.get(algo_id)
+                return [algo.to_dict()] if algo is not None else []
+            return [a.to_dict() for a in self.algos.values() if not active_only or a.status == ACTIVE]
+
+    def wait(self, algo_id: int, timeout: float = None) -> bool:
+        """Blocks until the algo finishes. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            algo = self.algos[algo_id]
+            while algo.status == ACTIVE:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._done.wait(remaining)
+        return True
+
+    def _start(self, kind, symbol, side, quantity, params) -> int:
+        symbol = validate_symbol(symbol)
+        side = validate_side(side)
+        quantity = validate_quantity(quantity, symbol)
+        algo = ExecutionAlgo(next(self._ids), kind, symbol, side, quantity, params)
+        with self._lock:
+            self.algos[algo.id] = algo
+            self._schedule(algo, self._clock())
+        logger.info("Execution algo %s started: %s %s %s qty=%s %s", algo.id, kind, side, symbol, quantity, params)
+        return algo.id
+
+    # --- event loop ---
+
+    def _schedule(self, algo: ExecutionAlgo, due: float):
+        # Called with the condition held. A newer version makes any older heap entry stale.
+        algo.version += 1
+        algo.next_at = due
+        heapq.heappush(self._heap, (due, next(self._seq), algo.version, algo))
+        if self._heap[0][3] is algo:
+            self._cond.notify()
+
+    def _run(self):
+        with self._lock:
+            while not self._closed:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                delay = self._heap[0][0] - self._clock()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                due, _, version, algo = heapq.heappop(self._heap)
+                if algo.status != ACTIVE or version != algo.version:
+                    continue
+                algo.next_at = None
+                self._executor.submit(self._step, algo, due)
+
+    def _step(self, algo: ExecutionAlgo, due: float):
+        now = self._clock()
+        metrics.observe(EXECUTION_JITTER_METRIC, now - due, (("kind", algo.kind),))
+        if algo.started is None:
+            algo.started = now
+        try:
+            self._refresh(algo)
+            next_at = getattr(self, f"_step_{algo.kind.lower()}")(algo, now)
+        except Exception as e:
+            logger.error(f"Execution algo {algo.id} step failed: {e}")
+            self._record_error(algo, e)
+            next_at = now + self.poll_interval
+
+        with self._lock:
+            if algo.status != ACTIVE:
+                return
+            if algo.failures >= MAX_CHILD_FAILURES:
+                self._finish(algo, "FAILED")
+            elif next_at is None:
+                self._finish(algo, "COMPLETED" if algo.filled >= algo.quantity - _EPSILON else "EXPIRED")
+            else:
+                self._schedule(algo, next_at)
+
+    def _finish(self, algo: ExecutionAlgo, status: str):
+        # Called with the condition held.
+        algo.status = status
+        algo.finished = time.time()
+        algo.version += 1
+        self._done.notify_all()
+        if status != "CANCELED":
+            logger.info("Execution algo %s %s: filled %s of %s.", algo.id, status.lower(), algo.filled, algo.quantity)
+
+    # --- algorithms: each returns the next wake-up time, or None once the algo is done ---
+
+    def _step_twap(self, algo: ExecutionAlgo, now: float):
+        slices = algo.params["slices"]
+        interval = algo.params["interval"]
+        if algo.slices_sent < slices:
+            target = algo.quantity * (algo.slices_sent + 1) / slices
+            owed = algo.remaining if algo.slices_sent == slices - 1 else target - algo.filled - algo.open_quantity
+            algo.slices_sent += 1
+            self._send(algo, min(owed, algo.remaining))
+            if algo.slices_sent < slices:
+                return algo.started + algo.slices_sent * interval
+        return self._poll_or_done(algo, now)
+
+    def _step_iceberg(self, algo: ExecutionAlgo, now: float):
+        if algo.open_quantity <= _EPSILON and algo.remaining > 0:
+            algo.slices_sent += 1
+            self._send(algo, min(algo.params["display_quantity"], algo.remaining), price=algo.params["price"])
+        if algo.remaining > 0 or algo.open_quantity > _EPSILON:
+            return now + self.poll_interval
+        return None
+
+    def _step_pov(self, algo: ExecutionAlgo, now: float):
+        params = algo.params
+        algo.market_volume += self._new_volume(algo)
+        owed = params["participation"] * algo.market_volume - algo.filled - algo.open_quantity
+        if owed > 0 and algo.remaining > 0:
+            if self._send(algo, min(owed, algo.remaining)):
+                algo.slices_sent += 1
+
+        expired = params.get("max_duration") is not None and now - algo.started >= params["max_duration"]
+        if algo.remaining > 0 and not expired:
+            next_check = now + params["interval"]
+            return min(next_check, now + self.poll_interval) if algo.open_quantity > _EPSILON else next_check
+        return self._poll_or_done(algo, now)
+
+    def _poll_or_done(self, algo: ExecutionAlgo, now: float):
+        # Nothing more to send: keep polling until the working children settle.
+        return now + self.poll_interval if algo.open_quantity > _EPSILON else None
+
+    # --- children ---
+
+    def _send(self, algo: ExecutionAlgo, quantity: float, price: float = None) -> bool:
+        quantity = _lot(algo.symbol, quantity)
+        if quantity <= 0:
+            return False
+        with self._lock:
+            if algo.status != ACTIVE:
+                return False  # cancelled while this step was running
+        try:
+            if price is None:
+                result = self.manager.place_market_order(algo.symbol, algo.side, quantity)
+            else:
+                result = self.manager.place_limit_order(algo.symbol, algo.side, quantity, price)
+        except Exception as e:
+            logger.error(f"Execution algo {algo.id} child order failed: {e}")
+            self._record_error(algo, e)
+            # An invalid child (below min notional, bad price) will not become valid by retrying.
+            algo.failures = MAX_CHILD_FAILURES if isinstance(e, ValidationError) else algo.failures + 1
+            return False
+        algo.failures = 0
+
+        child = {"orderId": result.get("orderId"), "quantity": quantity, "price": price, "status": result.get("status"),
+                 "filled": 0.0, "avg_price": None, "sent_at": time.time()}
+        with self._lock:
+            algo.children.append(child)
+            cancelled = algo.status != ACTIVE
+        # Responses that leave out executedQty read as 0; a FILLED order filled in full.
+        executed = result.get("executedQty") or (quantity if child["status"] == "FILLED" else 0.0)
+        if executed:
+            self._update_child(algo, child, child["status"], float(executed), float(result.get("avgPrice") or 0))
+        if cancelled and child["status"] not in _CHILD_FINAL_STATUSES:
+            # cancel() ran while this order was in flight, so it could not see it.
+            self._cancel_child(algo, child)
+        return True
+
+    def _cancel_child(self, algo: ExecutionAlgo, child: dict):
+        try:
+            self.manager.client.futures_cancel_order(symbol=algo.symbol, orderId=child["orderId"])
+            child["status"] = "CANCELED"
+        except Exception as e:
+            logger.error(f"Failed to cancel child {child['orderId']} of algo {algo.id}: {e}")
+
+    def _refresh(self, algo: ExecutionAlgo):
+        """Books new fills of each working child, from the state book when it can vouch for the child."""
+        book = self.state_book
+        streaming = book is not None and book.connected
+        for child in list(algo.children):
+            if child["status"] in _CHILD_FINAL_STATUSES:
+                continue
+            order = book.get_order(child["orderId"]) if streaming else None
+            if order is None or order.get("status") == "UNKNOWN":
+                if streaming and order is None and time.time() - child["sent_at"] < _BOOK_GRACE:
+                    continue  # its first event has not arrived yet
+                order = self.manager.client.futures_get_order(symbol=algo.symbol, orderId=child["orderId"])
+            self._update_child(algo, child, order.get("status"), float(order.get("executedQty") or 0), float(order.get("avgPrice") or 0))
+
+    def _update_child(self, algo: ExecutionAlgo, child: dict, status: str, filled: float, avg_price: float):
+        algo.filled += filled - child["filled"]
+        algo.notional += filled * avg_price - child["filled"] * (child["avg_price"] or 0)
+        child.update(status=status, filled=filled, avg_price=avg_price or None)
+
+    def _new_volume(self, algo: ExecutionAlgo) -> float:
+        """Volume of the 1m candles that closed since the last check."""
+        now_ms = int(time.time() * 1000)
+        if algo.volume_cursor is None:
+            algo.volume_cursor = now_ms // 60000 * 60000  # count from the candle the algo started in
+            return 0.0
+        candles = self.manager.client.futures_klines(symbol=algo.symbol, interval="1m", startTime=algo.volume_cursor)
+        volume = 0.0
+        for candle in candles:
+            if candle[6] >= now_ms:
+                break  # still open
+            volume += float(candle[5])
+            algo.volume_cursor = candle[0] + 60000
+        return volume
+
+    @staticmethod
+    def _record_error(algo: ExecutionAlgo, error: Exception):
+        algo.errors.append(str(error))
+        del algo.errors[:-_MAX_ERRORS]
@@ -0,0 +1,167 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from bot.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+JOURNAL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.order_journal.db')
+
+PENDING = "PENDING"  # written, not yet acknowledged by the exchange
+UNKNOWN = "UNKNOWN"  # sent, but the outcome could not be confirmed
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS orders (
+    seq INTEGER PRIMARY KEY,
+    client_order_id TEXT UNIQUE NOT NULL,
+    symbol TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    order_id INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_unresolved ON orders (status) WHERE status IN ('PENDING', 'UNKNOWN');
+"""
+
+
+def make_client_order_id(session: str, seq: int) -> str:
+    """
+    newClientOrderId for the seq-th order of a session.
+
+    (session, seq) is unique, and an order is stamped once, so every retry resends under the
+    ID the exchange may already know. Fits Binance's 36-character limit.
+    """
+    return f"tb-{session}-{seq:x}"
+
+
+class OrderJournal:
+    """
+    SQLite (WAL) record of every order, written before it is sent and updated in place as
+    its status becomes known.
+
+    Unresolved (PENDING/UNKNOWN) entries are held in memory so replay after a restart is a
+    single indexed query. reconcile() then asks the exchange about those orders only, by
+    client ID. Once the exchange has acknowledged an order, its lifecycle is the StateBook's
+    business, so acknowledged entries leave the in-memory index whatever their status.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL survives process crashes; only an OS crash can drop the last commits.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'session'").fetchone()
+        if row is None:
+            self.session = uuid.uuid4().hex[:12]
+            self._conn.execute("INSERT INTO meta (key, value) VALUES ('session', ?)", (self.session,))
+        else:
+            self.session = row[0]
+        self._seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM orders").fetchone()[0]
+
+        self.open = {}  # client_order_id -> entry dict, for PENDING/UNKNOWN orders only
+        self.replay()
+
+    def replay(self) -> dict:
+        """Reloads every unresolved entry into memory and returns them by client order ID."""
+        started = time.perf_counter()
+        rows = self._conn.execute(
+            "SELECT seq, client_order_id, symbol, params, status, order_id, attempts FROM orders "
+            "WHERE status IN ('PENDING', 'UNKNOWN')"
+        ).fetchall()
+        self.open = {
+            row[1]: {"seq": row[0], "clientOrderId": row[1], "symbol": row[2], "params": json.loads(row[3]),
+                     "status": row[4], "orderId": row[5], "attempts": row[6]}
+            for row in rows
+        }
+        logger.info(f"Order journal replayed {len(self.open)} unresolved entries in {(time.perf_counter() - started) * 1000:.1f}ms.")
+        return self.open
+
+    def record(self, params: dict) -> str:
+        """Stamps params with the next deterministic newClientOrderId and journals it as PENDING."""
+        now = time.time()
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            client_order_id = make_client_order_id(self.session, seq)
+            params["newClientOrderId"] = client_order_id
+            self._conn.execute(
+                "INSERT INTO orders (seq, client_order_id, symbol, params, status, created, updated) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (seq, client_order_id, params.get("symbol"), json.dumps(params, default=str), PENDING, now, now),
+            )
+        self.open[client_order_id] = {"seq": seq, "clientOrderId": client_order_id, "symbol": params.get("symbol"),
+                                      "params": params, "status": PENDING, "orderId": None, "attempts": 0}
+        return client_order_id
+
+    def mark(self, client_order_id: str, status: str, order_id=None, attempt: bool = False):
+        """Updates an entry's status (and exchange orderId, once known)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE orders SET status = ?, order_id = COALESCE(?, order_id), attempts = attempts + ?, updated = ? "
+                "WHERE client_order_id = ?",
+                (status, order_id, 1 if attempt else 0, time.time(), client_order_id),
+            )
+        entry = self.open.get(client_order_id)
+        if status not in (PENDING, UNKNOWN):
+            self.open.pop(client_order_id, None)
+        elif entry is not None:
+            entry["status"] = status
+            if order_id is not None:
+                entry["orderId"] = order_id
+            if attempt:
+                entry["attempts"] += 1
+
+    def get(self, client_order_id: str):
+        """Returns the journal entry for a client order ID, or None."""
+        entry = self.open.get(client_order_id)
+        if entry is not None:
+            return entry
+        row = self._conn.execute(
+            "SELECT seq, symbol, params, status, order_id, attempts FROM orders WHERE client_order_id = ?", (client_order_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"seq": row[0], "clientOrderId": client_order_id, "symbol": row[1], "params": json.loads(row[2]),
+                "status": row[3], "orderId": row[4], "attempts": row[5]}
+
+    def unresolved(self) -> list:
+        """Entries whose send was never confirmed (PENDING or UNKNOWN)."""
+        return list(self.open.values())
+
+    def reconcile(self, raw_client) -> int:
+        """Resolves PENDING/UNKNOWN entries against the exchange by client order ID. Returns how many changed."""
+        from binance.exceptions import BinanceAPIException
+
+        resolved = 0
+        for entry in self.unresolved():
+            try:
+                order = raw_client.futures_get_order(symbol=entry["symbol"], origClientOrderId=entry["clientOrderId"])
+            except BinanceAPIException as e:
+                if e.code == -2013:
+                    # Never reached the exchange; nothing to track.
+                    self.mark(entry["clientOrderId"], "REJECTED")
+                    resolved += 1
+                else:
+                    logger.warning(f"Could not reconcile {entry['clientOrderId']}: {e}")
+                continue
+            except Exception as e:
+                logger.warning(f"Could not reconcile {entry['clientOrderId']}: {e}")
+                continue
+            self.mark(entry["clientOrderId"], order.get("status"), order.get("orderId"))
+            resolved += 1
+        if resolved:
+            logger.info(f"Order journal reconciled {resolved} unresolved entries with the exchange.")
+        return resolved
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
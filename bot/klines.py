@@ -0,0 +1,295 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+from bot.logging_config import setup_logger
+from bot.validators import validate_symbol, ValidationError
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so only one process may update a series at a time.
+    fcntl = None
+
+logger = setup_logger(__name__)
+
+DATA_DIR = os.getenv("KLINES_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'klines'))
+PAGE_LIMIT = 1500  # most candles futures_klines returns per request
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000, "8h": 28_800_000,
+    "12h": 43_200_000, "1d": 86_400_000, "3d": 259_200_000, "1w": 604_800_000,
+}
+
+# Column name, dtype and position in a futures_klines row.
+COLUMNS = (
+    ("open_time", "<i8", 0),
+    ("open", "<f8", 1),
+    ("high", "<f8", 2),
+    ("low", "<f8", 3),
+    ("close", "<f8", 4),
+    ("volume", "<f8", 5),
+    ("close_time", "<i8", 6),
+    ("quote_volume", "<f8", 7),
+    ("trades", "<i8", 8),
+    ("taker_buy_volume", "<f8", 9),
+    ("taker_buy_quote_volume", "<f8", 10),
+)
+
+
+def to_ms(value) -> int:
+    """Milliseconds since the epoch from an int, a datetime or an ISO date string (UTC if no zone)."""
+    if value is None or isinstance(value, (int, np.integer)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    raise ValidationError(f"Unsupported time value: {value!r}.")
+
+
+def _interval_ms(interval: str) -> int:
+    step = INTERVAL_MS.get(interval)
+    if step is None:
+        raise ValidationError(f"Unsupported kline interval: '{interval}'. Must be one of {list(INTERVAL_MS)}.")
+    return step
+
+
+def _column_path(directory: str, name: str, dtype: str, version: int) -> str:
+    return os.path.join(directory, f"{name}.v{version}.{dtype[1:]}")
+
+
+def _rows_to_columns(rows) -> dict:
+    if not rows:
+        return {name: np.empty(0, dtype=dtype) for name, dtype, _ in COLUMNS}
+    table = np.array([row[:len(COLUMNS)] for row in rows], dtype=object)
+    return {name: table[:, index].astype(np.float64).astype(dtype) for name, dtype, index in COLUMNS}
+
+
+class KlineStore:
+    """
+    Local futures kline history, one directory per symbol and interval.
+
+    Every column is a flat little-endian binary file (open_time.v0.i8, close.v0.f8, ...) next to
+    a meta.json holding the row count and the column files' version. Readers memory-map the
+    files, so opening a multi-GB history costs nothing and slices are zero-copy views. Rows
+    are only valid up to meta's count: an append writes data first and publishes the new count
+    last, and a prepend writes a complete new version of every column before one meta.json
+    replace switches to it. A crash mid-write therefore never exposes a partial candle or
+    columns of different lengths.
+    """
+
+    def __init__(self, root: str = DATA_DIR):
+        self.root = root
+        self._maps = {}  # (symbol, interval) -> (count, {column: memmap})
+
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, symbol, interval)
+
+    def meta(self, symbol: str, interval: str) -> dict:
+        try:
+            with open(os.path.join(self.path(symbol, interval), "meta.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"symbol": symbol, "interval": interval, "count": 0, "first_open_time": None, "last_open_time": None, "version": 0}
+
+    def series(self) -> list:
+        """(symbol, interval) pairs that have stored data."""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for symbol in sorted(os.listdir(self.root)):
+            for interval in sorted(os.listdir(os.path.join(self.root, symbol))):
+                if self.meta(symbol, interval)["count"]:
+                    found.append((symbol, interval))
+        return found
+
+    # --- reading ---
+
+    def read(self, symbol: str, interval: str, start=None, end=None, columns=None) -> dict:
+        """
+        Returns {column: array} for candles with start <= open_time <= end.
+
+        Arrays are read-only views over memory-mapped files; nothing is copied or loaded until
+        it is touched.
+        """
+        symbol = validate_symbol(symbol)
+        _interval_ms(interval)
+        maps = self._open(symbol, interval)
+        names = columns or [name for name, _, _ in COLUMNS]
+        open_time = maps["open_time"]
+        lo = 0 if start is None else int(np.searchsorted(open_time, to_ms(start), side="left"))
+        hi = len(open_time) if end is None else int(np.searchsorted(open_time, to_ms(end), side="right"))
+        return {name: maps[name][lo:hi] for name in names}
+
+    def _open(self, symbol: str, interval: str) -> dict:
+        for attempt in range(3):
+            meta = self.meta(symbol, interval)
+            key = (meta["count"], meta["version"])
+            cached = self._maps.get((symbol, interval))
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            try:
+                maps = self._map_columns(self.path(symbol, interval), *key)
+            except FileNotFoundError:
+                # A writer switched versions and cleaned up between our meta read and the open.
+                if attempt == 2:
+                    raise
+                continue
+            self._maps[(symbol, interval)] = (key, maps)
+            return maps
+
+    @staticmethod
+    def _map_columns(directory: str, count: int, version: int) -> dict:
+        maps = {}
+        for name, dtype, _ in COLUMNS:
+            if count:
+                maps[name] = np.memmap(_column_path(directory, name, dtype, version), dtype=dtype, mode="r", shape=(count,))
+            else:
+                maps[name] = np.empty(0, dtype=dtype)
+        return maps
+
+    # --- downloading ---
+
+    def update(self, client, symbol: str, interval: str, start=None, end=None, max_workers: int = 4) -> int:
+        """
+        Downloads missing closed candles and returns how many rows were added.
+
+        With data already stored only the tail after the last candle is fetched (plus the head
+        before the first one, if start is earlier). Pages are fetched concurrently; requests go
+        through the client's rate limiter, so concurrency never exceeds the API weight budget.
+        """
+        raw = getattr(client, "client", client)
+        symbol = validate_symbol(symbol)
+        step = _interval_ms(interval)
+        now = int(time.time() * 1000)
+        # The newest candle is still open; only store candles that have closed.
+        last_closed = (now // step - 1) * step
+        end_ms = last_closed if end is None else min(to_ms(end), last_closed)
+
+        directory = self.path(symbol, interval)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            meta = self.meta(symbol, interval)
+            added = 0
+
+            if meta["count"]:
+                start_ms = to_ms(start)
+                if start_ms is not None and start_ms < meta["first_open_time"]:
+                    head, error = self._download(raw, symbol, interval, start_ms, meta["first_open_time"] - 1, max_workers)
+                    if error is not None:
+                        # A partial head would leave a hole before the stored history that tail updates never fill.
+                        raise error
+                    added += self._prepend(symbol, interval, head)
+                    meta = self.meta(symbol, interval)
+                tail_start = meta["last_open_time"] + step
+            else:
+                if start is None:
+                    raise ValidationError(f"No {symbol} {interval} history stored yet; pass a start time.")
+                tail_start = -(-to_ms(start) // step) * step
+
+            if tail_start <= end_ms:
+                tail, error = self._download(raw, symbol, interval, tail_start, end_ms, max_workers)
+                added += self._append(symbol, interval, tail)
+                if error is not None:
+                    raise error
+
+        logger.info(f"Kline store {symbol} {interval}: {added} candles added.")
+        return added
+
+    def _download(self, raw, symbol, interval, start_ms, end_ms, max_workers) -> tuple:
+        """Returns (columns, error): the contiguous run of pages that arrived, and the first failure if any."""
+        step = _interval_ms(interval)
+        pages = [(t, min(t + step * PAGE_LIMIT - 1, end_ms)) for t in range(start_ms, end_ms + 1, step * PAGE_LIMIT)]
+
+        def fetch(page):
+            return raw.futures_klines(symbol=symbol, interval=interval, startTime=page[0], endTime=page[1], limit=PAGE_LIMIT)
+
+        results = []
+        error = None
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="klines") as executor:
+            futures = [executor.submit(fetch, page) for page in pages]
+            for future in futures:
+                try:
+                    results.append(_rows_to_columns(future.result()))
+                except Exception as e:
+                    # Keep the contiguous prefix that did arrive; the next update resumes from there.
+                    logger.error(f"Kline page download failed for {symbol} {interval}: {e}")
+                    error = e
+                    break
+
+        if not results:
+            return _rows_to_columns([]), error
+        columns = {name: np.concatenate([page[name] for page in results]) for name, _, _ in COLUMNS}
+        _, first = np.unique(columns["open_time"], return_index=True)
+        return {name: values[first] for name, values in columns.items()}, error
+
+    def _append(self, symbol, interval, columns) -> int:
+        meta = self.meta(symbol, interval)
+        if meta["last_open_time"] is not None:
+            keep = columns["open_time"] > meta["last_open_time"]
+            columns = {name: values[keep] for name, values in columns.items()}
+        added = len(columns["open_time"])
+        if added:
+            directory = self.path(symbol, interval)
+            version = meta["version"]
+            for name, dtype, _ in COLUMNS:
+                path = _column_path(directory, name, dtype, version)
+                mode = "r+b" if os.path.exists(path) else "wb"
+                with open(path, mode) as f:
+                    # Drop anything past the published count left by an interrupted write.
+                    f.truncate(meta["count"] * np.dtype(dtype).itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            first = meta["first_open_time"] if meta["count"] else int(columns["open_time"][0])
+            self._write_meta(symbol, interval, meta["count"] + added, first, int(columns["open_time"][-1]), version)
+        return added
+
+    def _prepend(self, symbol, interval, columns) -> int:
+        meta = self.meta(symbol, interval)
+        keep = columns["open_time"] < meta["first_open_time"]
+        columns = {name: values[keep] for name, values in columns.items()}
+        added = len(columns["open_time"])
+        if added:
+            # Write a whole new version of every column, then switch to it with the single meta
+            # replace. Readers keep using the old version's files until they see the new meta.
+            existing = self._open(symbol, interval)
+            directory = self.path(symbol, interval)
+            old = meta["version"]
+            version = old + 1
+            for name, dtype, _ in COLUMNS:
+                with open(_column_path(directory, name, dtype, version), "wb") as f:
+                    f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+                    f.write(np.ascontiguousarray(existing[name][:meta["count"]]).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._write_meta(symbol, interval, meta["count"] + added, int(columns["open_time"][0]), meta["last_open_time"], version)
+            # The version before the old one has had a whole update to drain its readers.
+            if old:
+                for name, dtype, _ in COLUMNS:
+                    try:
+                        os.remove(_column_path(directory, name, dtype, old - 1))
+                    except OSError:
+                        pass  # already gone, or still mapped on Windows
+        return added
+
+    def _write_meta(self, symbol, interval, count, first, last, version=0):
+        path = os.path.join(self.path(symbol, interval), "meta.json")
+        meta = {
+            "symbol": symbol, "interval": interval, "count": count,
+            "first_open_time": first, "last_open_time": last, "version": version,
+            "columns": {name: dtype for name, dtype, _ in COLUMNS},
+        }
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
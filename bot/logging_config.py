@@ -1,24 +1,142 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+from bot.env import load_env
+
+LOG_FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'trading_bot.log')
+
+_queue_handler = None
+_listener = None
+_shared_handlers = None
+
+# Log arguments that cannot change between the call and the listener formatting them.
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched when its args are immutable scalars.
+
+    The stock handler merges msg % args on the calling thread; here that is left to the
+    listener so the caller only pays for creating the record and a queue put. Records with
+    mutable args (e.g. an order params dict) are still merged on the caller, since the
+    caller may change them before the listener gets to format the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        # A lone dict argument arrives as the args themselves (LogRecord unwraps it), so dict args
+        # are always merged here.
+        if args and (isinstance(args, dict) or not all(isinstance(arg, _IMMUTABLE_ARGS) for arg in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _text_formatter() -> logging.Formatter:
+    return logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def _log_file_path() -> str:
+    # Child processes (e.g. the order router's account workers) write their own file: rotating
+    # handlers in several processes renaming one shared file lose and duplicate records.
+    # multiprocessing is only looked up, never imported, to keep it off the CLI's cold start.
+    # The process name is already set while a spawned child imports its modules; parent_process() is not.
+    multiprocessing = sys.modules.get("multiprocessing")
+    name = multiprocessing.current_process().name if multiprocessing is not None else "MainProcess"
+    if name == "MainProcess":
+        return LOG_FILE_PATH
+    root, extension = os.path.splitext(LOG_FILE_PATH)
+    return f"{root}.{name}{extension}"
+
+
+def _file_handler() -> logging.Handler:
+    # LOG_ROTATE_WHEN (e.g. "midnight", "H") switches from size-based to time-based rotation.
+    backup_count = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    rotate_when = os.getenv("LOG_ROTATE_WHEN", "")
+    path = _log_file_path()
+    if rotate_when:
+        handler = logging.handlers.TimedRotatingFileHandler(path, when=rotate_when, backupCount=backup_count)
+    else:
+        max_bytes = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count)
+    # LOG_FORMAT=json writes the file as JSON lines.
+    handler.setFormatter(JsonFormatter() if os.getenv("LOG_FORMAT", "text").lower() == "json" else _text_formatter())
+    return handler
+
+
+def _console_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(_text_formatter())
+    return handler
+
+
+def _get_shared_handlers() -> list:
+    # One console and one file handler for every module logger, so rotation sees a single writer.
+    global _shared_handlers
+    if _shared_handlers is None:
+        load_env()
+        _shared_handlers = [_console_handler(), _file_handler()]
+    return _shared_handlers
+
+
+def _get_queue_handler() -> logging.Handler:
+    global _queue_handler, _listener
+    if _queue_handler is None:
+        # The formatters never print caller location, thread or process, so skip collecting
+        # them per record (see "Optimization" in the logging HOWTO).
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = DeferredQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, *_get_shared_handlers())
+        _listener.start()
+        atexit.register(stop_logging)
+    return _queue_handler
+
+
+def stop_logging():
+    """Flushes queued records and stops the background listener, if one is running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
-        # Create formatters
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        
-        # Console Handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-        
-        # File Handler (logs to trading_bot.log in the project root)
-        log_file_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'trading_bot.log')
-        file_handler = logging.FileHandler(log_file_path)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        
-        logger.setLevel(logging.INFO)
-        
+        handlers = _get_shared_handlers()
+        # LOG_MODE=queue moves formatting and I/O to a background listener thread.
+        if os.getenv("LOG_MODE", "sync").lower() == "queue":
+            logger.addHandler(_get_queue_handler())
+        else:
+            # Console + file handler (logs to trading_bot.log in the project root)
+            for handler in handlers:
+                logger.addHandler(handler)
+
+        logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
     return logger
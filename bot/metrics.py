@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from bot.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+# Upper bounds in seconds, from 50us (local work) to 5s (slow network round trips).
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HELP = {
+    "trading_bot_request_stage_seconds": "Time spent per futures API request stage (signing, network, parsing).",
+    "trading_bot_order_stage_seconds": "Time spent per OrderManager stage (validation, submit).",
+    "trading_bot_api_errors_total": "Binance API errors by endpoint and error code.",
+    "trading_bot_order_errors_total": "Failed orders by order type and error code.",
+    "trading_bot_trigger_dispatch_seconds": "Time from the price tick that fired a client-side trigger to its order response.",
+    "trading_bot_execution_jitter_seconds": "Delay between an execution algo's scheduled wake-up and the start of its work.",
+    "trading_bot_router_orders_total": "Orders the OrderRouter sent to each account's worker.",
+    "trading_bot_order_book_resyncs_total": "Local order book rebuilds after a gap in the diff-depth stream, by symbol.",
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile by linear interpolation inside the matching bucket."""
+        if self.count == 0:
+            return 0.0
+        return bucket_quantile(q, list(self.buckets) + [float("inf")], self.counts)
+
+
+def bucket_quantile(q: float, bounds, counts) -> float:
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if seen + count >= rank and count:
+            lower = bounds[i - 1] if i > 0 else 0.0
+            upper = bounds[i]
+            if upper == float("inf"):
+                return lower
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return bounds[-2] if len(bounds) > 1 else 0.0
+
+
+class _Span:
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, (time.perf_counter_ns() - self.start) / 1e9, self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Histograms and counters keyed by metric name and a sorted tuple of label pairs."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, labels: tuple = ()):
+        key = (name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, labels: tuple = (), amount: float = 1):
+        key = (name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def span(self, name: str, **labels) -> _Span:
+        """Context manager that records the elapsed time of its block into a histogram."""
+        return _Span(self, name, tuple(sorted(labels.items())))
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            histograms = {key: (h.buckets, list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# HELP {name} {HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), (buckets, counts, total, count) in sorted(histograms.items()):
+            declare(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        for (name, labels), value in sorted(counters.items()):
+            declare(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def parse_prometheus(text: str) -> dict:
+    """Parses Prometheus text exposition into {(metric, labels tuple): value}."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        series, _, value = line.rpartition(" ")
+        name, _, label_text = series.partition("{")
+        labels = []
+        for pair in label_text.rstrip("}").split(","):
+            if "=" in pair:
+                key, _, label_value = pair.partition("=")
+                labels.append((key, label_value.strip('"')))
+        samples[(name, tuple(labels))] = float(value)
+    return samples
+
+
+# Process-wide registry used by BinanceClient and OrderManager.
+metrics = MetricsRegistry()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _handler_class():
+    # http.server costs ~30ms to import; only processes that serve metrics pay for it.
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in {"/metrics", ""}:
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _MetricsHandler
+
+
+def start_metrics_server(port: int = None, host: str = "127.0.0.1"):
+    """Serves the registry at http://host:port/metrics from a daemon thread. Idempotent."""
+    from http.server import ThreadingHTTPServer
+
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port or DEFAULT_METRICS_PORT), _handler_class())
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+            logger.info(f"Metrics available at http://{host}:{_server.server_port}/metrics")
+    return _server
@@ -0,0 +1,486 @@
+import json
+import math
+import random
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from binance.exceptions import BinanceAPIException
+
+DEFAULT_PRICES = {"BTCUSDT": 65000.0, "ETHUSDT": 3500.0, "SOLUSDT": 150.0, "BNBUSDT": 600.0}
+DEFAULT_BALANCE = 10000.0
+# Synthetic depth: one level per basis point away from the mark, each worth this much notional times its distance.
+DEPTH_STEP = 0.0001
+DEPTH_LEVEL_NOTIONAL = 25000.0
+
+_FINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED"}
+# Conditional types and the order type they become once triggered.
+_TRIGGERED_TYPE = {
+    "STOP": "LIMIT",
+    "TAKE_PROFIT": "LIMIT",
+    "STOP_MARKET": "MARKET",
+    "TAKE_PROFIT_MARKET": "MARKET",
+    "TRAILING_STOP_MARKET": "MARKET",
+}
+
+
+class _Book:
+    """Price-time priority book for one symbol. Each level is a FIFO deque of resting orders."""
+
+    __slots__ = ("bids", "asks", "bid_prices", "ask_prices", "mark", "conditionals")
+
+    def __init__(self, mark: float):
+        self.bids = {}
+        self.asks = {}
+        self.bid_prices = []  # ascending, best bid last
+        self.ask_prices = []  # ascending, best ask first
+        self.mark = mark
+        self.conditionals = []
+
+
+def _api_error(status_code: int, code: int, msg: str) -> BinanceAPIException:
+    return BinanceAPIException(None, status_code, json.dumps({"code": code, "msg": msg}))
+
+
+class MockExchange:
+    """
+    In-process stand-in for the python-binance futures Client.
+
+    Orders match against resting orders with price-time priority; whatever the book cannot
+    fill trades against unlimited synthetic liquidity at the symbol's mark price, which tests
+    move with set_price(). latency (seconds, or a (min, max) range), error_rate and
+    rate_limit_rate inject delays, -1001 internal errors and -1003 / HTTP 429 responses.
+    """
+
+    def __init__(self, prices: dict = None, balance: float = DEFAULT_BALANCE, latency=0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: int = None):
+        self.books = {symbol: _Book(price) for symbol, price in (prices or DEFAULT_PRICES).items()}
+        self.base_prices = dict(prices or DEFAULT_PRICES)  # anchors the synthetic kline history
+        self.orders = {}
+        self.client_ids = {}
+        self.balance = balance
+        self.positions = {}  # symbol -> signed quantity
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._next_id = 1
+        self._depth_update_id = 0
+        self._user_listeners = []
+
+    # --- python-binance Client surface ---
+
+    def ping(self):
+        return {}
+
+    futures_ping = ping
+
+    def close_connection(self):
+        pass
+
+    def futures_exchange_info(self):
+        self._simulate()
+        symbols = []
+        for symbol in self.books:
+            symbols.append({
+                "symbol": symbol,
+                "status": "TRADING",
+                "filters": [
+                    {"filterType": "PRICE_FILTER", "minPrice": "0.01", "maxPrice": "10000000", "tickSize": "0.01"},
+                    {"filterType": "LOT_SIZE", "minQty": "0.001", "maxQty": "10000", "stepSize": "0.001"},
+                    {"filterType": "MIN_NOTIONAL", "notional": "5"},
+                ],
+            })
+        return {"symbols": symbols}
+
+    def futures_symbol_ticker(self, symbol=None, **params):
+        self._simulate()
+        if symbol is None:
+            return [{"symbol": s, "price": repr(book.mark)} for s, book in self.books.items()]
+        return {"symbol": symbol, "price": repr(self._book(symbol).mark)}
+
+    def futures_order_book(self, symbol, limit=500, **params):
+        """Resting orders aggregated per price on top of a synthetic ladder around the mark price."""
+        self._simulate()
+        limit = int(limit)
+        with self._lock:
+            book = self._book(symbol)
+            mark = book.mark
+            bids = {}
+            asks = {}
+            for i in range(1, limit + 1):
+                quantity = round(i * DEPTH_LEVEL_NOTIONAL / mark, 3)
+                bid = round(mark * (1 - DEPTH_STEP * i), 2)
+                ask = round(mark * (1 + DEPTH_STEP * i), 2)
+                bids[bid] = bids.get(bid, 0.0) + quantity
+                asks[ask] = asks.get(ask, 0.0) + quantity
+            for levels, resting in ((bids, book.bids), (asks, book.asks)):
+                for price, queue in resting.items():
+                    levels[price] = levels.get(price, 0.0) + sum(o["origQty"] - o["executedQty"] for o in queue)
+            self._depth_update_id += 1
+            update_id = self._depth_update_id
+        return {
+            "lastUpdateId": update_id,
+            "E": int(time.time() * 1000),
+            "T": int(time.time() * 1000),
+            "bids": [[repr(p), repr(q)] for p, q in sorted(bids.items(), reverse=True)[:limit]],
+            "asks": [[repr(p), repr(q)] for p, q in sorted(asks.items())[:limit]],
+        }
+
+    def futures_klines(self, symbol, interval="1m", startTime=None, endTime=None, limit=500, **params):
+        """Synthetic candles that depend only on symbol, interval and open time, so pages always agree."""
+        from bot.klines import INTERVAL_MS
+
+        self._simulate()
+        self._book(symbol)
+        step = INTERVAL_MS.get(interval)
+        if step is None:
+            raise _api_error(400, -1120, "Invalid interval.")
+        limit = min(int(limit), 1500)
+        now = int(time.time() * 1000)
+        end = min(int(endTime), now) if endTime is not None else now
+        if startTime is None:
+            start = (end // step - limit + 1) * step
+        else:
+            start = -(-int(startTime) // step) * step
+
+        base = self.base_prices[symbol]
+        rows = []
+        open_time = start
+        while open_time <= end and len(rows) < limit:
+            rows.append(self._kline(symbol, base, open_time, step))
+            open_time += step
+        return rows
+
+    def futures_account_balance(self, **params):
+        self._simulate()
+        balance = repr(self.balance)
+        return [{"asset": "USDT", "balance": balance, "availableBalance": balance}]
+
+    def futures_position_information(self, symbol=None, **params):
+        self._simulate()
+        symbols = [symbol] if symbol else list(self.positions)
+        return [
+            {"symbol": s, "positionAmt": repr(self.positions.get(s, 0.0)), "markPrice": repr(self._book(s).mark)}
+            for s in symbols
+        ]
+
+    def futures_create_order(self, **params):
+        self._simulate()
+        with self._lock:
+            return self._create(params)
+
+    def futures_place_batch_order(self, batchOrders, **params):
+        self._simulate()
+        if isinstance(batchOrders, str):
+            batchOrders = json.loads(batchOrders)
+        results = []
+        with self._lock:
+            for order in batchOrders:
+                try:
+                    results.append(self._create(order))
+                except BinanceAPIException as e:
+                    results.append({"code": e.code, "msg": e.message})
+        return results
+
+    def futures_get_order(self, symbol, orderId=None, origClientOrderId=None, **params):
+        self._simulate()
+        return self._public(self._find(orderId, origClientOrderId))
+
+    def futures_get_open_orders(self, symbol=None, **params):
+        self._simulate()
+        return [
+            self._public(order) for order in self.orders.values()
+            if order["status"] not in _FINAL_STATUSES and (symbol is None or order["symbol"] == symbol)
+        ]
+
+    def futures_cancel_order(self, symbol, orderId=None, origClientOrderId=None, **params):
+        self._simulate()
+        with self._lock:
+            order = self._find(orderId, origClientOrderId)
+            if order["status"] in _FINAL_STATUSES:
+                raise _api_error(400, -2011, "Unknown order sent.")
+            self._remove_resting(order)
+            order["status"] = "CANCELED"
+            order["updateTime"] = int(time.time() * 1000)
+            self._emit(order, "CANCELED")
+            return self._public(order)
+
+    def futures_cancel_all_open_orders(self, symbol, **params):
+        self._simulate()
+        with self._lock:
+            for order in list(self.orders.values()):
+                if order["symbol"] == symbol and order["status"] not in _FINAL_STATUSES:
+                    self._remove_resting(order)
+                    order["status"] = "CANCELED"
+                    self._emit(order, "CANCELED")
+        return {"code": 200, "msg": "The operation of cancel all open order is done."}
+
+    def add_user_listener(self, callback):
+        """
+        Calls callback(event) with a user-data-stream ORDER_TRADE_UPDATE for every order change,
+        standing in for the futures user socket. Runs on the calling thread with the exchange
+        locked, so callbacks must not call back into the exchange.
+        """
+        self._user_listeners = self._user_listeners + [callback]
+
+    # --- simulation controls ---
+
+    def set_price(self, symbol: str, price: float):
+        """Moves the mark price and fires any conditional orders it crosses."""
+        with self._lock:
+            book = self._book(symbol)
+            book.mark = price
+            if not book.conditionals:
+                return
+
+            pending = []
+            for order in book.conditionals:
+                if order["type"] == "TRAILING_STOP_MARKET":
+                    self._trail(order, price)
+                if self._is_triggered(order, price):
+                    order["_working_type"] = _TRIGGERED_TYPE[order["type"]]
+                    order["updateTime"] = int(time.time() * 1000)
+                    self._match(book, order)
+                else:
+                    pending.append(order)
+            book.conditionals = pending
+
+    # --- internals ---
+
+    def _simulate(self):
+        latency = self.latency
+        if latency:
+            time.sleep(self._random.uniform(*latency) if isinstance(latency, tuple) else latency)
+        if self.rate_limit_rate and self._random.random() < self.rate_limit_rate:
+            raise _api_error(429, -1003, "Too many requests; current limit is 2400 request weight per 1 MINUTE.")
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise _api_error(500, -1001, "Internal error; unable to process your request. Please try again.")
+
+    def _book(self, symbol: str) -> _Book:
+        book = self.books.get(symbol)
+        if book is None:
+            raise _api_error(400, -1121, "Invalid symbol.")
+        return book
+
+    def _find(self, order_id, client_order_id) -> dict:
+        if order_id is None and client_order_id is not None:
+            order_id = self.client_ids.get(client_order_id)
+        order = self.orders.get(int(order_id)) if order_id is not None else None
+        if order is None:
+            raise _api_error(400, -2013, "Order does not exist.")
+        return order
+
+    def _create(self, params: dict) -> dict:
+        symbol = params.get("symbol")
+        book = self._book(symbol)
+        order_type = params.get("type")
+        side = params.get("side")
+        if side not in ("BUY", "SELL"):
+            raise _api_error(400, -1102, "Mandatory parameter 'side' was not sent, was empty/null, or malformed.")
+        try:
+            quantity = float(params["quantity"])
+        except (KeyError, TypeError, ValueError):
+            raise _api_error(400, -1102, "Mandatory parameter 'quantity' was not sent, was empty/null, or malformed.")
+
+        price = params.get("price")
+        stop_price = params.get("stopPrice")
+        if order_type in ("LIMIT", "STOP", "TAKE_PROFIT") and price is None:
+            raise _api_error(400, -1102, "Mandatory parameter 'price' was not sent, was empty/null, or malformed.")
+        if order_type in ("STOP", "TAKE_PROFIT", "STOP_MARKET", "TAKE_PROFIT_MARKET") and stop_price is None:
+            raise _api_error(400, -1102, "Mandatory parameter 'stopPrice' was not sent, was empty/null, or malformed.")
+        if order_type not in ("MARKET", "LIMIT") and order_type not in _TRIGGERED_TYPE:
+            raise _api_error(400, -1116, "Invalid orderType.")
+
+        client_order_id = params.get("newClientOrderId")
+        if client_order_id is not None and client_order_id in self.client_ids:
+            raise _api_error(400, -4015, "Client order id is not valid.")
+
+        order = {
+            "orderId": self._next_id,
+            "symbol": symbol,
+            "status": "NEW",
+            "clientOrderId": client_order_id or f"mock-{self._next_id}",
+            "price": float(price) if price is not None else 0.0,
+            "avgPrice": 0.0,
+            "origQty": quantity,
+            "executedQty": 0.0,
+            "cumQuote": 0.0,
+            "timeInForce": params.get("timeInForce", "GTC"),
+            "type": order_type,
+            "side": side,
+            "stopPrice": float(stop_price) if stop_price is not None else 0.0,
+            "updateTime": int(time.time() * 1000),
+        }
+        if order_type in _TRIGGERED_TYPE:
+            if order_type == "TRAILING_STOP_MARKET":
+                order["_callback"] = float(params.get("callbackRate", 1)) / 100
+                order["_extreme"] = book.mark
+                self._trail(order, book.mark)
+            if self._is_triggered(order, book.mark):
+                raise _api_error(400, -2021, "Order would immediately trigger.")
+
+        # Only an accepted order takes an id and is registered; a rejected one leaves no trace.
+        self._next_id += 1
+        self.orders[order["orderId"]] = order
+        self.client_ids[order["clientOrderId"]] = order["orderId"]
+        self._emit(order, "NEW")
+        if order_type in _TRIGGERED_TYPE:
+            book.conditionals.append(order)
+        else:
+            order["_working_type"] = order_type
+            self._match(book, order)
+
+        return self._public(order)
+
+    @staticmethod
+    def _public(order: dict) -> dict:
+        return {
+            "orderId": order["orderId"],
+            "symbol": order["symbol"],
+            "status": order["status"],
+            "clientOrderId": order["clientOrderId"],
+            "price": repr(order["price"]),
+            "avgPrice": repr(order["avgPrice"]),
+            "origQty": repr(order["origQty"]),
+            "executedQty": repr(order["executedQty"]),
+            "cumQuote": repr(order["cumQuote"]),
+            "timeInForce": order["timeInForce"],
+            "type": order["type"],
+            "side": order["side"],
+            "stopPrice": repr(order["stopPrice"]),
+            "updateTime": order["updateTime"],
+        }
+
+    @staticmethod
+    def _synthetic_price(symbol: str, base: float, t: int) -> float:
+        # Two slow waves plus a little per-candle noise, all a pure function of time.
+        phase = sum(map(ord, symbol)) % 97
+        noise = ((t // 1000 * 2654435761 + phase) % 4294967296) / 4294967296 - 0.5
+        return base * (1 + 0.08 * math.sin(t / 86_400_000 + phase) + 0.02 * math.sin(t / 3_600_000 + phase) + 0.002 * noise)
+
+    def _kline(self, symbol: str, base: float, open_time: int, step: int) -> list:
+        open_price = self._synthetic_price(symbol, base, open_time)
+        close_price = self._synthetic_price(symbol, base, open_time + step)
+        spread = abs(close_price - open_price) * 0.5 + base * 0.0005
+        volume = 10 + (open_time // 1000 * 40503) % 1000 / 10
+        taker = volume * 0.5
+        mid = (open_price + close_price) / 2
+        return [
+            open_time, repr(open_price), repr(max(open_price, close_price) + spread), repr(min(open_price, close_price) - spread),
+            repr(close_price), repr(volume), open_time + step - 1, repr(volume * mid),
+            int(volume * 7), repr(taker), repr(taker * mid), "0",
+        ]
+
+    @staticmethod
+    def _trail(order: dict, price: float):
+        if order["side"] == "SELL":
+            order["_extreme"] = max(order["_extreme"], price)
+            order["stopPrice"] = order["_extreme"] * (1 - order["_callback"])
+        else:
+            order["_extreme"] = min(order["_extreme"], price)
+            order["stopPrice"] = order["_extreme"] * (1 + order["_callback"])
+
+    @staticmethod
+    def _is_triggered(order: dict, price: float) -> bool:
+        stop = order["stopPrice"]
+        # Stops fire when price moves against the position, take-profits when it moves in favour.
+        if order["type"].startswith("TAKE_PROFIT"):
+            return price <= stop if order["side"] == "BUY" else price >= stop
+        return price >= stop if order["side"] == "BUY" else price <= stop
+
+    def _fill(self, order: dict, quantity: float, price: float):
+        executed = order["executedQty"] + quantity
+        order["cumQuote"] += quantity * price
+        order["executedQty"] = executed
+        order["avgPrice"] = order["cumQuote"] / executed
+        order["status"] = "FILLED" if executed >= order["origQty"] - 1e-12 else "PARTIALLY_FILLED"
+        signed = quantity if order["side"] == "BUY" else -quantity
+        symbol = order["symbol"]
+        self.positions[symbol] = self.positions.get(symbol, 0.0) + signed
+        self.balance -= signed * price
+        self._emit(order, "TRADE", quantity, price)
+        if self._user_listeners:
+            self._notify({"e": "ACCOUNT_UPDATE", "E": int(time.time() * 1000), "a": {
+                "B": [{"a": "USDT", "wb": repr(self.balance), "cw": repr(self.balance)}],
+                "P": [{"s": symbol, "pa": repr(self.positions[symbol]), "ep": "0", "up": "0", "ps": "BOTH"}],
+            }})
+
+    def _emit(self, order: dict, execution_type: str, last_qty: float = 0.0, last_price: float = 0.0):
+        if not self._user_listeners:
+            return
+        now = int(time.time() * 1000)
+        event = {"e": "ORDER_TRADE_UPDATE", "E": now, "T": now, "o": {
+            "s": order["symbol"], "c": order["clientOrderId"], "S": order["side"], "o": order["type"],
+            "f": order["timeInForce"], "q": repr(order["origQty"]), "p": repr(order["price"]),
+            "ap": repr(order["avgPrice"]), "sp": repr(order["stopPrice"]), "x": execution_type,
+            "X": order["status"], "i": order["orderId"], "l": repr(last_qty), "z": repr(order["executedQty"]),
+            "L": repr(last_price), "T": now, "t": 0, "n": "0", "N": "USDT", "rp": "0", "ps": "BOTH",
+        }}
+        self._notify(event)
+
+    def _notify(self, event: dict):
+        for listener in self._user_listeners:
+            try:
+                listener(event)
+            except Exception:
+                pass  # a broken listener must not break matching
+
+    def _match(self, book: _Book, order: dict):
+        buy = order["side"] == "BUY"
+        limit = order["price"] if order["_working_type"] == "LIMIT" else None
+        levels = book.asks if buy else book.bids
+        prices = book.ask_prices if buy else book.bid_prices
+        remaining = order["origQty"] - order["executedQty"]
+
+        while remaining > 1e-12 and prices:
+            best = prices[0] if buy else prices[-1]
+            if limit is not None and (best > limit if buy else best < limit):
+                break
+            queue = levels[best]
+            resting = queue[0]
+            quantity = min(remaining, resting["origQty"] - resting["executedQty"])
+            self._fill(order, quantity, best)
+            self._fill(resting, quantity, best)
+            remaining -= quantity
+            if resting["status"] == "FILLED":
+                queue.popleft()
+                if not queue:
+                    del levels[best]
+                    if buy:
+                        prices.pop(0)
+                    else:
+                        prices.pop()
+
+        if remaining > 1e-12:
+            mark = book.mark
+            if limit is None or (mark <= limit if buy else mark >= limit):
+                self._fill(order, remaining, mark)
+            else:
+                self._rest(book, order, limit)
+
+    @staticmethod
+    def _rest(book: _Book, order: dict, price: float):
+        levels = book.bids if order["side"] == "BUY" else book.asks
+        queue = levels.get(price)
+        if queue is None:
+            queue = levels[price] = deque()
+            insort(book.bid_prices if order["side"] == "BUY" else book.ask_prices, price)
+        queue.append(order)
+
+    def _remove_resting(self, order: dict):
+        book = self._book(order["symbol"])
+        if order in book.conditionals:
+            book.conditionals.remove(order)
+            return
+        buy = order["side"] == "BUY"
+        levels = book.bids if buy else book.asks
+        queue = levels.get(order["price"])
+        if queue is None or order not in queue:
+            return
+        queue.remove(order)
+        if not queue:
+            del levels[order["price"]]
+            prices = book.bid_prices if buy else book.ask_prices
+            del prices[bisect_left(prices, order["price"])]
@@ -0,0 +1,327 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from binance import ThreadedWebsocketManager
+from bot.logging_config import setup_logger
+from bot.metrics import metrics
+
+logger = setup_logger(__name__)
+
+DEFAULT_DEPTH_LIMIT = int(os.getenv("ORDER_BOOK_DEPTH_LIMIT", "1000"))
+# Seconds without a depth event before the stream is considered dead and reconnected.
+DEFAULT_STALE_AFTER = float(os.getenv("ORDER_BOOK_STALE_AFTER", "10"))
+# Diffs kept while a snapshot is in flight; a snapshot that takes longer than this is resynced again.
+MAX_BUFFERED_EVENTS = 10000
+
+ORDER_BOOK_RESYNCS_METRIC = "trading_bot_order_book_resyncs_total"
+
+
+class _Levels:
+    """
+    One side of the book as parallel sorted lists with the best level last.
+
+    Bids are keyed by price and asks by -price, so the touch is always index -1 and the
+    updates that dominate the stream (close to the touch) insert and delete near the end.
+    """
+
+    __slots__ = ("sign", "keys", "quantities")
+
+    def __init__(self, sign: int):
+        self.sign = sign
+        self.keys = []
+        self.quantities = []
+
+    def __len__(self):
+        return len(self.keys)
+
+    def load(self, rows):
+        levels = sorted((self.sign * float(price), float(quantity)) for price, quantity in rows if float(quantity) > 0)
+        self.keys = [key for key, _ in levels]
+        self.quantities = [quantity for _, quantity in levels]
+
+    def set(self, price: float, quantity: float):
+        """Sets a level's total quantity; zero removes the level."""
+        keys = self.keys
+        key = self.sign * price
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            if quantity > 0:
+                self.quantities[i] = quantity
+            else:
+                del keys[i]
+                del self.quantities[i]
+        elif quantity > 0:
+            keys.insert(i, key)
+            self.quantities.insert(i, quantity)
+
+    def best(self):
+        if not self.keys:
+            return None
+        return self.sign * self.keys[-1], self.quantities[-1]
+
+    def top(self, count: int) -> list:
+        """[(price, quantity)] for the best count levels, best first."""
+        keys = self.keys[-count:]
+        quantities = self.quantities[-count:]
+        return [(self.sign * key, quantity) for key, quantity in zip(reversed(keys), reversed(quantities))]
+
+    def walk(self, quantity: float):
+        """Takes quantity from the touch outwards. Returns (filled, notional, worst price, levels used)."""
+        keys = self.keys
+        quantities = self.quantities
+        remaining = quantity
+        notional = 0.0
+        worst = None
+        i = len(keys) - 1
+        while remaining > 1e-12 and i >= 0:
+            worst = self.sign * keys[i]
+            take = min(remaining, quantities[i])
+            notional += take * worst
+            remaining -= take
+            i -= 1
+        return quantity - max(remaining, 0.0), notional, worst, len(keys) - 1 - i
+
+    def quantity_through(self, price: float) -> float:
+        """Total quantity at price or better."""
+        return sum(self.quantities[bisect_left(self.keys, self.sign * price):])
+
+
+class LocalOrderBook:
+    """
+    L2 order book for one futures symbol, kept current from the <symbol>@depth@100ms diff stream.
+
+    Bootstraps from a REST depth snapshot and applies depthUpdate events on top of it, following
+    Binance's rules: events older than the snapshot are dropped, the first applied event must
+    straddle the snapshot's lastUpdateId, and each later event's pu must equal the previous u.
+    A gap marks the book out of sync; the watchdog rebuilds it from a fresh snapshot while the
+    stream keeps buffering, then replays the buffered diffs.
+    """
+
+    def __init__(self, raw_client, symbol: str, testnet=True, depth_limit=None, speed="100ms", stale_after=None):
+        self.client = raw_client
+        self.symbol = symbol.upper()
+        self.testnet = testnet
+        self.depth_limit = depth_limit or DEFAULT_DEPTH_LIMIT
+        self.speed = speed
+        self.stale_after = stale_after or DEFAULT_STALE_AFTER
+        self.bids = _Levels(1)
+        self.asks = _Levels(-1)
+        self.last_update_id = None
+        self.synced = False
+        self.streaming = False
+        self.connected = False
+        self.updated_at = None  # monotonic time of the last snapshot or applied diff
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._first_event = True
+        self._twm = None
+        self._running = False
+        self._needs_resync = False
+        self._needs_restart = False
+        self._last_message = 0.0
+        self._watchdog = None
+
+    # --- lifecycle ---
+
+    def start(self, stream: bool = True):
+        """Takes a REST snapshot and, with stream=True, follows the diff-depth stream from then on."""
+        self._running = True
+        if stream:
+            self.streaming = True
+            # Subscribe first so the diffs published while the snapshot is fetched are buffered.
+            self._connect()
+            self._watchdog = threading.Thread(target=self._watch, name=f"order-book-{self.symbol.lower()}", daemon=True)
+            self._watchdog.start()
+        self.resync()
+
+    def stop(self):
+        self._running = False
+        self._disconnect()
+
+    def resync(self):
+        """Rebuilds the book from a REST snapshot, then replays the diffs buffered meanwhile."""
+        with self._lock:
+            self.synced = False
+        snapshot = self.client.futures_order_book(symbol=self.symbol, limit=self.depth_limit)
+
+        with self._lock:
+            self.bids.load(snapshot["bids"])
+            self.asks.load(snapshot["asks"])
+            self.last_update_id = snapshot["lastUpdateId"]
+            self.updated_at = time.monotonic()
+            self.synced = True
+            self._first_event = True
+            buffered, self._buffer = self._buffer, []
+            for event in buffered:
+                if not self._apply(event):
+                    break
+        logger.debug("Order book %s synced at update %s (%s buffered diffs).", self.symbol, self.last_update_id, len(buffered))
+
+    # --- lookups ---
+
+    def best_bid(self):
+        """(price, quantity) of the best bid, or None when the side is empty."""
+        with self._lock:
+            return self.bids.best()
+
+    def best_ask(self):
+        with self._lock:
+            return self.asks.best()
+
+    def mid(self):
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (bid[0] + ask[0]) / 2
+
+    def spread(self):
+        with self._lock:
+            bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return ask[0] - bid[0]
+
+    def depth(self, levels: int = 20) -> dict:
+        """The best levels per side, best first, as {"bids": [(price, qty)], "asks": [...], ...}."""
+        with self._lock:
+            return {
+                "symbol": self.symbol,
+                "bids": self.bids.top(levels),
+                "asks": self.asks.top(levels),
+                "last_update_id": self.last_update_id,
+                "synced": self.synced,
+            }
+
+    def cost_to_fill(self, side: str, quantity: float) -> dict:
+        """
+        What a market order of quantity would pay walking the book: BUY takes asks, SELL takes bids.
+
+        filled is less than quantity when the book is too thin; avg_price is None if nothing fills.
+        """
+        with self._lock:
+            levels = self.asks if side.upper() == "BUY" else self.bids
+            filled, notional, worst, used = levels.walk(float(quantity))
+            synced = self.synced
+        return {
+            "symbol": self.symbol,
+            "side": side.upper(),
+            "quantity": float(quantity),
+            "filled": filled,
+            "notional": notional,
+            "avg_price": notional / filled if filled else None,
+            "worst_price": worst,
+            "levels": used,
+            "synced": synced,
+        }
+
+    def quantity_through(self, side: str, price: float) -> float:
+        """Quantity a BUY (asks) or SELL (bids) order limited at price could take immediately."""
+        with self._lock:
+            levels = self.asks if side.upper() == "BUY" else self.bids
+            return levels.quantity_through(float(price))
+
+    # --- stream handling ---
+
+    def apply_event(self, msg: dict):
+        data = msg.get("data", msg)
+        event = data.get("e")
+        if event == "error":
+            logger.error(f"Depth stream error for {self.symbol}: {data.get('m')}")
+            self.connected = False
+            self._needs_restart = True
+            return
+        if event != "depthUpdate":
+            return
+
+        self._last_message = time.monotonic()
+        self.connected = True
+        with self._lock:
+            if self.synced:
+                self._apply(data)
+            elif len(self._buffer) < MAX_BUFFERED_EVENTS:
+                self._buffer.append(data)
+            else:
+                # The snapshot is too far behind to catch up from; start over with a fresh one.
+                self._buffer = [data]
+                self._needs_resync = True
+
+    def _apply(self, event: dict) -> bool:
+        """Applies one diff under the lock. Returns False (and schedules a resync) on a gap."""
+        if event["u"] < self.last_update_id:
+            return True  # already part of the snapshot
+        if self._first_event:
+            if event["U"] > self.last_update_id:
+                return self._gap(event, f"first diff starts at {event['U']}, snapshot is at {self.last_update_id}")
+            self._first_event = False
+        elif event.get("pu") != self.last_update_id:
+            return self._gap(event, f"diff follows {event.get('pu')}, book is at {self.last_update_id}")
+
+        for price, quantity in event["b"]:
+            self.bids.set(float(price), float(quantity))
+        for price, quantity in event["a"]:
+            self.asks.set(float(price), float(quantity))
+        self.last_update_id = event["u"]
+        self.updated_at = time.monotonic()
+        return True
+
+    def _gap(self, event: dict, reason: str) -> bool:
+        logger.warning(f"Order book {self.symbol} out of sync ({reason}), resyncing from a snapshot.")
+        metrics.inc(ORDER_BOOK_RESYNCS_METRIC, (("symbol", self.symbol),))
+        self.synced = False
+        self._buffer = [event]
+        self._needs_resync = True
+        return False
+
+    def _stream(self) -> str:
+        return f"{self.symbol.lower()}@depth@{self.speed}" if self.speed else f"{self.symbol.lower()}@depth"
+
+    def _connect(self):
+        try:
+            self._twm = ThreadedWebsocketManager(testnet=self.testnet)
+            self._twm.daemon = True
+            self._twm.start()
+            self._twm.start_futures_multiplex_socket(callback=self.apply_event, streams=[self._stream()])
+            self._last_message = time.monotonic()
+            logger.info(f"Order book subscribed to {self._stream()}.")
+        except Exception as e:
+            logger.error(f"Failed to start depth stream for {self.symbol}: {e}")
+            self.connected = False
+            self._needs_restart = True
+
+    def _disconnect(self):
+        self.connected = False
+        if self._twm is not None:
+            try:
+                self._twm.stop()
+            except Exception as e:
+                logger.error(f"Error stopping depth stream for {self.symbol}: {e}")
+            self._twm = None
+
+    def _watch(self):
+        while self._running:
+            time.sleep(1)
+            quiet_for = time.monotonic() - self._last_message
+            if quiet_for > self.stale_after:
+                logger.warning(f"No depth updates for {self.symbol} in {quiet_for:.1f}s, reconnecting.")
+                self._needs_restart = True
+
+            if self._needs_restart and self._running:
+                self._needs_restart = False
+                with self._lock:
+                    # Diffs from the old connection cannot be stitched to the new one.
+                    self.synced = False
+                    self._buffer = []
+                self._disconnect()
+                self._connect()
+                self._needs_resync = True
+
+            if self._needs_resync and self._running:
+                self._needs_resync = False
+                try:
+                    self.resync()
+                except Exception as e:
+                    logger.error(f"Order book resync failed for {self.symbol}: {e}")
+                    self._needs_resync = True
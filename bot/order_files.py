@@ -0,0 +1,36 @@
+import csv
+import json
+import os
+
+ORDER_FIELDS = ("type", "symbol", "side", "quantity", "price", "stop_price", "callback_rate", "activation_price", "reduce_only")
+
+
+def iter_order_file(path: str):
+    """
+    Yields order spec dicts from a CSV (with a header row) or JSONL file, one line at a time.
+
+    Empty CSV cells and blank lines are skipped, so the file is never loaded into memory whole.
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    with open(path, newline="") as f:
+        if extension in {".jsonl", ".ndjson", ".json"}:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        else:
+            for row in csv.DictReader(f):
+                yield {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+
+
+def iter_chunks(iterable, size: int):
+    """Groups an iterable into lists of at most size items."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
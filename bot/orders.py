@@ -1,125 +1,556 @@
+import itertools
+import os
+import random
+import time
+import uuid
+from typing import TYPE_CHECKING
 from bot.logging_config import setup_logger
-from bot.client import BinanceClient
-from bot.validators import validate_symbol, validate_side, validate_quantity, validate_price, ValidationError
-from binance.exceptions import BinanceAPIException, BinanceRequestException
+from bot.metrics import metrics
+from bot.exchange_info import CACHE_PATH, load_exchange_filters
+from bot.journal import OrderJournal, UNKNOWN as UNKNOWN_STATUS, make_client_order_id
+from bot.validators import (
+    validate_symbol, validate_side, validate_quantity, validate_price, validate_order_type, validate_notional,
+    validate_callback_rate, get_exchange_filters, ValidationError,
+)
+from decimal import Decimal
+
+# python-binance and requests are imported where they are needed, so validating and building
+# orders never loads the network stack.
+if TYPE_CHECKING:
+    from bot.client import BinanceClient
 
 logger = setup_logger(__name__)
 
+ORDER_STAGE_METRIC = "trading_bot_order_stage_seconds"
+ORDER_ERRORS_METRIC = "trading_bot_order_errors_total"
+
+# Binance Futures accepts at most this many orders per batchOrders request.
+MAX_BATCH_SIZE = 5
+
+# Retries of an order whose outcome is unknown (timeouts, 5xx, -1001/-1007), bounded by attempts and time.
+ORDER_MAX_RETRIES = int(os.getenv("ORDER_MAX_RETRIES", "3"))
+ORDER_RETRY_DEADLINE = float(os.getenv("ORDER_RETRY_DEADLINE", "10"))
+# -1001 DISCONNECTED and -1007 TIMEOUT mean the request may or may not have been executed.
+AMBIGUOUS_ERROR_CODES = {-1001, -1007}
+
+
+def _format_number(value: float) -> str:
+    # batchOrders values are sent as JSON strings; avoid scientific notation for small quantities.
+    return format(Decimal(repr(value)), "f")
+
+
+class OrderSpec:
+    """One order to place. Field names follow the order-file columns (snake_case)."""
+
+    __slots__ = ("type", "symbol", "side", "quantity", "price", "stop_price", "callback_rate", "activation_price", "reduce_only")
+
+    def __init__(self, type: str = "MARKET", symbol: str = None, side: str = None, quantity=None, price=None,
+                 stop_price=None, callback_rate=None, activation_price=None, reduce_only: bool = False):
+        self.type = type
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price
+        self.stop_price = stop_price
+        self.callback_rate = callback_rate
+        self.activation_price = activation_price
+        self.reduce_only = reduce_only
+
+    @classmethod
+    def from_dict(cls, order: dict) -> "OrderSpec":
+        """Builds a spec from an order dict; Binance's camelCase names are accepted too."""
+        get = order.get
+        reduce_only = get("reduce_only", get("reduceOnly", False))
+        return cls(
+            get("type") or "MARKET", get("symbol"), get("side"), get("quantity"), get("price"),
+            get("stop_price", get("stopPrice")), get("callback_rate", get("callbackRate")),
+            get("activation_price", get("activationPrice")),
+            reduce_only is True or str(reduce_only).strip().lower() in {"true", "1"},
+        )
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__ if getattr(self, slot) not in (None, False)}
+
+
+def _float(value, fallback=None):
+    if value is None or value == "":
+        value = fallback
+    return None if value is None else float(value)
+
+
+class OrderResult:
+    """
+    An order as the exchange reported it, with its fill state.
+
+    get() and to_dict() use Binance's field names, so code written against the old
+    {"orderId", "status", "avgPrice"} dicts keeps working.
+    """
+
+    __slots__ = ("order_id", "client_order_id", "symbol", "side", "type", "status", "quantity",
+                 "executed_qty", "cum_quote", "avg_price", "price", "stop_price", "update_time")
+
+    _KEYS = {
+        "orderId": "order_id", "clientOrderId": "client_order_id", "symbol": "symbol", "side": "side",
+        "type": "type", "status": "status", "origQty": "quantity", "executedQty": "executed_qty",
+        "cumQuote": "cum_quote", "avgPrice": "avg_price", "price": "price", "stopPrice": "stop_price",
+        "updateTime": "update_time",
+    }
+
+    @classmethod
+    def from_response(cls, response: dict, params: dict = None) -> "OrderResult":
+        """Reads an order response; fields the response leaves out are taken from the request params."""
+        params = params or {}
+        get = response.get
+        result = cls.__new__(cls)
+        result.order_id = get("orderId")
+        result.client_order_id = get("clientOrderId") or params.get("newClientOrderId")
+        result.symbol = get("symbol") or params.get("symbol")
+        result.side = get("side") or params.get("side")
+        result.type = get("type") or params.get("type")
+        result.status = get("status")
+        result.quantity = _float(get("origQty"), params.get("quantity"))
+        result.executed_qty = _float(get("executedQty"), 0.0)
+        result.cum_quote = _float(get("cumQuote"), 0.0)
+        result.avg_price = _float(get("avgPrice") or get("price"))
+        result.price = _float(get("price"), params.get("price"))
+        result.stop_price = _float(get("stopPrice"), params.get("stopPrice"))
+        result.update_time = get("updateTime")
+        return result
+
+    @property
+    def filled(self) -> bool:
+        return self.status == "FILLED"
+
+    def __getitem__(self, key: str):
+        return getattr(self, self._KEYS[key])
+
+    def get(self, key: str, default=None):
+        slot = self._KEYS.get(key)
+        value = getattr(self, slot) if slot else None
+        return default if value is None else value
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, slot) for key, slot in self._KEYS.items()}
+
+    def __repr__(self):
+        return f"OrderResult({self.to_dict()})"
+
+
+class OrderTemplate:
+    """
+    How one order type is validated and sent, built once per type at import.
+
+    base holds the request fields that never change for the type, and the label tuples are
+    the metrics the pipeline records for it, so placing an order builds neither.
+    """
+
+    __slots__ = ("name", "base", "price", "stop_price", "callback_rate", "notional",
+                 "validation_labels", "submit_labels", "invalid_labels")
+
+    def __init__(self, name: str, exchange_type: str, price: bool = False, stop_price: bool = False,
+                 callback_rate: bool = False, notional: str = None):
+        self.name = name
+        self.base = {"type": exchange_type, "timeInForce": "GTC"} if price else {"type": exchange_type}
+        self.price = price
+        self.stop_price = stop_price
+        self.callback_rate = callback_rate
+        self.notional = notional  # request field the minimum notional is checked against
+        self.validation_labels = (("order_type", name), ("stage", "validation"))
+        self.submit_labels = (("order_type", name), ("stage", "submit"))
+        self.invalid_labels = (("code", "validation"), ("order_type", name))
+
+    @property
+    def exchange_type(self) -> str:
+        return self.base["type"]
+
+    def build(self, spec: OrderSpec) -> dict:
+        """Validates spec and returns the futures_create_order parameters for it."""
+        symbol = validate_symbol(spec.symbol)
+        params = dict(self.base)
+        params["symbol"] = symbol
+        params["side"] = validate_side(spec.side)
+        params["quantity"] = validate_quantity(spec.quantity, symbol)
+
+        if self.stop_price:
+            if spec.stop_price is None:
+                raise ValidationError(f"Stop price must be provided for order type '{self.name}'.")
+            params["stopPrice"] = validate_price(spec.stop_price, self.name, symbol)
+        if self.price:
+            params["price"] = validate_price(spec.price, self.name, symbol)
+        if self.callback_rate:
+            if spec.callback_rate is None:
+                raise ValidationError(f"Callback rate must be provided for order type '{self.name}'.")
+            params["callbackRate"] = validate_callback_rate(spec.callback_rate)
+            if spec.activation_price is not None:
+                params["activationPrice"] = validate_price(spec.activation_price, self.name, symbol)
+        if self.notional in params:
+            validate_notional(symbol, params["quantity"], params[self.notional])
+        if spec.reduce_only:
+            params["reduceOnly"] = "true"
+        return params
+
+
+# Binance Futures STOP and TAKE_PROFIT take both stopPrice and price (stop-limit); the *_MARKET
+# variants send a market order once stopPrice trades. Trailing stops trigger on callbackRate
+# (percent) from the best price seen since activationPrice, or since placement.
+ORDER_TEMPLATES = {
+    "MARKET": OrderTemplate("MARKET", "MARKET"),
+    "LIMIT": OrderTemplate("LIMIT", "LIMIT", price=True, notional="price"),
+    "STOP_LIMIT": OrderTemplate("STOP_LIMIT", "STOP", price=True, stop_price=True, notional="price"),
+    "STOP_MARKET": OrderTemplate("STOP_MARKET", "STOP_MARKET", stop_price=True, notional="stopPrice"),
+    "TAKE_PROFIT": OrderTemplate("TAKE_PROFIT", "TAKE_PROFIT", price=True, stop_price=True, notional="price"),
+    "TAKE_PROFIT_MARKET": OrderTemplate("TAKE_PROFIT_MARKET", "TAKE_PROFIT_MARKET", stop_price=True, notional="stopPrice"),
+    "TRAILING_STOP_MARKET": OrderTemplate("TRAILING_STOP_MARKET", "TRAILING_STOP_MARKET", callback_rate=True, notional="activationPrice"),
+}
+ORDER_TEMPLATES["STOP"] = ORDER_TEMPLATES["STOP_LIMIT"]
+
+
+def order_template(order_type: str) -> OrderTemplate:
+    """The template for an order type name; raises ValidationError for unknown types."""
+    template = ORDER_TEMPLATES.get(order_type.upper().strip()) if isinstance(order_type, str) else None
+    if template is None:
+        validate_order_type(order_type)  # raises with the standard message
+    return template
+
+
+def build_order_params(order) -> dict:
+    """Validates an order (an OrderSpec or an order spec dict) and returns the futures_create_order parameters for it."""
+    spec = order if isinstance(order, OrderSpec) else OrderSpec.from_dict(order)
+    return order_template(spec.type or "MARKET").build(spec)
+
+
+def _is_ambiguous(error: Exception) -> bool:
+    """True when a failed submit may still have reached the matching engine."""
+    from binance.exceptions import BinanceAPIException
+    from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+    if isinstance(error, (Timeout, RequestsConnectionError)):
+        return True
+    if isinstance(error, BinanceAPIException):
+        return error.code in AMBIGUOUS_ERROR_CODES or (error.status_code or 0) >= 500
+    return False
+
+
+def _stamp(manager, order_params: dict) -> str:
+    """Gives the order the manager's next newClientOrderId, journaling it first when the manager has a journal."""
+    if manager.journal is not None:
+        return manager.journal.record(order_params)
+    client_order_id = make_client_order_id(manager._session, next(manager._seq))
+    order_params["newClientOrderId"] = client_order_id
+    return client_order_id
+
+
+class _Submission:
+    """
+    Retry and journal decisions for sending one order, shared by OrderManager and AsyncOrderManager.
+
+    The managers own the loop, the sleeps and the network calls. A retry is only sent after
+    the exchange has been asked for the order by client ID, so an order that landed despite a
+    timeout is returned instead of duplicated. Backoff scales with the manager's observed
+    round-trip latency and stops once the next attempt would overrun its retry_deadline.
+    """
+
+    __slots__ = ("manager", "order_type", "client_order_id", "symbol", "deadline", "backoff", "error", "started", "is_ambiguous")
+
+    def __init__(self, manager, order_type: str, order_params: dict, is_ambiguous=_is_ambiguous):
+        self.manager = manager
+        self.order_type = order_type
+        self.client_order_id = _stamp(manager, order_params)
+        self.symbol = order_params["symbol"]
+        self.deadline = None  # set when the first attempt is sent
+        self.backoff = max(0.05, 2 * (manager._latency or 0.1))
+        self.error = None
+        self.started = None
+        self.is_ambiguous = is_ambiguous
+
+    def retry_delay(self):
+        """Seconds to wait before the next attempt, or None once it would overrun the deadline."""
+        if time.monotonic() + self.backoff > self.deadline:
+            return None
+        delay = self.backoff * random.uniform(0.5, 1.0)
+        self.backoff *= 2
+        return delay
+
+    def lookup_failed(self, error: Exception):
+        # Without a confirmed "does not exist" a resend could duplicate the order.
+        logger.warning(f"Lookup of {self.order_type} order {self.client_order_id} failed: {error}")
+        self.error = error
+
+    def found(self, existing: dict) -> dict:
+        logger.info("%s order %s was accepted before the retry; not resending.", self.order_type, self.client_order_id)
+        self._mark(existing.get("status"), existing.get("orderId"), attempt=False)
+        return existing
+
+    def resending(self, attempt: int):
+        logger.warning(f"Retrying {self.order_type} order {self.client_order_id} (attempt {attempt + 1}/{self.manager.max_retries + 1}).")
+
+    def sending(self):
+        self.started = time.monotonic()
+        if self.deadline is None:
+            self.deadline = self.started + self.manager.retry_deadline
+
+    def failed(self, error: Exception):
+        """Journals a failed send; re-raises it unless its outcome is unknown and worth a retry."""
+        ambiguous = self.is_ambiguous(error)
+        self._mark(UNKNOWN_STATUS if ambiguous else "REJECTED")
+        if not ambiguous:
+            raise error
+        logger.warning(f"{self.order_type} order {self.client_order_id} outcome unknown: {error}")
+        self.error = error
+
+    def sent(self, response: dict) -> dict:
+        manager = self.manager
+        elapsed = time.monotonic() - self.started
+        manager._latency = elapsed if manager._latency is None else 0.8 * manager._latency + 0.2 * elapsed
+        self._mark(response.get("status") or "NEW", response.get("orderId"))
+        return response
+
+    def _mark(self, status: str, order_id=None, attempt: bool = True):
+        if self.manager.journal is not None:
+            self.manager.journal.mark(self.client_order_id, status, order_id, attempt=attempt)
+
+
 class OrderManager:
-    def __init__(self, client: BinanceClient):
+    def __init__(self, client: "BinanceClient", load_filters: bool = True, journal: OrderJournal = None,
+                 max_retries: int = None, retry_deadline: float = None):
         self.client = client.client  # Get raw python-binance client initialized in BinanceClient
-        
-    def place_market_order(self, symbol: str, side: str, quantity: float) -> dict:
-        """Places a MARKET order on Binance Futures."""
-        try:
-            symbol = validate_symbol(symbol)
-            side = validate_side(side)
-            quantity = validate_quantity(quantity)
-        except ValidationError as e:
-            logger.error(f"Validation Error before placing MARKET order: {e}")
-            raise
-            
-        logger.info(f"Preparing MARKET order: Symbol={symbol}, Side={side}, Quantity={quantity}")
-        try:
-            order_params = {
-                "symbol": symbol,
-                "side": side,
-                "type": "MARKET",
-                "quantity": quantity,
-            }
-            logger.info(f"Request details: futures_create_order(**{order_params})")
-            
-            response = self.client.futures_create_order(**order_params)
-            
-            logger.info(f"Response details: {response}")
-            
-            return {
-                "orderId": response.get("orderId"),
-                "status": response.get("status"),
-                "avgPrice": response.get("avgPrice") or response.get("price")
-            }
-        except (BinanceAPIException, BinanceRequestException) as e:
-            logger.error(f"Binance API Error during MARKET order: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error during MARKET order: {e}")
-            raise
+        self.binance_client = client  # market data (order books) lives on the wrapper
+        if load_filters and get_exchange_filters() is None:
+            try:
+                load_exchange_filters(self.client, path=getattr(client, "exchange_info_cache_path", CACHE_PATH))
+            except Exception as e:
+                logger.warning(f"Exchange filters unavailable, validating without symbol precision: {e}")
+
+        # ORDER_JOURNAL_PATH enables the on-disk journal for managers created without one.
+        if journal is None and os.getenv("ORDER_JOURNAL_PATH"):
+            journal = OrderJournal(os.getenv("ORDER_JOURNAL_PATH"))
+        self.journal = journal
+        if journal is not None and journal.unresolved():
+            journal.reconcile(self.client)
+        self.max_retries = ORDER_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_deadline = retry_deadline or ORDER_RETRY_DEADLINE
+        self._session = uuid.uuid4().hex[:12]
+        self._seq = itertools.count(1)
+        self._latency = None  # moving average of successful submit round trips, in seconds
+
+    def _lookup(self, symbol: str, client_order_id: str):
+        """Returns the exchange's copy of the order, or None if it never arrived (-2013)."""
+        from binance.exceptions import BinanceAPIException
 
-    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> dict:
-        """Places a LIMIT order on Binance Futures."""
-        try:
-            symbol = validate_symbol(symbol)
-            side = validate_side(side)
-            quantity = validate_quantity(quantity)
-        except ValidationError as e:
-            logger.error(f"Validation Error before placing LIMIT order: {e}")
-            raise
-            
-        logger.info(f"Preparing LIMIT order: Symbol={symbol}, Side={side}, Quantity={quantity}, Price={price}")
         try:
-            order_params = {
-                "symbol": symbol,
-                "side": side,
-                "type": "LIMIT",
-                "quantity": quantity,
-                "price": price,
-                "timeInForce": "GTC",  # Good Till Cancel
-            }
-            logger.info(f"Request details: futures_create_order(**{order_params})")
-            
-            response = self.client.futures_create_order(**order_params)
-            
-            logger.info(f"Response details: {response}")
-            
-            return {
-                "orderId": response.get("orderId"),
-                "status": response.get("status"),
-                "avgPrice": response.get("avgPrice") or response.get("price")
-            }
-        except (BinanceAPIException, BinanceRequestException) as e:
-            logger.error(f"Binance API Error during LIMIT order: {e}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error during LIMIT order: {e}")
+            return self.client.futures_get_order(symbol=symbol, origClientOrderId=client_order_id)
+        except BinanceAPIException as e:
+            if e.code == -2013:
+                return None
             raise
 
-    def place_stop_limit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float) -> dict:
-        """Places a STOP_LIMIT order on Binance Futures."""
+    def _submit(self, order_type: str, order_params: dict) -> dict:
+        """Sends an order, retrying only when its outcome is unknown (see _Submission)."""
+        submission = _Submission(self, order_type, order_params)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                delay = submission.retry_delay()
+                if delay is None:
+                    break
+                time.sleep(delay)
+                try:
+                    existing = self._lookup(submission.symbol, submission.client_order_id)
+                except Exception as e:
+                    submission.lookup_failed(e)
+                    continue
+                if existing is not None:
+                    return submission.found(existing)
+                submission.resending(attempt)
+
+            submission.sending()
+            try:
+                response = self.client.futures_create_order(**order_params)
+            except Exception as e:
+                submission.failed(e)
+                continue
+            return submission.sent(response)
+        raise submission.error
+
+    def place_order(self, order) -> OrderResult:
+        """
+        Places one order of any supported type: validate, build from the type's template, send.
+
+        order is an OrderSpec or an order spec dict (type, symbol, side, quantity and, by type,
+        price, stop_price, callback_rate, activation_price, reduce_only).
+        """
+        spec = order if isinstance(order, OrderSpec) else OrderSpec.from_dict(order)
+        template = None
+        started = time.perf_counter_ns()
         try:
-            symbol = validate_symbol(symbol)
-            side = validate_side(side)
-            quantity = validate_quantity(quantity)
-            stop_price = validate_price(stop_price, "STOP_LIMIT")
-            price = validate_price(price, "STOP_LIMIT")
+            template = order_template(spec.type or "MARKET")
+            order_params = template.build(spec)
         except ValidationError as e:
-            logger.error(f"Validation Error before placing STOP_LIMIT order: {e}")
+            name = template.name if template is not None else "UNKNOWN"
+            logger.error(f"Validation Error before placing {name} order: {e}")
+            metrics.inc(ORDER_ERRORS_METRIC, template.invalid_labels if template is not None else (("code", "validation"), ("order_type", name)))
             raise
-            
-        logger.info(f"Preparing STOP_LIMIT order: Symbol={symbol}, Side={side}, Quantity={quantity}, StopPrice={stop_price}, Price={price}")
+        finally:
+            if template is not None:
+                metrics.observe(ORDER_STAGE_METRIC, (time.perf_counter_ns() - started) / 1e9, template.validation_labels)
+
+        name = template.name
+        logger.debug("Request details: futures_create_order(**%s)", order_params)
+        started = time.perf_counter_ns()
         try:
-            order_params = {
-                "symbol": symbol,
-                "side": side,
-                "type": "STOP",  # In Binance Futures, a STOP_LIMIT order is often just type "STOP" with both stopPrice and price. "STOP" type means STOP_LIMIT.
-                "quantity": quantity,
-                "stopPrice": stop_price,
-                "price": price,
-                "timeInForce": "GTC",
-            }
-            logger.info(f"Request details: futures_create_order(**{order_params})")
-            
-            response = self.client.futures_create_order(**order_params)
-            
-            logger.info(f"Response details: {response}")
-            
-            return {
-                "orderId": response.get("orderId"),
-                "status": response.get("status"),
-                "avgPrice": response.get("avgPrice") or response.get("price")
-            }
-        except (BinanceAPIException, BinanceRequestException) as e:
-            logger.error(f"Binance API Error during STOP_LIMIT order: {e}")
-            raise
+            response = self._submit(name, order_params)
         except Exception as e:
-            logger.error(f"Unexpected error during STOP_LIMIT order: {e}")
+            # Imported only once an order has failed, so the successful path never pays for it.
+            from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+            if isinstance(e, (BinanceAPIException, BinanceRequestException)):
+                metrics.inc(ORDER_ERRORS_METRIC, (("code", str(getattr(e, "code", "request"))), ("order_type", name)))
+                logger.error(f"Binance API Error during {name} order: {e}")
+            else:
+                metrics.inc(ORDER_ERRORS_METRIC, (("code", type(e).__name__), ("order_type", name)))
+                logger.error(f"Unexpected error during {name} order: {e}")
             raise
+        finally:
+            metrics.observe(ORDER_STAGE_METRIC, (time.perf_counter_ns() - started) / 1e9, template.submit_labels)
+
+        logger.debug("Response details: %s", response)
+        result = OrderResult.from_response(response, order_params)
+        logger.info("%s order placed: orderId=%s, status=%s", name, result.order_id, result.status)
+        return result
+
+    def place_market_order(self, symbol: str, side: str, quantity: float) -> OrderResult:
+        """Places a MARKET order on Binance Futures."""
+        return self.place_order(OrderSpec("MARKET", symbol, side, quantity))
+
+    def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> OrderResult:
+        """Places a LIMIT (GTC) order on Binance Futures."""
+        return self.place_order(OrderSpec("LIMIT", symbol, side, quantity, price))
+
+    def place_stop_limit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float) -> OrderResult:
+        """Places a STOP_LIMIT order (Binance type STOP): a LIMIT order at price once stop_price trades."""
+        return self.place_order(OrderSpec("STOP_LIMIT", symbol, side, quantity, price, stop_price))
+
+    def place_stop_market_order(self, symbol: str, side: str, quantity: float, stop_price: float, reduce_only: bool = False) -> OrderResult:
+        """Places a STOP_MARKET order: a MARKET order once stop_price trades against the position."""
+        return self.place_order(OrderSpec("STOP_MARKET", symbol, side, quantity, stop_price=stop_price, reduce_only=reduce_only))
+
+    def place_take_profit_order(self, symbol: str, side: str, quantity: float, stop_price: float, price: float,
+                                reduce_only: bool = False) -> OrderResult:
+        """Places a TAKE_PROFIT order: a LIMIT order at price once stop_price trades in the position's favour."""
+        return self.place_order(OrderSpec("TAKE_PROFIT", symbol, side, quantity, price, stop_price, reduce_only=reduce_only))
+
+    def place_take_profit_market_order(self, symbol: str, side: str, quantity: float, stop_price: float,
+                                       reduce_only: bool = False) -> OrderResult:
+        """Places a TAKE_PROFIT_MARKET order: a MARKET order once stop_price trades in the position's favour."""
+        return self.place_order(OrderSpec("TAKE_PROFIT_MARKET", symbol, side, quantity, stop_price=stop_price, reduce_only=reduce_only))
+
+    def place_trailing_stop_order(self, symbol: str, side: str, quantity: float, callback_rate: float,
+                                  activation_price: float = None, reduce_only: bool = False) -> OrderResult:
+        """Places a TRAILING_STOP_MARKET order that fires callback_rate percent off the best price since activation."""
+        return self.place_order(OrderSpec("TRAILING_STOP_MARKET", symbol, side, quantity, callback_rate=callback_rate,
+                                          activation_price=activation_price, reduce_only=reduce_only))
+
+    def estimate_slippage(self, symbol: str, side: str, quantity: float) -> dict:
+        """
+        Pre-trade estimate of a MARKET order's cost, walking the symbol's local order book.
+
+        Returns LocalOrderBook.cost_to_fill's fields plus mid_price, best_price and slippage_bps
+        (average fill price against mid, positive when worse). complete is False when the
+        book is too thin for the whole quantity.
+        """
+        symbol = validate_symbol(symbol)
+        side = validate_side(side)
+        quantity = validate_quantity(quantity, symbol)
+
+        book = self.binance_client.start_order_book(symbol)
+        if not book.streaming:
+            book.resync()  # no depth stream (mock exchange): a fresh snapshot is the only current view
+        estimate = book.cost_to_fill(side, quantity)
+        mid = book.mid()
+        best = book.best_ask() if side == "BUY" else book.best_bid()
+        avg_price = estimate["avg_price"]
+
+        slippage_bps = None
+        if mid and avg_price is not None:
+            slippage_bps = (avg_price - mid) / mid * 10000 * (1 if side == "BUY" else -1)
+        estimate.update({
+            "mid_price": mid,
+            "best_price": best[0] if best else None,
+            "slippage_bps": slippage_bps,
+            "complete": estimate["filled"] >= quantity - 1e-12,
+        })
+        logger.info("Slippage estimate for %s %s %s: avg=%s, slippage_bps=%s", side, quantity, symbol, avg_price, slippage_bps)
+        return estimate
+
+    def place_batch(self, orders) -> list:
+        """
+        Places orders through futures_place_batch_order, MAX_BATCH_SIZE orders per request.
+
+        Returns one {"order", "result", "error"} dict per input, in input order. Orders that
+        fail validation are never sent; exchange-side rejections carry Binance's error message.
+        """
+        results = []
+        pending = []
+
+        for order in orders:
+            entry = {"order": order, "result": None, "error": None}
+            results.append(entry)
+            try:
+                pending.append((entry, build_order_params(order)))
+            except ValidationError as e:
+                logger.error(f"Validation Error before placing batch order {order}: {e}")
+                entry["error"] = e
+
+        for start in range(0, len(pending), MAX_BATCH_SIZE):
+            chunk = pending[start:start + MAX_BATCH_SIZE]
+            for _, params in chunk:
+                _stamp(self, params)
+            batch = [
+                {key: value if isinstance(value, str) else _format_number(value) for key, value in params.items()}
+                for _, params in chunk
+            ]
+            logger.debug("Request details: futures_place_batch_order(batchOrders=%s)", batch)
+            try:
+                response = self.client.futures_place_batch_order(batchOrders=batch)
+            except Exception as e:
+                logger.error(f"Binance API Error during batch order: {e}")
+                for entry, params in chunk:
+                    entry["error"] = e
+                    if self.journal is not None:
+                        self.journal.mark(params["newClientOrderId"], UNKNOWN_STATUS if _is_ambiguous(e) else "REJECTED", attempt=True)
+                continue
+
+            logger.debug("Response details: %s", response)
+            for (entry, params), item in zip(chunk, response):
+                if self.journal is not None:
+                    failed = "code" in item and "orderId" not in item
+                    self.journal.mark(params["newClientOrderId"], "REJECTED" if failed else item.get("status") or "NEW", item.get("orderId"), attempt=True)
+                if "code" in item and "orderId" not in item:
+                    entry["error"] = f"APIError(code={item.get('code')}): {item.get('msg')}"
+                else:
+                    entry["result"] = OrderResult.from_response(item, params)
+
+        return results
+
+    def open_orders(self, symbol: str = None) -> list:
+        """Open orders from the client's StateBook, which the user-data stream keeps current."""
+        book = self.binance_client.start_state_book()
+        return book.open_orders(validate_symbol(symbol) if symbol else None)
+
+    def order_status(self, symbol: str = None, order_id=None, client_order_id=None) -> dict:
+        """
+        One order by orderId or clientOrderId, read from the StateBook. Orders the book does not
+        hold (placed elsewhere before it started, or evicted) are fetched over REST, which needs symbol.
+        """
+        if order_id is None and client_order_id is None:
+            raise ValidationError("Either an order ID or a client order ID must be provided.")
+        order = self.binance_client.start_state_book().find_order(order_id, client_order_id)
+        if order is not None:
+            return order
+        if not symbol:
+            raise ValidationError("Order is not in the state book; pass its symbol to look it up on the exchange.")
+        params = {"orderId": order_id} if order_id is not None else {"origClientOrderId": client_order_id}
+        return self.client.futures_get_order(symbol=validate_symbol(symbol), **params)
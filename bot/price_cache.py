@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+from binance import ThreadedWebsocketManager
+from bot.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_MAX_AGE = float(os.getenv("PRICE_CACHE_MAX_AGE", "5"))
+
+
+class PriceCache:
+    """
+    Latest price per symbol fed by the futures markPrice or bookTicker websocket streams.
+
+    Prices older than max_age seconds are treated as missing so callers fall back to REST.
+    A watchdog thread reconnects and resubscribes when the stream errors out or goes quiet.
+    """
+
+    def __init__(self, api_key=None, api_secret=None, testnet=True, max_age=None, stream="markPrice"):
+        if stream not in {"markPrice", "bookTicker"}:
+            raise ValueError(f"Unsupported price stream: '{stream}'. Use 'markPrice' or 'bookTicker'.")
+
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.max_age = max_age or DEFAULT_MAX_AGE
+        self.stream = stream
+        self.connected = False
+
+        self._prices = {}  # symbol -> (price, monotonic receive time)
+        self._symbols = set()
+        self._lock = threading.Lock()
+        self._twm = None
+        self._sockets = []
+        self._last_message = 0.0
+        self._needs_restart = False
+        self._running = False
+        self._watchdog = None
+        self._listeners = []
+
+    def start(self, symbols=()):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            self._symbols.update(s.upper() for s in symbols)
+            self._needs_restart = False
+
+        self._connect()
+        self._watchdog = threading.Thread(target=self._watch, name="price-cache-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+        self._disconnect()
+
+    def subscribe(self, *symbols):
+        """Streams new symbols on an extra socket of the running manager, without reconnecting the others."""
+        with self._lock:
+            new = {s.upper() for s in symbols} - self._symbols
+            if not new:
+                return
+            self._symbols.update(new)
+            twm = self._twm if self._running else None
+        if twm is None:
+            return  # picked up by the next _connect
+        try:
+            self._sockets.append(twm.start_futures_multiplex_socket(callback=self._handle_message, streams=self._streams(new)))
+            logger.info(f"Price cache added {len(new)} streams.")
+        except Exception as e:
+            logger.error(f"Failed to add price streams: {e}")
+            self._needs_restart = True
+
+    def is_subscribed(self, symbol: str) -> bool:
+        return symbol.upper() in self._symbols
+
+    def add_listener(self, callback):
+        """Calls callback(symbol, price) for every price received, on the stream's thread."""
+        self._listeners = self._listeners + [callback]
+
+    def remove_listener(self, callback):
+        self._listeners = [listener for listener in self._listeners if listener != callback]
+
+    def get(self, symbol: str, max_age=None):
+        """Returns the cached price, or None if it is missing or older than max_age seconds."""
+        entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+        price, received_at = entry
+        if time.monotonic() - received_at > (max_age or self.max_age):
+            return None
+        return price
+
+    def get_with_age(self, symbol: str):
+        """Returns (price, age in seconds) for the symbol, or (None, None) if never seen."""
+        entry = self._prices.get(symbol)
+        if entry is None:
+            return None, None
+        return entry[0], time.monotonic() - entry[1]
+
+    def update(self, symbol: str, price: float):
+        self._prices[symbol] = (price, time.monotonic())
+        self._notify(symbol, price)
+
+    def _notify(self, symbol: str, price: float):
+        for listener in self._listeners:
+            try:
+                listener(symbol, price)
+            except Exception as e:
+                logger.error(f"Price listener failed for {symbol}: {e}")
+
+    def _handle_message(self, msg):
+        data = msg.get("data", msg)
+        if data.get("e") == "error":
+            logger.error(f"Price stream error: {data.get('m')}")
+            self.connected = False
+            self._needs_restart = True
+            return
+
+        symbol = data.get("s")
+        if not symbol:
+            return
+        if self.stream == "markPrice":
+            price = float(data["p"])
+        else:
+            price = (float(data["b"]) + float(data["a"])) / 2
+        now = time.monotonic()
+        self._prices[symbol] = (price, now)
+        self._last_message = now
+        self.connected = True
+        self._notify(symbol, price)
+
+    def _streams(self, symbols=None):
+        suffix = "@markPrice@1s" if self.stream == "markPrice" else "@bookTicker"
+        return [f"{symbol.lower()}{suffix}" for symbol in sorted(self._symbols if symbols is None else symbols)]
+
+    def _connect(self):
+        streams = self._streams()
+        try:
+            self._twm = ThreadedWebsocketManager(self.api_key, self.api_secret, testnet=self.testnet)
+            self._twm.daemon = True
+            self._twm.start()
+            if streams:
+                self._sockets = [self._twm.start_futures_multiplex_socket(callback=self._handle_message, streams=streams)]
+            self._last_message = time.monotonic()
+            logger.info(f"Price cache subscribed to {len(streams)} streams.")
+        except Exception as e:
+            logger.error(f"Failed to start price stream: {e}")
+            self.connected = False
+            self._needs_restart = True
+
+    def _disconnect(self):
+        self.connected = False
+        if self._twm is not None:
+            try:
+                self._twm.stop()
+            except Exception as e:
+                logger.error(f"Error stopping price stream: {e}")
+            self._twm = None
+            self._sockets = []
+
+    def _watch(self):
+        while self._running:
+            time.sleep(1)
+            quiet_for = time.monotonic() - self._last_message
+            if self._symbols and quiet_for > 3 * self.max_age:
+                logger.warning(f"No price updates for {quiet_for:.1f}s, reconnecting.")
+                self._needs_restart = True
+
+            if self._needs_restart and self._running:
+                self._needs_restart = False
+                self._disconnect()
+                self._connect()
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from bot.logging_config import setup_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process sharing is unavailable, in-process limiting still works.
+    fcntl = None
+
+logger = setup_logger(__name__)
+
+# USD-M Futures limits: (name, window seconds, limit, response header reporting usage).
+FUTURES_LIMITS = (
+    ("REQUEST_WEIGHT", 60, 2400, "x-mbx-used-weight-1m"),
+    ("ORDERS", 60, 1200, "x-mbx-order-count-1m"),
+    ("ORDERS_10S", 10, 300, "x-mbx-order-count-10s"),
+)
+
+# Documented request weights for the futures endpoints the bot calls, keyed by (method, path).
+ENDPOINT_WEIGHTS = {
+    ("post", "order"): 1,
+    ("get", "order"): 1,
+    ("delete", "order"): 1,
+    ("post", "batchOrders"): 5,
+    ("delete", "batchOrders"): 1,
+    ("delete", "allOpenOrders"): 1,
+    ("get", "ticker/price"): 1,
+    ("get", "ticker/bookTicker"): 1,
+    ("get", "premiumIndex"): 1,
+    ("get", "exchangeInfo"): 1,
+    ("get", "balance"): 5,
+    ("get", "account"): 5,
+    ("get", "positionRisk"): 5,
+    ("get", "allOrders"): 5,
+    ("get", "userTrades"): 5,
+    ("get", "ping"): 1,
+    ("get", "time"): 1,
+    ("post", "listenKey"): 1,
+    ("put", "listenKey"): 1,
+    ("delete", "listenKey"): 1,
+}
+DEFAULT_WEIGHT = 1
+
+
+def _klines_weight(limit: int) -> int:
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def _depth_weight(limit: int) -> int:
+    if limit <= 50:
+        return 2
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 10
+    return 20
+
+
+def endpoint_cost(method: str, path: str, params: dict = None):
+    """Returns (request weight, order count) for one futures API call."""
+    method = method.lower()
+    params = params or {}
+
+    if path in {"klines", "continuousKlines", "markPriceKlines", "indexPriceKlines"}:
+        return _klines_weight(int(params.get("limit", 500))), 0
+    if path == "depth":
+        return _depth_weight(int(params.get("limit", 500))), 0
+    if path == "ticker/price" and "symbol" not in params:
+        return 2, 0
+    if path == "openOrders":
+        return (1 if "symbol" in params else 40), 0
+
+    weight = ENDPOINT_WEIGHTS.get((method, path), DEFAULT_WEIGHT)
+    if method == "post" and path == "order":
+        return weight, 1
+    if method == "post" and path == "batchOrders":
+        batch = params.get("batchOrders", "")
+        orders = batch.count("%22symbol%22") if isinstance(batch, str) else len(batch)
+        return weight, orders or 5
+    return weight, 0
+
+
+class RateLimiter:
+    """
+    Fixed-window weight and order-count limiter that mirrors Binance's own accounting.
+
+    acquire() blocks until the request fits in every window instead of raising. Usage is
+    corrected upwards from the X-MBX-* response headers, and a 429/418 Retry-After pauses
+    all callers. With state_path set, counters live in a small flock-guarded file so every
+    process on the host draws from the same budget.
+    """
+
+    def __init__(self, limits=FUTURES_LIMITS, headroom: float = 0.9, state_path: str = None):
+        self.limits = [(name, interval, int(limit * headroom), header) for name, interval, limit, header in limits]
+        self.state_path = state_path if fcntl is not None else None
+        self._lock = threading.Lock()
+        self._state = {"windows": {}, "blocked_until": 0.0}
+
+    def acquire(self, weight: int = 1, orders: int = 0):
+        while True:
+            wait = self._reserve(weight, orders)
+            if wait <= 0:
+                return
+            logger.warning(f"Rate limit reached, waiting {wait:.2f}s (weight={weight}, orders={orders}).")
+            time.sleep(wait)
+
+    async def acquire_async(self, weight: int = 1, orders: int = 0):
+        while True:
+            wait = await self._off_loop(self._reserve, weight, orders)
+            if wait <= 0:
+                return
+            logger.warning(f"Rate limit reached, waiting {wait:.2f}s (weight={weight}, orders={orders}).")
+            await asyncio.sleep(wait)
+
+    async def update_from_headers_async(self, headers):
+        await self._off_loop(self.update_from_headers, headers)
+
+    async def block_async(self, seconds: float):
+        await self._off_loop(self.block, seconds)
+
+    async def _off_loop(self, fn, *args):
+        # With a state file every call takes a blocking flock, which must not stall the event loop.
+        if self.state_path is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def update_from_headers(self, headers):
+        """Raises local counters to the usage the exchange reports."""
+        reported = {}
+        for name, interval, _, header in self.limits:
+            value = headers.get(header)
+            if value is not None:
+                reported[name] = (interval, int(value))
+        if reported:
+            self._with_state(lambda state: self._apply_reported(state, reported))
+
+    def block(self, seconds: float):
+        """Pauses every caller for the given time, e.g. after a 429 or 418 response."""
+        until = time.time() + seconds
+        logger.error(f"Rate limited by Binance, pausing requests for {seconds:.0f}s.")
+
+        def apply(state):
+            state["blocked_until"] = max(state["blocked_until"], until)
+        self._with_state(apply)
+
+    def usage(self) -> dict:
+        """Returns {limit name: (used, limit)} for the current windows."""
+        now = time.time()
+        result = {}
+
+        def read(state):
+            for name, interval, limit, _ in self.limits:
+                window, used = state["windows"].get(name, (0, 0))
+                result[name] = (used if window == int(now // interval) else 0, limit)
+        self._with_state(read)
+        return result
+
+    def _reserve(self, weight: int, orders: int) -> float:
+        wait = [0.0]
+
+        def reserve(state):
+            now = time.time()
+            if state["blocked_until"] > now:
+                wait[0] = state["blocked_until"] - now
+                return
+
+            windows = state["windows"]
+            updates = {}
+            for name, interval, limit, _ in self.limits:
+                cost = orders if name.startswith("ORDERS") else weight
+                if cost == 0:
+                    continue
+                current = int(now // interval)
+                window, used = windows.get(name, (current, 0))
+                if window != current:
+                    used = 0
+                if used + cost > limit and used > 0:
+                    wait[0] = max(wait[0], (current + 1) * interval - now)
+                updates[name] = (current, used + cost)
+
+            if wait[0] <= 0:
+                windows.update(updates)
+        self._with_state(reserve)
+        return wait[0]
+
+    @staticmethod
+    def _apply_reported(state, reported):
+        now = time.time()
+        for name, (interval, value) in reported.items():
+            current = int(now // interval)
+            window, used = state["windows"].get(name, (current, 0))
+            if window != current:
+                used = 0
+            state["windows"][name] = (current, max(used, value))
+
+    def _with_state(self, fn):
+        with self._lock:
+            if self.state_path is None:
+                fn(self._state)
+                return
+
+            with open(self.state_path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    raw = f.read()
+                    try:
+                        state = json.loads(raw) if raw else {"windows": {}, "blocked_until": 0.0}
+                    except ValueError:
+                        state = {"windows": {}, "blocked_until": 0.0}
+                    state["windows"] = {name: tuple(value) for name, value in state["windows"].items()}
+                    fn(state)
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps(state))
+                    f.flush()
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+_default_limiter = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide limiter. Set RATE_LIMIT_STATE_FILE to share it between processes."""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(state_path=os.getenv("RATE_LIMIT_STATE_FILE") or None)
+        return _default_limiter
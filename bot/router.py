@@ -0,0 +1,341 @@
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from bot.env import load_env
+from bot.logging_config import setup_logger
+from bot.metrics import metrics
+from bot.validators import ValidationError
+
+load_env()
+
+logger = setup_logger(__name__)
+
+DEFAULT_POLICY = os.getenv("ROUTER_POLICY", "symbol")
+# Seconds a worker may take to build its client and load the exchange filters.
+START_TIMEOUT = float(os.getenv("ROUTER_START_TIMEOUT", "30"))
+POLICIES = ("symbol", "least_loaded", "sticky")
+
+ROUTER_ORDERS_METRIC = "trading_bot_router_orders_total"
+
+_READY = "ready"
+
+
+class Account:
+    """One set of API credentials. name tags its worker, metrics and per-account files."""
+
+    __slots__ = ("name", "api_key", "api_secret")
+
+    def __init__(self, name: str, api_key: str = None, api_secret: str = None):
+        self.name = name
+        self.api_key = api_key
+        self.api_secret = api_secret
+
+    def __repr__(self):
+        return f"Account({self.name!r})"  # never the keys
+
+
+class RouterError(Exception):
+    """An order error raised in an account's worker. kind is the original exception's class name."""
+
+    def __init__(self, message: str, kind: str = None, code=None, account: str = None):
+        super().__init__(message)
+        self.kind = kind
+        self.code = code
+        self.account = account
+
+
+def load_accounts(names=None, exchange: str = None) -> list:
+    """
+    Accounts listed in ROUTER_ACCOUNTS (comma-separated), or in names.
+
+    Each name reads API_KEY_<NAME> and SECRET_KEY_<NAME>. Without any names, the single
+    API_KEY / SECRET_KEY pair becomes the account "default".
+    """
+    if names is None:
+        names = [name.strip() for name in os.getenv("ROUTER_ACCOUNTS", "").split(",") if name.strip()]
+    mock = (exchange or os.getenv("BINANCE_EXCHANGE", "binance")).lower() == "mock"
+    if not names:
+        return [Account("default", os.getenv("API_KEY"), os.getenv("SECRET_KEY"))]
+
+    accounts = []
+    for name in names:
+        suffix = name.upper()
+        account = Account(name, os.getenv(f"API_KEY_{suffix}"), os.getenv(f"SECRET_KEY_{suffix}"))
+        if not mock and (not account.api_key or not account.api_secret):
+            logger.error(f"API_KEY_{suffix} or SECRET_KEY_{suffix} not found in environment variables.")
+            raise ValueError(f"API_KEY_{suffix} and SECRET_KEY_{suffix} must be set for router account '{name}'.")
+        accounts.append(account)
+    return accounts
+
+
+def _account_path(path: str, name: str):
+    # Each account keeps its own rate-limit state and journal; sharing one would mix their limits and orders.
+    if not path:
+        return None
+    root, extension = os.path.splitext(path)
+    return f"{root}.{name}{extension}"
+
+
+def _worker(index: int, account: Account, exchange: str, testnet: bool, inbox, results):
+    """One account's process: its own client, rate limiter and OrderManager, sending orders in arrival order."""
+    from bot.client import BinanceClient
+    from bot.journal import OrderJournal
+    from bot.orders import OrderManager
+    from bot.rate_limiter import RateLimiter
+
+    try:
+        limiter = RateLimiter(state_path=_account_path(os.getenv("RATE_LIMIT_STATE_FILE"), account.name))
+        client = BinanceClient(account.api_key, account.api_secret, testnet=testnet, rate_limiter=limiter, exchange=exchange)
+        journal_path = _account_path(os.getenv("ORDER_JOURNAL_PATH"), account.name)
+        manager = OrderManager(client, journal=OrderJournal(journal_path) if journal_path else None)
+    except Exception as e:
+        results.put((_READY, index, None, (type(e).__name__, str(e), getattr(e, "code", None))))
+        return
+    results.put((_READY, index, os.getpid(), None))
+
+    for request_id, order in iter(inbox.get, None):
+        try:
+            results.put((request_id, index, manager.place_order(order).to_dict(), None))
+        except Exception as e:
+            results.put((request_id, index, None, (type(e).__name__, str(e), getattr(e, "code", None))))
+    client.close()
+
+
+class OrderRouter:
+    """
+    Spreads orders over several accounts, one worker process per account.
+
+    Each worker has its own client, connection pool and rate limiter, so every account
+    brings its own order-rate and request-weight limits. A worker sends its orders one at
+    a time in the order they were routed to it; that keeps per-account ordering. Workers
+    answer on one shared results queue, which a collector thread drains into the Futures
+    that submit() returns.
+
+    Policies: "symbol" hashes the symbol, so a symbol always trades on the same account.
+    "least_loaded" picks the account with the fewest orders in flight. "sticky" keeps each
+    strategy (or the symbol, when none is given) on the account it was first routed to.
+    """
+
+    def __init__(self, accounts=None, policy: str = None, exchange: str = None, testnet: bool = True):
+        self.exchange = (exchange or os.getenv("BINANCE_EXCHANGE", "binance")).lower()
+        self.accounts = list(accounts) if accounts else load_accounts(exchange=self.exchange)
+        self.policy = (policy or DEFAULT_POLICY).lower()
+        if self.policy not in POLICIES:
+            raise ValueError(f"Unknown routing policy '{self.policy}'. Must be one of {POLICIES}.")
+        self.testnet = testnet
+
+        # spawn: workers must not inherit the parent's sockets, websocket threads or pooled clients.
+        self._context = multiprocessing.get_context("spawn")
+        self.results = self._context.Queue()
+        self._inboxes = []
+        self._processes = []
+        count = len(self.accounts)
+        self._alive = [False] * count
+        self._pids = [None] * count
+        self._in_flight = [0] * count
+        self._sent = [0] * count
+        self._errors = [0] * count
+        self._pending = {}  # request_id -> (Future, account index)
+        self._sticky = {}  # strategy -> account index
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._collector = None
+        self._running = False
+
+    # --- lifecycle ---
+
+    def start(self, timeout: float = None) -> "OrderRouter":
+        """Starts one worker per account and waits until each has its client ready."""
+        for index, account in enumerate(self.accounts):
+            inbox = self._context.Queue()
+            process = self._context.Process(
+                target=_worker, name=f"order-router-{account.name}", daemon=True,
+                args=(index, account, self.exchange, self.testnet, inbox, self.results),
+            )
+            process.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+
+        failures = []
+        waiting = set(range(len(self.accounts)))
+        deadline = time.monotonic() + (timeout or START_TIMEOUT)
+        while waiting and time.monotonic() < deadline:
+            try:
+                _, index, pid, error = self.results.get(timeout=0.5)
+            except queue.Empty:
+                for index in [i for i in waiting if not self._processes[i].is_alive()]:
+                    waiting.discard(index)
+                    failures.append(f"{self.accounts[index].name}: worker exited with code {self._processes[index].exitcode}")
+                continue
+            waiting.discard(index)
+            if error is None:
+                self._alive[index] = True
+                self._pids[index] = pid
+            else:
+                failures.append(f"{self.accounts[index].name}: {error[1]}")
+        failures.extend(f"{self.accounts[index].name}: not ready after {timeout or START_TIMEOUT}s" for index in sorted(waiting))
+        if failures:
+            self.close()
+            raise RuntimeError(f"Order router failed to start ({'; '.join(failures)}).")
+
+        self._running = True
+        self._collector = threading.Thread(target=self._collect, name="order-router-results", daemon=True)
+        self._collector.start()
+        logger.info("Order router started %s account workers (policy=%s).", len(self.accounts), self.policy)
+        return self
+
+    def close(self, timeout: float = 5.0):
+        """Lets every worker finish the orders already routed to it, then stops it."""
+        self._running = False  # the collector keeps draining until the routed orders are answered
+        for inbox in self._inboxes:
+            inbox.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning(f"Order router worker {process.name} did not stop in time; terminating it.")
+                process.terminate()
+        if self._collector is not None:
+            self._collector.join(timeout)
+            self._collector = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._alive = [False] * len(self.accounts)
+        for future, index in pending.values():
+            future.set_exception(RouterError("Order router closed before the order was answered.", account=self.accounts[index].name))
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # --- routing ---
+
+    def route(self, order, strategy: str = None) -> int:
+        """Index into accounts of the account order goes to under the router's policy."""
+        with self._lock:
+            return self._route(order, strategy)
+
+    def _route(self, order, strategy) -> int:
+        alive = [index for index, up in enumerate(self._alive) if up]
+        if not alive:
+            raise RuntimeError("Order router has no running account workers.")
+        if self.policy == "least_loaded":
+            return self._least_loaded(alive)
+        symbol = str(order.get("symbol") or "").upper().strip()
+        if self.policy == "sticky":
+            key = strategy or symbol
+            index = self._sticky.get(key)
+            if index is None or not self._alive[index]:
+                index = self._sticky[key] = self._least_loaded(alive)
+            return index
+        # crc32 rather than hash(): str hashes are salted per process, this must be stable across runs.
+        return alive[zlib.crc32(symbol.encode()) % len(alive)]
+
+    def _least_loaded(self, alive) -> int:
+        return min(alive, key=lambda index: (self._in_flight[index], self._sent[index]))
+
+    def submit(self, order, strategy: str = None) -> Future:
+        """
+        Routes one order (an OrderSpec or an order spec dict) and returns a Future of its result.
+
+        The result is OrderResult.to_dict(). A rejected order raises ValidationError for local
+        validation failures and RouterError (with the original kind and code) for the rest.
+        """
+        future = Future()
+        payload = order.to_dict() if hasattr(order, "to_dict") else dict(order)
+        with self._lock:
+            index = self._route(payload, strategy)
+            # Before the put: the collector may resolve the future as soon as the worker answers.
+            future.account = self.accounts[index].name
+            request_id = next(self._ids)
+            self._pending[request_id] = (future, index)
+            self._in_flight[index] += 1
+            self._sent[index] += 1
+            # Queued under the lock so orders routed to one account reach it in submit order.
+            self._inboxes[index].put((request_id, payload))
+        metrics.inc(ROUTER_ORDERS_METRIC, (("account", self.accounts[index].name),))
+        return future
+
+    def submit_many(self, orders, strategy: str = None, timeout: float = None) -> list:
+        """
+        Routes every order and waits for all of them.
+
+        Returns one {"order", "account", "result", "error"} dict per input, in input order,
+        like OrderManager.place_batch.
+        """
+        routed = []
+        for order in orders:
+            try:
+                future = self.submit(order, strategy)
+                routed.append((order, future, None))
+            except Exception as e:
+                routed.append((order, None, e))
+
+        entries = []
+        for order, future, error in routed:
+            entry = {"order": order, "account": None, "result": None, "error": error}
+            if future is not None:
+                entry["account"] = future.account
+                try:
+                    entry["result"] = future.result(timeout)
+                except Exception as e:
+                    entry["error"] = e
+            entries.append(entry)
+        return entries
+
+    def stats(self) -> list:
+        """Per-account counters: orders sent, still in flight and failed, plus the worker's pid."""
+        with self._lock:
+            return [
+                {"account": account.name, "pid": self._pids[index], "alive": self._alive[index],
+                 "sent": self._sent[index], "in_flight": self._in_flight[index], "errors": self._errors[index]}
+                for index, account in enumerate(self.accounts)
+            ]
+
+    # --- results ---
+
+    def _collect(self):
+        checked = time.monotonic()
+        while self._running or self._pending:
+            # Also while other workers keep answering, so a dead worker's orders do not wait forever.
+            if self._running and time.monotonic() - checked >= 1:  # exits during close() are expected
+                self._check_workers()
+                checked = time.monotonic()
+            try:
+                request_id, index, result, error = self.results.get(timeout=1)
+            except queue.Empty:
+                continue
+            with self._lock:
+                future, _ = self._pending.pop(request_id, (None, None))
+                if future is None:
+                    continue  # already failed by _check_workers or close(), which did the accounting
+                self._in_flight[index] -= 1
+                if error is not None:
+                    self._errors[index] += 1
+            if error is None:
+                future.set_result(result)
+            else:
+                kind, message, code = error
+                future.set_exception(ValidationError(message) if kind == "ValidationError" else RouterError(message, kind, code, self.accounts[index].name))
+
+    def _check_workers(self):
+        """Fails the pending orders of workers that died, and stops routing to them."""
+        lost = []
+        with self._lock:
+            for index, process in enumerate(self._processes):
+                if self._alive[index] and not process.is_alive():
+                    self._alive[index] = False
+                    logger.error(f"Order router worker for account {self.accounts[index].name} exited (code {process.exitcode}).")
+                    for request_id, (future, owner) in list(self._pending.items()):
+                        if owner == index:
+                            del self._pending[request_id]
+                            self._in_flight[index] -= 1
+                            lost.append((future, index))
+        for future, index in lost:
+            future.set_exception(RouterError("Account worker exited before answering.", account=self.accounts[index].name))
@@ -0,0 +1,283 @@
+import threading
+import time
+from collections import deque
+from binance import ThreadedWebsocketManager
+from bot.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+FINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "REJECTED", "EXPIRED_IN_MATCH"}
+DEFAULT_MAX_CLOSED_ORDERS = 10000
+
+
+def _copy(entry):
+    return dict(entry) if entry is not None else None
+
+
+class StateBook:
+    """
+    In-memory orders, fills, positions and balances driven by the futures user-data stream.
+
+    ORDER_TRADE_UPDATE and ACCOUNT_UPDATE events keep the book current; REST snapshots rebuild
+    it at start and after every reconnect. Orders are indexed by orderId, clientOrderId and
+    symbol, so every lookup is a dict access and never touches the network.
+    """
+
+    def __init__(self, raw_client, api_key=None, api_secret=None, testnet=True, max_closed_orders=DEFAULT_MAX_CLOSED_ORDERS):
+        self.client = raw_client
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.max_closed_orders = max_closed_orders
+        self.connected = False
+        self.last_event_time = None
+
+        self.orders = {}  # orderId -> order dict
+        self.orders_by_client_id = {}  # clientOrderId -> order dict
+        self.open_orders_by_symbol = {}  # symbol -> {orderId: order dict}
+        self.fills = {}  # orderId -> [fill dict]
+        self.positions = {}  # (symbol, positionSide) -> position dict
+        self.balances = {}  # asset -> balance dict
+
+        self._closed = deque()
+        self._closed_ids = set()
+        self._lock = threading.RLock()
+        self._twm = None
+        self._running = False
+        self._needs_resync = False
+        self._watchdog = None
+
+    # --- lifecycle ---
+
+    def start(self, stream: bool = True):
+        """Takes REST snapshots and, with stream=True, follows the user-data stream from then on."""
+        self._running = True
+        if stream:
+            self._connect()
+            self._watchdog = threading.Thread(target=self._watch, name="state-book-watchdog", daemon=True)
+            self._watchdog.start()
+        self.resync()
+
+    def stop(self):
+        self._running = False
+        self._disconnect()
+
+    def resync(self):
+        """Rebuilds open orders, positions and balances from REST snapshots."""
+        open_orders = self.client.futures_get_open_orders()
+        positions = self.client.futures_position_information()
+        balances = self.client.futures_account_balance()
+
+        with self._lock:
+            snapshot_ids = {order["orderId"] for order in open_orders}
+            # Orders we still think are open but the exchange no longer lists closed while we were away.
+            for symbol_orders in list(self.open_orders_by_symbol.values()):
+                for order_id, order in list(symbol_orders.items()):
+                    if order_id not in snapshot_ids:
+                        order["status"] = order.get("status") if order.get("status") in FINAL_STATUSES else "UNKNOWN"
+                        self._close(order)
+
+            for order in open_orders:
+                self._upsert_order(dict(order))
+
+            self.positions = {}
+            for position in positions:
+                self._upsert_position(position.get("symbol"), position.get("positionSide", "BOTH"), {
+                    "positionAmt": float(position.get("positionAmt", 0)),
+                    "entryPrice": float(position.get("entryPrice", 0)),
+                    "unRealizedProfit": float(position.get("unRealizedProfit", 0)),
+                })
+
+            self.balances = {}
+            for balance in balances:
+                self.balances[balance["asset"]] = {
+                    "asset": balance["asset"],
+                    "balance": float(balance.get("balance", 0)),
+                    "crossWalletBalance": float(balance.get("crossWalletBalance", balance.get("balance", 0))),
+                }
+        logger.info(f"State book resynced: {len(open_orders)} open orders, {len(self.positions)} positions.")
+
+    # --- lookups ---
+    # Taken under the lock, since the stream thread changes these dicts, and returned as copies,
+    # since _upsert_order updates the book's own order dicts in place.
+
+    def get_order(self, order_id):
+        with self._lock:
+            return _copy(self.orders.get(order_id))
+
+    def find_order(self, order_id=None, client_order_id=None):
+        """Looks an order up by orderId or, failing that, by clientOrderId."""
+        with self._lock:
+            order = self.orders.get(int(order_id)) if order_id is not None else None
+            if order is None and client_order_id is not None:
+                order = self.orders_by_client_id.get(client_order_id)
+            return _copy(order)
+
+    def get_order_by_client_id(self, client_order_id):
+        with self._lock:
+            return _copy(self.orders_by_client_id.get(client_order_id))
+
+    def open_orders(self, symbol=None) -> list:
+        with self._lock:
+            if symbol is not None:
+                return [dict(order) for order in self.open_orders_by_symbol.get(symbol, {}).values()]
+            return [dict(order) for orders in self.open_orders_by_symbol.values() for order in orders.values()]
+
+    def fills_for(self, order_id) -> list:
+        with self._lock:
+            return [dict(fill) for fill in self.fills.get(order_id, [])]
+
+    def position(self, symbol, position_side="BOTH"):
+        with self._lock:
+            return _copy(self.positions.get((symbol, position_side)))
+
+    def open_positions(self) -> list:
+        with self._lock:
+            return [dict(position) for position in self.positions.values()]
+
+    def balance(self, asset="USDT"):
+        with self._lock:
+            return _copy(self.balances.get(asset))
+
+    # --- stream handling ---
+
+    def apply_event(self, msg: dict):
+        event = msg.get("e")
+        if event == "ORDER_TRADE_UPDATE":
+            self._apply_order_update(msg["o"], msg.get("E"))
+        elif event == "ACCOUNT_UPDATE":
+            self._apply_account_update(msg["a"])
+        elif event == "listenKeyExpired":
+            logger.warning("User data stream listen key expired, reconnecting.")
+            self.connected = False
+            self._needs_resync = True
+            return
+        elif event == "error":
+            logger.error(f"User data stream error: {msg.get('m')}")
+            self.connected = False
+            self._needs_resync = True
+            return
+        self.connected = True
+        self.last_event_time = time.monotonic()
+
+    def _apply_order_update(self, o: dict, event_time):
+        order = {
+            "orderId": o["i"],
+            "clientOrderId": o.get("c"),
+            "symbol": o["s"],
+            "side": o.get("S"),
+            "type": o.get("o"),
+            "timeInForce": o.get("f"),
+            "status": o.get("X"),
+            "price": o.get("p"),
+            "avgPrice": o.get("ap"),
+            "stopPrice": o.get("sp"),
+            "origQty": o.get("q"),
+            "executedQty": o.get("z"),
+            "positionSide": o.get("ps"),
+            "updateTime": o.get("T") or event_time,
+        }
+        with self._lock:
+            self._upsert_order(order)
+            if o.get("x") == "TRADE" and float(o.get("l", 0)) > 0:
+                self.fills.setdefault(order["orderId"], []).append({
+                    "tradeId": o.get("t"),
+                    "price": float(o.get("L", 0)),
+                    "qty": float(o["l"]),
+                    "commission": float(o.get("n", 0) or 0),
+                    "commissionAsset": o.get("N"),
+                    "realizedPnl": float(o.get("rp", 0) or 0),
+                    "time": o.get("T"),
+                })
+
+    def _apply_account_update(self, a: dict):
+        with self._lock:
+            for balance in a.get("B", []):
+                self.balances[balance["a"]] = {
+                    "asset": balance["a"],
+                    "balance": float(balance.get("wb", 0)),
+                    "crossWalletBalance": float(balance.get("cw", 0)),
+                }
+            for position in a.get("P", []):
+                self._upsert_position(position["s"], position.get("ps", "BOTH"), {
+                    "positionAmt": float(position.get("pa", 0)),
+                    "entryPrice": float(position.get("ep", 0)),
+                    "unRealizedProfit": float(position.get("up", 0)),
+                })
+
+    def _upsert_order(self, order: dict):
+        order_id = order["orderId"]
+        existing = self.orders.get(order_id)
+        if existing is not None:
+            existing.update(order)
+            order = existing
+        else:
+            self.orders[order_id] = order
+        if order.get("clientOrderId"):
+            self.orders_by_client_id[order["clientOrderId"]] = order
+
+        if order.get("status") in FINAL_STATUSES:
+            self._close(order)
+        else:
+            self.open_orders_by_symbol.setdefault(order["symbol"], {})[order_id] = order
+
+    def _upsert_position(self, symbol, position_side, values: dict):
+        if values["positionAmt"] == 0:
+            self.positions.pop((symbol, position_side), None)
+            return
+        values.update({"symbol": symbol, "positionSide": position_side})
+        self.positions[(symbol, position_side)] = values
+
+    def _close(self, order: dict):
+        symbol_orders = self.open_orders_by_symbol.get(order["symbol"])
+        if symbol_orders is not None and symbol_orders.pop(order["orderId"], None) is not None:
+            if not symbol_orders:
+                del self.open_orders_by_symbol[order["symbol"]]
+        # Also orders first seen already final (e.g. a market order whose NEW event never came).
+        if order["orderId"] not in self._closed_ids:
+            self._closed_ids.add(order["orderId"])
+            self._closed.append(order["orderId"])
+
+        # Forget the oldest closed orders so a long-running book stays bounded.
+        while len(self._closed) > self.max_closed_orders:
+            order_id = self._closed.popleft()
+            self._closed_ids.discard(order_id)
+            old = self.orders.pop(order_id, None)
+            if old is not None:
+                self.orders_by_client_id.pop(old.get("clientOrderId"), None)
+                self.fills.pop(old["orderId"], None)
+
+    def _connect(self):
+        try:
+            self._twm = ThreadedWebsocketManager(self.api_key, self.api_secret, testnet=self.testnet)
+            self._twm.daemon = True
+            self._twm.start()
+            self._twm.start_futures_user_socket(callback=self.apply_event)
+            self.connected = True
+            logger.info("Subscribed to the futures user data stream.")
+        except Exception as e:
+            logger.error(f"Failed to start user data stream: {e}")
+            self.connected = False
+            self._needs_resync = True
+
+    def _disconnect(self):
+        self.connected = False
+        if self._twm is not None:
+            try:
+                self._twm.stop()
+            except Exception as e:
+                logger.error(f"Error stopping user data stream: {e}")
+            self._twm = None
+
+    def _watch(self):
+        while self._running:
+            time.sleep(1)
+            if self._needs_resync and self._running:
+                self._needs_resync = False
+                self._disconnect()
+                self._connect()
+                try:
+                    self.resync()
+                except Exception as e:
+                    logger.error(f"State book resync failed: {e}")
+                    self._needs_resync = True
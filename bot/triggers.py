@@ -0,0 +1,277 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from bot.logging_config import setup_logger
+from bot.metrics import metrics
+from bot.validators import validate_symbol, validate_side, validate_quantity, validate_price, would_trigger_immediately, ValidationError
+
+logger = setup_logger(__name__)
+
+TRIGGER_DISPATCH_METRIC = "trading_bot_trigger_dispatch_seconds"
+
+# Heaps are rebuilt once stale entries (cancelled, fired or superseded) outnumber live ones by this much.
+_COMPACT_MIN_STALE = 1024
+
+
+class Trigger:
+    """A client-side conditional order waiting for its symbol's price to cross a level."""
+
+    __slots__ = ("id", "symbol", "side", "quantity", "price", "kind", "level", "callback_rate",
+                 "extreme", "fires_above", "version", "status", "result", "error", "created")
+
+    def __init__(self, trigger_id, symbol, side, quantity, price, kind, level, callback_rate=None):
+        self.id = trigger_id
+        self.symbol = symbol
+        self.side = side
+        self.quantity = quantity
+        self.price = price  # limit price once triggered; None sends a MARKET order
+        self.kind = kind  # STOP, TAKE_PROFIT or TRAILING_STOP
+        self.level = level
+        self.callback_rate = callback_rate  # percent, trailing stops only
+        self.extreme = None  # highest (SELL) or lowest (BUY) price seen, trailing stops only
+        # BUY stops and SELL take-profits fire on a rise; SELL stops and BUY take-profits on a fall.
+        self.fires_above = (side == "BUY") == (kind != "TAKE_PROFIT")
+        self.version = 0
+        self.status = "PENDING"
+        self.result = None
+        self.error = None
+        self.created = time.time()
+
+    def to_dict(self) -> dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class _SymbolTriggers:
+    """
+    Trigger heaps for one symbol.
+
+    above is a min-heap of levels that fire when price rises to them, below a max-heap
+    (negated) of levels that fire when price falls to them. Trailing stops also sit in a heap
+    keyed by their running extreme, so a tick only touches the stops whose extreme it moves.
+    Entries are (key, seq, version, trigger) and are skipped once the trigger's version moves on.
+    """
+
+    __slots__ = ("above", "below", "peaks", "troughs", "live", "stale")
+
+    def __init__(self):
+        self.above = []
+        self.below = []
+        self.peaks = []  # SELL trailing stops, min-heap of highest price seen
+        self.troughs = []  # BUY trailing stops, max-heap (negated) of lowest price seen
+        self.live = 0
+        self.stale = 0
+
+
+def _valid(entry) -> bool:
+    trigger = entry[3]
+    return trigger.status == "PENDING" and entry[2] == trigger.version
+
+
+class TriggerEngine:
+    """
+    Holds stop, take-profit and trailing-stop triggers locally and fires them on price ticks.
+
+    A tick costs O(k log n) for the k triggers it fires (plus, for trailing stops, the ones
+    whose extreme it moves). Fired triggers are sent through OrderManager on a small thread
+    pool so the price stream callback never waits on the network.
+    """
+
+    def __init__(self, manager, max_workers: int = 4):
+        self.manager = manager
+        self.triggers = {}  # id -> Trigger
+        self.last_prices = {}
+        self._symbols = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="trigger-dispatch")
+        self._price_cache = None
+
+    def attach(self, price_cache):
+        """Evaluates triggers on every price the PriceCache receives."""
+        self._price_cache = price_cache
+        price_cache.add_listener(self.on_price)
+        symbols = {trigger.symbol for trigger in self.triggers.values()}
+        if symbols:
+            price_cache.subscribe(*symbols)
+
+    def close(self, wait: bool = True):
+        if self._price_cache is not None:
+            self._price_cache.remove_listener(self.on_price)
+            self._price_cache = None
+        self._executor.shutdown(wait=wait)
+
+    # --- adding and cancelling ---
+
+    def add_stop(self, symbol: str, side: str, quantity: float, stop_price: float, price: float = None) -> int:
+        """Sends a MARKET (or LIMIT at price) order once price reaches stop_price against the position."""
+        return self._add(symbol, side, quantity, price, "STOP", stop_price)
+
+    def add_take_profit(self, symbol: str, side: str, quantity: float, stop_price: float, price: float = None) -> int:
+        """Sends a MARKET (or LIMIT at price) order once price reaches stop_price in the position's favour."""
+        return self._add(symbol, side, quantity, price, "TAKE_PROFIT", stop_price)
+
+    def add_trailing_stop(self, symbol: str, side: str, quantity: float, callback_rate: float, reference_price: float = None) -> int:
+        """Sends a MARKET order once price retraces callback_rate percent from its best level since creation."""
+        if callback_rate is None or not 0 < float(callback_rate) < 100:
+            raise ValidationError("Callback rate must be a percentage between 0 and 100.")
+        symbol = validate_symbol(symbol)
+        reference_price = reference_price or self.last_prices.get(symbol)
+        if reference_price is None and self._price_cache is not None:
+            reference_price = self._price_cache.get(symbol)
+        if reference_price is None:
+            raise ValidationError(f"No price known for {symbol}; pass reference_price to start the trailing stop.")
+        return self._add(symbol, side, quantity, None, "TRAILING_STOP", float(reference_price), float(callback_rate))
+
+    def cancel(self, trigger_id: int) -> bool:
+        with self._lock:
+            trigger = self.triggers.get(trigger_id)
+            if trigger is None or trigger.status != "PENDING":
+                return False
+            trigger.status = "CANCELED"
+            book = self._symbols[trigger.symbol]
+            book.live -= 1
+            book.stale += 2 if trigger.kind == "TRAILING_STOP" else 1
+        logger.info("Trigger %s cancelled.", trigger_id)
+        return True
+
+    def pending(self, symbol: str = None) -> list:
+        return [t for t in self.triggers.values() if t.status == "PENDING" and (symbol is None or t.symbol == symbol)]
+
+    def _add(self, symbol, side, quantity, price, kind, level, callback_rate=None) -> int:
+        symbol = validate_symbol(symbol)
+        side = validate_side(side)
+        quantity = validate_quantity(quantity, symbol)
+        if price is not None:
+            price = validate_price(price, "LIMIT", symbol)
+
+        if kind == "TRAILING_STOP":
+            trigger = Trigger(next(self._ids), symbol, side, quantity, None, kind, None, callback_rate)
+            trigger.extreme = level
+            trigger.level = self._trail_level(trigger)
+        else:
+            level = validate_price(level, "STOP_LIMIT", symbol)
+            trigger = Trigger(next(self._ids), symbol, side, quantity, price, kind, level)
+            last = self.last_prices.get(symbol)
+            if kind == "STOP" and last is not None and would_trigger_immediately(level, last, side):
+                logger.warning(f"{side} stop at {level} for {symbol} will fire on the next tick (last price {last}).")
+
+        with self._lock:
+            book = self._symbols.get(symbol)
+            if book is None:
+                book = self._symbols[symbol] = _SymbolTriggers()
+            self.triggers[trigger.id] = trigger
+            self._push_level(book, trigger)
+            if kind == "TRAILING_STOP":
+                self._push_extreme(book, trigger)
+            book.live += 1
+
+        if self._price_cache is not None:
+            self._price_cache.subscribe(symbol)
+        logger.info("Trigger %s added: %s %s %s qty=%s level=%s", trigger.id, kind, side, symbol, quantity, trigger.level)
+        return trigger.id
+
+    # --- evaluation ---
+
+    def on_price(self, symbol: str, price: float) -> list:
+        """Evaluates one price tick and dispatches every trigger it crosses. Returns the fired triggers."""
+        self.last_prices[symbol] = price
+        book = self._symbols.get(symbol)
+        if book is None or not book.live:
+            return []
+
+        received = time.perf_counter()
+        fired = []
+        with self._lock:
+            self._move_extremes(book, price)
+
+            while book.above and book.above[0][0] <= price:
+                entry = heapq.heappop(book.above)
+                if _valid(entry):
+                    fired.append(entry[3])
+                else:
+                    book.stale -= 1
+            while book.below and -book.below[0][0] >= price:
+                entry = heapq.heappop(book.below)
+                if _valid(entry):
+                    fired.append(entry[3])
+                else:
+                    book.stale -= 1
+
+            for trigger in fired:
+                trigger.status = "TRIGGERED"
+                book.live -= 1
+                if trigger.kind == "TRAILING_STOP":
+                    book.stale += 1  # its extreme-heap entry
+
+            if book.stale > _COMPACT_MIN_STALE and book.stale > book.live:
+                self._compact(book)
+
+        for trigger in fired:
+            logger.info("Trigger %s fired at %s (level %s).", trigger.id, price, trigger.level)
+            self._executor.submit(self._dispatch, trigger, received)
+        return fired
+
+    def _move_extremes(self, book: _SymbolTriggers, price: float):
+        # A new high raises every SELL trailing stop whose peak is below it (and symmetrically for BUY).
+        while book.peaks and book.peaks[0][0] < price:
+            entry = heapq.heappop(book.peaks)
+            if _valid(entry):
+                self._retrail(book, entry[3], price)
+            else:
+                book.stale -= 1
+        while book.troughs and -book.troughs[0][0] > price:
+            entry = heapq.heappop(book.troughs)
+            if _valid(entry):
+                self._retrail(book, entry[3], price)
+            else:
+                book.stale -= 1
+
+    def _retrail(self, book: _SymbolTriggers, trigger: Trigger, price: float):
+        trigger.extreme = price
+        trigger.level = self._trail_level(trigger)
+        trigger.version += 1
+        book.stale += 1  # the old level entry
+        self._push_level(book, trigger)
+        self._push_extreme(book, trigger)
+
+    @staticmethod
+    def _trail_level(trigger: Trigger) -> float:
+        rate = trigger.callback_rate / 100
+        return trigger.extreme * (1 - rate) if trigger.side == "SELL" else trigger.extreme * (1 + rate)
+
+    def _push_level(self, book: _SymbolTriggers, trigger: Trigger):
+        if trigger.fires_above:
+            heapq.heappush(book.above, (trigger.level, next(self._seq), trigger.version, trigger))
+        else:
+            heapq.heappush(book.below, (-trigger.level, next(self._seq), trigger.version, trigger))
+
+    def _push_extreme(self, book: _SymbolTriggers, trigger: Trigger):
+        if trigger.side == "SELL":
+            heapq.heappush(book.peaks, (trigger.extreme, next(self._seq), trigger.version, trigger))
+        else:
+            heapq.heappush(book.troughs, (-trigger.extreme, next(self._seq), trigger.version, trigger))
+
+    @staticmethod
+    def _compact(book: _SymbolTriggers):
+        for name in _SymbolTriggers.__slots__[:4]:
+            heap = [entry for entry in getattr(book, name) if _valid(entry)]
+            heapq.heapify(heap)
+            setattr(book, name, heap)
+        book.stale = 0
+
+    def _dispatch(self, trigger: Trigger, received: float):
+        try:
+            if trigger.price is None:
+                trigger.result = self.manager.place_market_order(trigger.symbol, trigger.side, trigger.quantity)
+            else:
+                trigger.result = self.manager.place_limit_order(trigger.symbol, trigger.side, trigger.quantity, trigger.price)
+            trigger.status = "SUBMITTED"
+        except Exception as e:
+            trigger.error = e
+            trigger.status = "FAILED"
+            logger.error(f"Trigger {trigger.id} order failed: {e}")
+        finally:
+            metrics.observe(TRIGGER_DISPATCH_METRIC, time.perf_counter() - received, (("kind", trigger.kind),))
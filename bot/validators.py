@@ -4,6 +4,22 @@ from typing import Union
 class ValidationError(ValueError):
     pass
 
+# Optional ExchangeFilters index (see bot.exchange_info). When set, validators check symbols
+# against it and round quantities and prices to each symbol's precision.
+_exchange_filters = None
+
+def set_exchange_filters(filters) -> None:
+    global _exchange_filters
+    _exchange_filters = filters
+
+def get_exchange_filters():
+    return _exchange_filters
+
+def _symbol_filters(symbol: Union[str, None]):
+    if _exchange_filters is None or symbol is None:
+        return None
+    return _exchange_filters.get(symbol)
+
 def validate_symbol(symbol: str) -> str:
     if not isinstance(symbol, str):
         raise ValidationError(f"Symbol must be a string, got {type(symbol).__name__}.")
@@ -12,6 +28,13 @@ def validate_symbol(symbol: str) -> str:
     if not re.match(r"^[A-Z0-9]+$", symbol):
         raise ValidationError(f"Symbol must contain only alphanumeric characters: '{symbol}'.")
     
+    if _exchange_filters is not None:
+        filters = _exchange_filters.get(symbol)
+        if filters is None:
+            raise ValidationError(f"Unknown symbol: '{symbol}'.")
+        if filters.status != "TRADING":
+            raise ValidationError(f"Symbol '{symbol}' is not trading (status {filters.status}).")
+    
     return symbol
 
 def validate_side(side: str) -> str:
@@ -39,7 +62,7 @@ def validate_order_type(order_type: str) -> str:
     
     return order_type
 
-def validate_quantity(quantity: Union[int, float, str]) -> float:
+def validate_quantity(quantity: Union[int, float, str], symbol: Union[str, None] = None) -> float:
     try:
         qty = float(quantity)
     except (ValueError, TypeError):
@@ -48,10 +71,19 @@ def validate_quantity(quantity: Union[int, float, str]) -> float:
     if qty <= 0:
         raise ValidationError(f"Quantity must be a positive number greater than 0, got {qty}.")
     
+    filters = _symbol_filters(symbol)
+    if filters is not None:
+        rounded = filters.round_quantity(qty)
+        if rounded < filters.min_qty or rounded <= 0:
+            raise ValidationError(f"Quantity {qty} is below the minimum {filters.min_qty} (step {filters.step_size}) for {symbol}.")
+        if filters.max_qty > 0 and rounded > filters.max_qty:
+            raise ValidationError(f"Quantity {qty} is above the maximum {filters.max_qty} for {symbol}.")
+        qty = float(rounded)
+    
     return qty
 
-def validate_price(price: Union[int, float, str, None], order_type: str) -> Union[float, None]:
-    if order_type in {"LIMIT", "STOP_LIMIT"}:
+def validate_price(price: Union[int, float, str, None], order_type: str, symbol: Union[str, None] = None) -> Union[float, None]:
+    if order_type in {"LIMIT", "STOP_LIMIT", "TAKE_PROFIT"}:
         if price is None:
             raise ValidationError(f"Price must be provided for order type '{order_type}'.")
             
@@ -64,10 +96,38 @@ def validate_price(price: Union[int, float, str, None], order_type: str) -> Unio
         if p <= 0:
             raise ValidationError(f"Price must be a positive number greater than 0, got {p}.")
             
+        filters = _symbol_filters(symbol)
+        if filters is not None:
+            rounded = filters.round_price(p)
+            if rounded < filters.min_price or rounded <= 0:
+                raise ValidationError(f"Price {p} is below the minimum {filters.min_price} for {symbol}.")
+            if filters.max_price > 0 and rounded > filters.max_price:
+                raise ValidationError(f"Price {p} is above the maximum {filters.max_price} for {symbol}.")
+            p = float(rounded)
+            
         return p
         
     return None
 
+def validate_callback_rate(rate: Union[int, float, str]) -> float:
+    # Binance Futures trailing stops take the callback as a percentage from 0.1 to 10.
+    try:
+        r = float(rate)
+    except (ValueError, TypeError):
+        raise ValidationError(f"Callback rate must be a numeric value, got {type(rate).__name__}.")
+
+    if not 0.1 <= r <= 10:
+        raise ValidationError(f"Callback rate must be between 0.1 and 10 percent, got {r}.")
+
+    return r
+
+def validate_notional(symbol: str, quantity: float, price: float) -> None:
+    filters = _symbol_filters(symbol)
+    if filters is not None and filters.min_notional > 0:
+        notional = quantity * price
+        if notional < filters.min_notional:
+            raise ValidationError(f"Order value {notional} is below the minimum notional {filters.min_notional} for {symbol}.")
+
 def would_trigger_immediately(stop_price: float, current_price: float, side: str) -> bool:
     side = side.upper().strip()
     if side == "BUY" and current_price >= stop_price: